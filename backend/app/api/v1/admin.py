@@ -0,0 +1,69 @@
+from typing import Any
+
+from fastapi import APIRouter, Depends, HTTPException, status
+
+from app.core.dependencies import require_admin_token
+from app.core.observability import log_event
+from app.core.startup import startup_report
+from app.services.inference_executor import get_inference_executor
+from app.services.model_registry import (
+    ModelActivateRequest,
+    ModelRegistryResponse,
+    ModelReloadRequest,
+    describe_registry,
+    resolve_model_file,
+)
+from app.services.prediction_service import get_prediction_cache, get_registry
+
+router = APIRouter(prefix="/admin", tags=["Admin"], dependencies=[Depends(require_admin_token)])
+
+
+@router.get("/models", response_model=ModelRegistryResponse)
+def list_models() -> ModelRegistryResponse:
+    return describe_registry(get_registry())
+
+
+@router.post("/models/reload", response_model=ModelRegistryResponse, status_code=status.HTTP_202_ACCEPTED)
+def reload_model(payload: ModelReloadRequest) -> ModelRegistryResponse:
+    registry = get_registry()
+    try:
+        model_path = resolve_model_file(registry.model_path.parent, payload.model_file, registry.model_path)
+    except ValueError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail={"error_code": "invalid_model_file", "message": str(exc)},
+        ) from exc
+
+    log_event("model_reload_requested", model_path=str(model_path))
+    registry.reload(model_path, wait=payload.wait)
+    return describe_registry(registry)
+
+
+@router.post("/models/activate", response_model=ModelRegistryResponse)
+def activate_model(payload: ModelActivateRequest) -> ModelRegistryResponse:
+    registry = get_registry()
+    try:
+        registry.activate(payload.version)
+    except KeyError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail={"error_code": "model_version_not_loaded", "message": "Model version is not loaded"},
+        ) from exc
+    log_event("model_activated", version=payload.version)
+    return describe_registry(registry)
+
+
+# Startup phases, pid and memory of the process that answers, and per-process counters.
+@router.get("/startup")
+def startup() -> dict[str, Any]:
+    return startup_report()
+
+
+@router.get("/cache/stats")
+def prediction_cache_stats() -> dict[str, int]:
+    return get_prediction_cache().stats()
+
+
+@router.get("/inference/stats")
+def inference_stats() -> dict[str, int]:
+    return get_inference_executor().stats()
@@ -1,19 +1,39 @@
-from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, status
+import asyncio
+from typing import AsyncIterator
 
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query, status
+from fastapi.responses import StreamingResponse
+from starlette.concurrency import run_in_threadpool
+
+from app.api.v1.predict import INFERENCE_OVERLOADED_RESPONSES, run_inference
 from app.core.dependencies import get_current_user
+from app.services.analysis_events import (
+    ANALYSIS_EVENTS_HEARTBEAT_SECONDS,
+    ANALYSIS_EVENTS_MAX_SECONDS,
+    ANALYSIS_LONG_POLL_MAX_SECONDS,
+    AnalysisWatcher,
+    get_analysis_event_bus,
+)
+from app.services.analysis_queue import ANALYSIS_JOBS_INLINE
 from app.services.analyses_service import (
+    ANALYSIS_LIST_DEFAULT_LIMIT,
+    ANALYSIS_LIST_MAX_LIMIT,
     AnalysisInputResponse,
     AnalysisStatusResponse,
     CreateAnalysisRequest,
     CreateAnalysisResponse,
     ListAnalysesResponse,
+    WhatIfRequest,
+    WhatIfResponse,
     create_analysis,
     get_analysis_input,
     get_analysis_result,
     get_analysis_status,
     get_latest_analysis_input,
+    is_analysis_finished,
     list_analyses,
     process_analysis_job,
+    score_analysis_what_if,
 )
 from app.services.auth_service import UserRecord
 from app.services.prediction_service import PredictResponse
@@ -28,13 +48,63 @@ ANALYSIS_NOT_COMPLETED_DETAIL = {
     "error_code": "analysis_not_completed",
     "message": "Analysis is not completed yet",
 }
+# EventSource reconnect delay sent to SSE clients.
+SSE_RETRY_MILLISECONDS = 3000
+
+
+async def _wait_for_change(
+    watcher: AnalysisWatcher,
+    user_id: str,
+    analysis_id: str,
+    last: AnalysisStatusResponse,
+    timeout: float,
+) -> AnalysisStatusResponse:
+    """The first status whose stage differs from ``last``, or ``last`` itself after ``timeout``."""
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout
+    while await watcher.wait(deadline - loop.time()):
+        current = await run_in_threadpool(get_analysis_status, user_id, analysis_id)
+        if current is not None and (current.status, current.progress_stage) != (last.status, last.progress_stage):
+            return current
+    return last
+
+
+def _sse_status(state: AnalysisStatusResponse) -> str:
+    return f"event: status\ndata: {state.model_dump_json()}\n\n"
+
+
+async def _status_events(user_id: str, analysis_id: str) -> AsyncIterator[str]:
+    loop = asyncio.get_running_loop()
+    closes_at = loop.time() + ANALYSIS_EVENTS_MAX_SECONDS
+    with get_analysis_event_bus().subscribe(analysis_id) as watcher:
+        # Read after subscribing, so a transition between the read and the first wait still wakes us.
+        state = await run_in_threadpool(get_analysis_status, user_id, analysis_id)
+        if state is None:
+            return
+        yield f"retry: {SSE_RETRY_MILLISECONDS}\n" + _sse_status(state)
+        while not is_analysis_finished(state) and loop.time() < closes_at:
+            timeout = min(ANALYSIS_EVENTS_HEARTBEAT_SECONDS, closes_at - loop.time())
+            current = await _wait_for_change(watcher, user_id, analysis_id, state, timeout)
+            if current is state:
+                yield ": keep-alive\n\n"
+                continue
+            state = current
+            yield _sse_status(state)
 
 
 @router.get("", response_model=ListAnalysesResponse)
 def list_analyses_endpoint(
+    limit: int = Query(default=ANALYSIS_LIST_DEFAULT_LIMIT, ge=1, le=ANALYSIS_LIST_MAX_LIMIT),
+    cursor: str | None = Query(default=None, description="`next_cursor` of the previous page"),
     current_user: UserRecord = Depends(get_current_user),
 ) -> ListAnalysesResponse:
-    return list_analyses(current_user.id)
+    try:
+        return list_analyses(current_user.id, limit=limit, cursor=cursor)
+    except ValueError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail={"error_code": "invalid_cursor", "message": str(exc)},
+        ) from exc
 
 
 @router.get("/latest/input", response_model=AnalysisInputResponse)
@@ -57,7 +127,8 @@ def create_analysis_endpoint(
     current_user: UserRecord = Depends(get_current_user),
 ) -> CreateAnalysisResponse:
     response = create_analysis(current_user.id, payload)
-    background_tasks.add_task(process_analysis_job, response.analysis_id, response.analysis_id)
+    if ANALYSIS_JOBS_INLINE:
+        background_tasks.add_task(process_analysis_job, response.analysis_id, response.analysis_id)
     return response
 
 
@@ -75,6 +146,55 @@ def get_analysis_status_endpoint(
     return result
 
 
+@router.get(
+    "/{analysis_id}/events",
+    response_class=StreamingResponse,
+    responses={
+        status.HTTP_200_OK: {
+            "description": "Server-Sent Events: one `status` event per progress_stage change, closed once finished",
+            "content": {"text/event-stream": {}},
+        },
+        status.HTTP_404_NOT_FOUND: {"description": "Analysis not found for current user"},
+    },
+)
+async def analysis_events_endpoint(
+    analysis_id: str,
+    current_user: UserRecord = Depends(get_current_user),
+) -> StreamingResponse:
+    if await run_in_threadpool(get_analysis_status, current_user.id, analysis_id) is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=ANALYSIS_NOT_FOUND_DETAIL,
+        )
+    return StreamingResponse(
+        _status_events(current_user.id, analysis_id),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.get("/{analysis_id}/wait", response_model=AnalysisStatusResponse)
+async def wait_for_analysis_status_endpoint(
+    analysis_id: str,
+    progress_stage: str | None = Query(default=None, description="Last progress_stage the client has seen"),
+    timeout: float = Query(default=25, ge=0, description="Seconds to wait for a change"),
+    current_user: UserRecord = Depends(get_current_user),
+) -> AnalysisStatusResponse:
+    """Long-poll: answers as soon as the stage differs from ``progress_stage``, or with the current status after ``timeout``."""
+    with get_analysis_event_bus().subscribe(analysis_id) as watcher:
+        state = await run_in_threadpool(get_analysis_status, current_user.id, analysis_id)
+        if state is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=ANALYSIS_NOT_FOUND_DETAIL,
+            )
+        if progress_stage is None or progress_stage != state.progress_stage or is_analysis_finished(state):
+            return state
+        return await _wait_for_change(
+            watcher, current_user.id, analysis_id, state, min(timeout, ANALYSIS_LONG_POLL_MAX_SECONDS)
+        )
+
+
 @router.get("/{analysis_id}/input", response_model=AnalysisInputResponse)
 def get_analysis_input_endpoint(
     analysis_id: str,
@@ -136,3 +256,33 @@ def get_analysis_result_endpoint(
         )
 
     return result
+
+
+@router.post(
+    "/{analysis_id}/what-if",
+    response_model=WhatIfResponse,
+    responses={
+        status.HTTP_404_NOT_FOUND: {
+            "description": "Analysis not found for current user",
+            "content": {
+                "application/json": {
+                    "example": {"detail": ANALYSIS_NOT_FOUND_DETAIL},
+                }
+            },
+        },
+        **INFERENCE_OVERLOADED_RESPONSES,
+    },
+)
+async def what_if_analysis_endpoint(
+    analysis_id: str,
+    payload: WhatIfRequest,
+    current_user: UserRecord = Depends(get_current_user),
+) -> WhatIfResponse:
+    base = await run_in_threadpool(get_analysis_input, current_user.id, analysis_id)
+    if base is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=ANALYSIS_NOT_FOUND_DETAIL,
+        )
+    # Scoring goes through the inference executor like /v1/risk/predict, with the same 503 backpressure.
+    return await run_inference(score_analysis_what_if, base, payload)
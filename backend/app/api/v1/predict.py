@@ -1,23 +1,151 @@
-from fastapi import APIRouter
+import time
+from typing import Any, Callable, TypeVar
+
+from fastapi import APIRouter, HTTPException, Request, status
+from fastapi.responses import JSONResponse
 
 from app.core.observability import log_event
-from app.services.prediction_service import PredictRequest, PredictResponse, predict_payload
+from app.core.readiness import is_ready, readiness_status
+from app.services.bulk_scoring import (
+    BulkFormatError,
+    UploadStreamingResponse,
+    resolve_bulk_format,
+    stream_bulk_predictions,
+)
+from app.services.inference_executor import InferenceOverloadedError, get_inference_executor
+from app.services.prediction_service import (
+    PredictBatchRequest,
+    PredictBatchResponse,
+    PredictRequest,
+    PredictResponse,
+    get_inference_scheduler,
+    predict_batch_payloads,
+    predict_payload,
+    prepare_prediction,
+)
+from app.services.response_encoding import PredictJSONResponse
 
 router = APIRouter()
 
+R = TypeVar('R')
+
+INFERENCE_OVERLOADED_RESPONSES = {
+    status.HTTP_503_SERVICE_UNAVAILABLE: {
+        'description': 'Inference queue is full; retry after the Retry-After delay',
+        'content': {
+            'application/json': {
+                'example': {
+                    'detail': {'error_code': 'inference_overloaded', 'message': 'Inference queue is full, retry later'}
+                },
+            }
+        },
+    },
+}
+
+
+def _overloaded(exc: InferenceOverloadedError) -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail={'error_code': 'inference_overloaded', 'message': 'Inference queue is full, retry later'},
+        headers={'Retry-After': str(exc.retry_after_seconds)},
+    )
+
+
+async def run_inference(fn: Callable[..., R], *args: Any) -> R:
+    try:
+        return await get_inference_executor().run(fn, *args)
+    except InferenceOverloadedError as exc:
+        raise _overloaded(exc) from exc
+
+
+async def _predict_single(data: dict[str, Any]) -> PredictResponse:
+    scheduler = get_inference_scheduler()
+    if scheduler is None:
+        return await run_inference(predict_payload, data)
+    # With micro-batching on, a request waiting for its batch must not hold an executor worker,
+    # or at most INFERENCE_WORKERS requests could ever be batched together.
+    prepared = await run_inference(prepare_prediction, data)
+    if isinstance(prepared, PredictResponse):
+        return prepared
+    try:
+        return await get_inference_executor().run_admitted(lambda: scheduler.submit(prepared))
+    except InferenceOverloadedError as exc:
+        raise _overloaded(exc) from exc
+
 
 @router.get('/health')
 def health() -> dict[str, str]:
     return {'status': 'ok'}
 
 
-@router.post('/v1/risk/predict', response_model=PredictResponse)
-def predict(payload: PredictRequest) -> PredictResponse:
-    response = predict_payload(payload.model_dump())
+@router.get('/ready', responses={status.HTTP_503_SERVICE_UNAVAILABLE: {'description': 'Model is not warmed up yet'}})
+def ready() -> JSONResponse:
+    if not is_ready():
+        return JSONResponse(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, content={'status': readiness_status()})
+    return JSONResponse(content={'status': 'ready'})
+
+
+@router.post('/v1/risk/predict', response_model=PredictResponse, responses=INFERENCE_OVERLOADED_RESPONSES)
+async def predict(payload: PredictRequest) -> PredictJSONResponse:
+    response = await _predict_single(payload.model_dump())
     log_event(
         'predict_called',
         status=response.status,
         confidence=response.confidence,
         missing_required_fields_count=len(response.missing_required_fields),
     )
-    return response
+    # Returning a Response skips response_model re-validation; the model above only documents the schema.
+    return PredictJSONResponse(response)
+
+
+@router.post('/v1/risk/predict/batch', response_model=PredictBatchResponse, responses=INFERENCE_OVERLOADED_RESPONSES)
+async def predict_batch(payload: PredictBatchRequest) -> PredictJSONResponse:
+    results = await run_inference(predict_batch_payloads, [row.model_dump() for row in payload.rows])
+    ok_count = sum(result.status == 'ok' for result in results)
+    log_event(
+        'predict_batch_called',
+        rows_count=len(results),
+        ok_count=ok_count,
+        needs_input_count=len(results) - ok_count,
+    )
+    return PredictJSONResponse(PredictBatchResponse.model_construct(results=results))
+
+
+async def _run_bulk_chunk(fn: Callable[..., R], *args: Any) -> R:
+    # Headers are already sent once streaming starts, so chunks wait for a free slot instead of failing.
+    return await get_inference_executor().run_when_free(fn, *args)
+
+
+@router.post(
+    '/v1/risk/predict/bulk',
+    response_class=UploadStreamingResponse,
+    responses={
+        status.HTTP_200_OK: {
+            'description': 'One NDJSON line per input row, streamed in input order',
+            'content': {'application/x-ndjson': {}},
+        },
+        status.HTTP_415_UNSUPPORTED_MEDIA_TYPE: {'description': 'Body is not text/csv or application/x-ndjson'},
+    },
+)
+async def predict_bulk(request: Request) -> UploadStreamingResponse:
+    try:
+        file_format = resolve_bulk_format(request.headers.get('content-type'))
+    except BulkFormatError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+            detail={'error_code': 'unsupported_media_type', 'message': str(exc)},
+        ) from exc
+
+    started = time.perf_counter()
+
+    def _completed(rows_count: int) -> None:
+        log_event(
+            'predict_bulk_called',
+            format=file_format,
+            rows_count=rows_count,
+            duration_ms=round((time.perf_counter() - started) * 1000, 1),
+        )
+
+    return UploadStreamingResponse(
+        stream_bulk_predictions(request.stream(), file_format, run=_run_bulk_chunk, on_complete=_completed)
+    )
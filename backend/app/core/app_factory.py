@@ -1,3 +1,4 @@
+import asyncio
 import os
 import logging
 import re
@@ -8,12 +9,22 @@ from fastapi import Request
 from fastapi.middleware.cors import CORSMiddleware
 from starlette.responses import Response
 
+from app.api.v1.admin import router as admin_router
 from app.api.v1.analyses import router as analyses_router
 from app.api.v1.auth import router as auth_router
 from app.api.v1.predict import router as predict_router
 from app.api.v1.users import router as users_router
 from app.core.observability import generate_correlation_id, reset_correlation_id, set_correlation_id
+from app.core.startup import startup_phase
 from app.db.database import init_db
+from app.services.analysis_writes import shutdown_analysis_writer
+from app.services.inference_executor import shutdown_inference_executor
+from app.services.prediction_service import (
+    get_registry,
+    load_and_warm_up_model,
+    shutdown_inference_scheduler,
+    shutdown_process_pool,
+)
 
 
 DEV_CORS_ORIGINS = [
@@ -56,8 +67,18 @@ def _resolve_cors_origins() -> tuple[list[str], str | None]:
 def create_app() -> FastAPI:
     @asynccontextmanager
     async def lifespan(_: FastAPI):
-        init_db()
+        with startup_phase('db_init'):
+            init_db()
+        # Warm up off the event loop so /health answers while /ready stays 503 until the model is hot.
+        warmup = asyncio.create_task(asyncio.to_thread(load_and_warm_up_model))
         yield
+        await warmup
+        get_registry().stop_watching()
+        shutdown_inference_scheduler()
+        shutdown_inference_executor()
+        shutdown_process_pool()
+        # Last, so write-behind creates and status writes of finished jobs are committed.
+        shutdown_analysis_writer()
 
     app = FastAPI(title='VERAE B2C API', version='0.3.0', lifespan=lifespan)
     logging.basicConfig(level=os.getenv('LOG_LEVEL', 'INFO'))
@@ -87,5 +108,6 @@ def create_app() -> FastAPI:
     app.include_router(analyses_router)
     app.include_router(users_router)
     app.include_router(predict_router)
+    app.include_router(admin_router)
 
     return app
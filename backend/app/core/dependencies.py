@@ -1,7 +1,12 @@
+import hmac
+import os
+
 from fastapi import Header, HTTPException, status
 
 from app.services.auth_service import UserRecord, decode_token
 
+ADMIN_API_TOKEN = os.getenv("ADMIN_API_TOKEN", "")
+
 
 def get_current_user(x_authorization: str | None = Header(default=None)) -> UserRecord:
     if not x_authorization:
@@ -18,3 +23,16 @@ def get_current_user(x_authorization: str | None = Header(default=None)) -> User
         )
 
     return decode_token(token.strip())
+
+
+def require_admin_token(x_admin_token: str | None = Header(default=None)) -> None:
+    if not ADMIN_API_TOKEN:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail={"error_code": "admin_disabled", "message": "Admin API is disabled"},
+        )
+    if not x_admin_token or not hmac.compare_digest(x_admin_token, ADMIN_API_TOKEN):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail={"error_code": "invalid_admin_token", "message": "Missing/invalid admin token"},
+        )
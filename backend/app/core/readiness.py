@@ -0,0 +1,28 @@
+from __future__ import annotations
+
+import threading
+
+_ready = threading.Event()
+_state = {"status": "starting"}
+
+
+def mark_ready() -> None:
+    _state["status"] = "ready"
+    _ready.set()
+
+
+def mark_not_ready(status: str = "starting") -> None:
+    _ready.clear()
+    _state["status"] = status
+
+
+def is_ready() -> bool:
+    return _ready.is_set()
+
+
+def readiness_status() -> str:
+    return _state["status"]
+
+
+def wait_until_ready(timeout: float | None = None) -> bool:
+    return _ready.wait(timeout)
@@ -0,0 +1,43 @@
+from __future__ import annotations
+
+import asyncio
+import os
+import socket
+import sys
+
+from gunicorn.arbiter import Arbiter
+from uvicorn.server import Server
+from uvicorn.workers import UvicornWorker
+
+# How long a stopping worker keeps reading requests from connections it has already accepted.
+SERVER_DRAIN_SECONDS = float(os.getenv("SERVER_DRAIN_SECONDS", "1"))
+
+
+class DrainingServer(Server):
+    """uvicorn server that stops accepting before it closes idle connections.
+
+    Plain uvicorn closes every connection that has not started a request yet
+    as soon as it begins shutting down, so a request on a connection accepted
+    just before a worker hits ``max_requests`` gets no response. Here the
+    listeners close first; requests that arrive during ``SERVER_DRAIN_SECONDS``
+    are served, then the regular graceful shutdown runs (in-flight requests and
+    their background tasks are awaited).
+    """
+
+    async def shutdown(self, sockets: list[socket.socket] | None = None) -> None:
+        for server in self.servers:
+            server.close()
+        await asyncio.sleep(SERVER_DRAIN_SECONDS)
+        await super().shutdown(sockets)
+
+
+class DrainingUvicornWorker(UvicornWorker):
+    """gunicorn worker class (see gunicorn.conf.py) serving through ``DrainingServer``."""
+
+    async def _serve(self) -> None:
+        self.config.app = self.wsgi
+        server = DrainingServer(config=self.config)
+        self._install_sigquit_handler()
+        await server.serve(sockets=self.sockets)
+        if not server.started:
+            sys.exit(Arbiter.WORKER_BOOT_ERROR)
@@ -0,0 +1,76 @@
+from __future__ import annotations
+
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Iterator
+
+from app.core.observability import log_event
+
+# Durations of the cold-start phases of this process: import, db_init, model_load, model_warmup.
+_lock = threading.Lock()
+_phases: dict[str, float] = {}
+_started = time.perf_counter()
+_ready_after: float | None = None
+
+
+def record_startup_phase(name: str, seconds: float) -> None:
+    with _lock:
+        _phases[name] = seconds
+    log_event("startup_phase", phase=name, duration_ms=round(seconds * 1000, 1))
+
+
+@contextmanager
+def startup_phase(name: str) -> Iterator[None]:
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        record_startup_phase(name, time.perf_counter() - started)
+
+
+def restart_startup_clock() -> None:
+    """Measure ``ready_after_ms`` from now; a forked worker calls it, as it inherits the master's clock."""
+    global _started, _ready_after
+    with _lock:
+        _started = time.perf_counter()
+        _ready_after = None
+
+
+def mark_startup_ready() -> None:
+    """Record how long after the app import started the process became ready."""
+    global _ready_after
+    with _lock:
+        _ready_after = time.perf_counter() - _started
+    log_event("startup_completed", **startup_report())
+
+
+def process_memory(pid: int | str = "self") -> dict[str, int]:
+    """Resident memory of a process in KiB, split into pages shared with other processes and private ones.
+
+    Read from ``/proc/<pid>/smaps_rollup`` (Linux); empty where it is not available.
+    Under the pre-fork server, model pages inherited from the master count as shared.
+    """
+    try:
+        with open(f"/proc/{pid}/smaps_rollup", encoding="ascii") as rollup:
+            lines = rollup.readlines()[1:]
+    except OSError:
+        return {}
+    fields = {}
+    for line in lines:
+        name, _, value = line.partition(":")
+        fields[name] = int(value.split()[0])
+    return {
+        "rss_kb": fields.get("Rss", 0),
+        "pss_kb": fields.get("Pss", 0),
+        "shared_kb": fields.get("Shared_Clean", 0) + fields.get("Shared_Dirty", 0),
+        "private_kb": fields.get("Private_Clean", 0) + fields.get("Private_Dirty", 0),
+    }
+
+
+def startup_report() -> dict[str, Any]:
+    with _lock:
+        phases = {name: round(seconds * 1000, 1) for name, seconds in _phases.items()}
+        ready_after = None if _ready_after is None else round(_ready_after * 1000, 1)
+    return {"pid": os.getpid(), "phases_ms": phases, "ready_after_ms": ready_after, "memory_kb": process_memory()}
@@ -19,27 +19,95 @@ class Base(DeclarativeBase):
     pass
 
 
-def _ensure_users_profile_columns() -> None:
-    required_columns = {
-        "first_name": "VARCHAR(120)",
-        "last_name": "VARCHAR(120)",
-        "default_age": "INTEGER",
-        "default_gender": "INTEGER",
-        "default_height": "FLOAT",
-        "default_weight": "FLOAT",
-    }
+def _ensure_columns(table_name: str, required_columns: dict[str, str]) -> list[str]:
     inspector = inspect(engine)
-    if "users" not in inspector.get_table_names():
-        return
+    if table_name not in inspector.get_table_names():
+        return []
 
-    existing = {column["name"] for column in inspector.get_columns("users")}
+    existing = {column["name"] for column in inspector.get_columns(table_name)}
     missing = [name for name in required_columns if name not in existing]
     if not missing:
-        return
+        return []
 
     with engine.begin() as connection:
         for column_name in missing:
-            connection.execute(text(f"ALTER TABLE users ADD COLUMN {column_name} {required_columns[column_name]}"))
+            connection.execute(text(f"ALTER TABLE {table_name} ADD COLUMN {column_name} {required_columns[column_name]}"))
+    return missing
+
+
+def _ensure_users_profile_columns() -> None:
+    _ensure_columns(
+        "users",
+        {
+            "first_name": "VARCHAR(120)",
+            "last_name": "VARCHAR(120)",
+            "default_age": "INTEGER",
+            "default_gender": "INTEGER",
+            "default_height": "FLOAT",
+            "default_weight": "FLOAT",
+        },
+    )
+
+
+def _ensure_analyses_queue_columns() -> None:
+    added = _ensure_columns(
+        "analyses",
+        {
+            "attempts": "INTEGER NOT NULL DEFAULT 0",
+            "available_at": "TIMESTAMP",
+            "lease_expires_at": "TIMESTAMP",
+            "claimed_by": "VARCHAR(96)",
+        },
+    )
+    if not added:
+        return
+
+    with engine.begin() as connection:
+        # Analyses created before the queue existed become claimable in creation order.
+        connection.execute(text("UPDATE analyses SET available_at = created_at WHERE available_at IS NULL"))
+        connection.execute(text("CREATE INDEX IF NOT EXISTS ix_analyses_queue ON analyses (status, available_at)"))
+
+
+def _ensure_analyses_list_index() -> None:
+    # create_all() adds indexes only with new tables.
+    with engine.begin() as connection:
+        connection.execute(
+            text("CREATE INDEX IF NOT EXISTS ix_analyses_user_created ON analyses (user_id, created_at DESC, id DESC)")
+        )
+        # Its leading column covers every lookup the single-column user_id index served.
+        connection.execute(text("DROP INDEX IF EXISTS ix_analyses_user_id"))
+
+
+def _copy_analysis_payloads() -> None:
+    """Databases from before ``analysis_payloads``: copy the JSON columns still on ``analyses`` over.
+
+    Idempotent and safe to run from several processes at once (API and worker start together), so it
+    runs on every startup while the old columns exist: rows written by not-yet-upgraded instances during
+    a rolling deploy are picked up by the next startup. The columns are dropped only by
+    migrations/20261017_003_split_analysis_payloads.sql, run by hand once no old instance is left.
+    """
+    existing = {column["name"] for column in inspect(engine).get_columns("analyses")}
+    if not {"input_payload", "result_payload"} & existing:
+        return
+
+    # Postgres created the columns as TEXT (migrations/20260219_001_add_analysis_payloads.sql).
+    cast = "CAST(analyses.{0} AS JSON)" if engine.dialect.name == "postgresql" else "analyses.{0}"
+    input_column, result_column = (
+        cast.format(name) if name in existing else "NULL" for name in ("input_payload", "result_payload")
+    )
+    with engine.begin() as connection:
+        connection.execute(
+            text(
+                "INSERT INTO analysis_payloads (analysis_id, input_payload, result_payload) "
+                f"SELECT analyses.id, {input_column}, {result_column} FROM analyses "
+                "LEFT JOIN analysis_payloads ON analysis_payloads.analysis_id = analyses.id "
+                "WHERE analysis_payloads.analysis_id IS NULL "
+                f"OR (analysis_payloads.result_payload IS NULL AND {result_column} IS NOT NULL) "
+                "ON CONFLICT (analysis_id) DO UPDATE SET "
+                "input_payload = COALESCE(analysis_payloads.input_payload, excluded.input_payload), "
+                "result_payload = COALESCE(analysis_payloads.result_payload, excluded.result_payload)"
+            )
+        )
 
 
 def init_db() -> None:
@@ -47,3 +115,6 @@ def init_db() -> None:
 
     Base.metadata.create_all(bind=engine)
     _ensure_users_profile_columns()
+    _ensure_analyses_queue_columns()
+    _ensure_analyses_list_index()
+    _copy_analysis_payloads()
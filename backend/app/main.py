@@ -1,3 +1,6 @@
-from app.core.app_factory import create_app
+from app.core.startup import startup_phase
 
-app = create_app()
+with startup_phase('import'):
+    from app.core.app_factory import create_app
+
+    app = create_app()
@@ -1,52 +1,62 @@
 from __future__ import annotations
 
-import time
+import base64
+import binascii
+import os
+import socket
+import threading
 import uuid
+from concurrent.futures import BrokenExecutor, Future
 from dataclasses import dataclass
 from datetime import datetime, timezone
 
 from pydantic import BaseModel
+from sqlalchemy import Row, insert, select, tuple_, update
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.sql import Select
 
 from app.core.observability import log_event, reset_correlation_id, set_correlation_id
 from app.db.database import SessionLocal
 from app.db.models import Analysis as AnalysisModel
-from app.services.prediction_service import PredictRequest, PredictResponse, predict_payload
-
-
-def _now_iso() -> str:
-    return time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())
+from app.db.models import AnalysisPayload
+from app.services.analysis_events import publish_analysis_change
+from app.services.analysis_queue import (
+    ANALYSIS_JOB_MAX_ATTEMPTS,
+    DEAD_LETTER_REASON,
+    ClaimedJob,
+    claim_jobs,
+    complete_job,
+    complete_jobs,
+    fail_job,
+    retry_job,
+)
+from app.services.analysis_writes import get_analysis_writer
+from app.services.inference_executor import get_inference_executor
+from app.services.prediction_service import (
+    PredictionCache,
+    PredictRequest,
+    PredictResponse,
+    predict_batch_payloads,
+    predict_payload,
+    predict_what_if,
+)
+
+# Local read-through cache of finished analyses' status; ANALYSIS_STATE_CACHE_SIZE=0 reads every status from the DB.
+ANALYSIS_STATE_CACHE_SIZE = int(os.getenv("ANALYSIS_STATE_CACHE_SIZE", "4096"))
+ANALYSIS_STATE_CACHE_TTL_SECONDS = float(os.getenv("ANALYSIS_STATE_CACHE_TTL_SECONDS", "600"))
+# POST /analyses answers before its row is committed (write-behind); a crash in that window loses the analysis.
+ANALYSIS_CREATE_WRITE_BEHIND = os.getenv("ANALYSIS_CREATE_WRITE_BEHIND", "0") == "1"
+# GET /analyses page size when the client sends no `limit`, and the largest page a client may ask for.
+ANALYSIS_LIST_DEFAULT_LIMIT = max(1, int(os.getenv("ANALYSIS_LIST_DEFAULT_LIMIT", "50")))
+ANALYSIS_LIST_MAX_LIMIT = max(ANALYSIS_LIST_DEFAULT_LIMIT, int(os.getenv("ANALYSIS_LIST_MAX_LIMIT", "200")))
 
 
 def _now_utc() -> datetime:
     return datetime.now(timezone.utc).replace(tzinfo=None)
 
 
-def _db_save_analysis(record: "AnalysisRecord", *, input_payload: dict | None = None) -> None:
-    with SessionLocal() as session:
-        row = session.get(AnalysisModel, record.analysis_id)
-        if row is None:
-            row = AnalysisModel(
-                id=record.analysis_id,
-                user_id=record.user_id,
-                status=record.status,
-                progress_stage=record.progress_stage,
-                error_message=record.error_message,
-                failure_reason=record.failure_reason,
-                input_payload=input_payload,
-                result_payload=None,
-                created_at=_now_utc(),
-                updated_at=_now_utc(),
-            )
-            session.add(row)
-        else:
-            row.status = record.status
-            row.progress_stage = record.progress_stage
-            row.error_message = record.error_message
-            row.failure_reason = record.failure_reason
-            row.updated_at = _now_utc()
-            if record.result is not None:
-                row.result_payload = record.result.model_dump()
-        session.commit()
+def _format_ts(value: datetime) -> str:
+    return value.strftime("%Y-%m-%dT%H:%M:%SZ")
 
 
 class UploadMetadata(BaseModel):
@@ -86,99 +96,225 @@ class AnalysisStatusResponse(BaseModel):
     updated_at: str
 
 
-@dataclass
-class AnalysisRecord:
+@dataclass(frozen=True, slots=True)
+class AnalysisState:
+    """Status columns of one ``analyses`` row; the DB is the source of truth, this is what gets cached."""
+
     analysis_id: str
     user_id: str
     status: str
     progress_stage: str
-    created_at: str
+    failure_reason: str | None
     updated_at: str
-    upload: UploadMetadata
-    lab: dict
-    result: PredictResponse | None = None
-    error_message: str | None = None
-    failure_reason: str | None = None
 
+    @classmethod
+    def from_row(cls, row: AnalysisModel) -> "AnalysisState":
+        return cls(
+            analysis_id=row.id,
+            user_id=row.user_id,
+            status=row.status,
+            progress_stage=row.progress_stage,
+            failure_reason=row.failure_reason,
+            updated_at=_format_ts(row.updated_at),
+        )
+
+    def as_status_response(self) -> AnalysisStatusResponse:
+        failed = self.status == "failed"
+        return AnalysisStatusResponse(
+            analysis_id=self.analysis_id,
+            status=self.status,
+            progress_stage=self.progress_stage,
+            error_code=self.failure_reason if failed else None,
+            failure_diagnostic=self.failure_reason if failed else None,
+            updated_at=self.updated_at,
+        )
 
-_ANALYSES: dict[str, AnalysisRecord] = {}
 
 _ALLOWED_TRANSITIONS: dict[str, set[str]] = {
     "pending": {"processing"},
-    "processing": {"completed", "failed"},
+    "processing": {"completed", "failed", "pending"},  # back to pending: retry or expired lease
     "completed": set(),
     "failed": set(),
 }
+# Finished analyses never change again, so only they are cached and a cached status is never stale.
+_TERMINAL_STATUSES = frozenset(status for status, allowed in _ALLOWED_TRANSITIONS.items() if not allowed)
 
+_ANALYSIS_STATES: PredictionCache[AnalysisState] = PredictionCache(
+    ANALYSIS_STATE_CACHE_SIZE, ANALYSIS_STATE_CACHE_TTL_SECONDS
+)
 
-def _set_status(record: AnalysisRecord, next_status: str, *, progress_stage: str, error_message: str | None = None, failure_reason: str | None = None) -> None:
-    if next_status != record.status:
-        allowed = _ALLOWED_TRANSITIONS.get(record.status, set())
-        if next_status not in allowed:
-            raise ValueError(f"Invalid status transition: {record.status} -> {next_status}")
-    record.status = next_status
-    record.progress_stage = progress_stage
-    record.error_message = error_message
-    record.failure_reason = failure_reason
-    record.updated_at = _now_iso()
 
+def get_analysis_state_cache() -> PredictionCache[AnalysisState]:
+    return _ANALYSIS_STATES
 
-def process_analysis_job(analysis_id: str, correlation_id: str | None = None) -> None:
-    """Run model inference in background and store result. Sets status to completed or failed."""
-    token = set_correlation_id(correlation_id or analysis_id)
-    record = _ANALYSES.get(analysis_id)
-    if record is None:
-        log_event('analysis_job_missing', analysis_id=analysis_id)
-        reset_correlation_id(token)
+
+# Write-behind creates not committed yet: their status is served from here, and jobs wait for the commit.
+_PENDING_CREATES: dict[str, tuple[AnalysisState, Future]] = {}
+_PENDING_CREATES_LOCK = threading.Lock()
+
+
+def _forget_pending_create(analysis_id: str, future: Future) -> None:
+    with _PENDING_CREATES_LOCK:
+        _PENDING_CREATES.pop(analysis_id, None)
+    if future.exception() is not None:
+        log_event('analysis_create_write_failed', analysis_id=analysis_id, error=str(future.exception()))
+
+
+def _await_pending_create(analysis_id: str) -> bool:
+    """Wait for a write-behind create of this analysis; False when its insert failed."""
+    with _PENDING_CREATES_LOCK:
+        pending = _PENDING_CREATES.get(analysis_id)
+    if pending is None:
+        return True
+    return pending[1].exception() is None
+
+
+def _load_state(analysis_id: str) -> AnalysisState | None:
+    state = _ANALYSIS_STATES.get(analysis_id)
+    if state is not None:
+        return state
+    with _PENDING_CREATES_LOCK:
+        pending = _PENDING_CREATES.get(analysis_id)
+    if pending is not None:
+        return pending[0]
+    with SessionLocal() as session:
+        row = session.get(AnalysisModel, analysis_id)
+    if row is None:
+        return None
+    state = AnalysisState.from_row(row)
+    if state.status in _TERMINAL_STATUSES:
+        _ANALYSIS_STATES.put(analysis_id, state)
+    return state
+
+
+# Failures worth another attempt after a backoff; any other error fails the analysis at once.
+_RETRYABLE_ERRORS: tuple[type[BaseException], ...] = (OperationalError, TimeoutError, ConnectionError, BrokenExecutor)
+
+
+def _reject_unrunnable(job: ClaimedJob) -> bool:
+    """Settle a job that must not be scored; True when it was."""
+    if job.attempts > ANALYSIS_JOB_MAX_ATTEMPTS:
+        # Its earlier runs never settled (worker killed mid-job), so the lease kept expiring.
+        fail_job(job, DEAD_LETTER_REASON, "Lease expired on every attempt")
+        log_event('analysis_completed', analysis_id=job.analysis_id, status='failed', reason=DEAD_LETTER_REASON, attempts=job.attempts)
+        return True
+    if not job.input_payload:
+        fail_job(job, "empty_lab_payload", "Lab payload is empty")
+        log_event('analysis_completed', analysis_id=job.analysis_id, status='failed', reason='empty_lab_payload')
+        return True
+    return False
+
+
+def _retry_analysis(job: ClaimedJob, exc: BaseException) -> None:
+    settled, dead_lettered = retry_job(job, str(exc))
+    log_event(
+        'analysis_completed' if dead_lettered else 'analysis_retry_scheduled',
+        analysis_id=job.analysis_id,
+        status='failed' if dead_lettered else 'pending',
+        reason=DEAD_LETTER_REASON if dead_lettered else type(exc).__name__,
+        attempts=job.attempts,
+        lease_lost=not settled,
+    )
+
+
+def _log_completed(job: ClaimedJob, result: PredictResponse, settled: bool) -> None:
+    if not settled:
+        log_event('analysis_job_lease_lost', analysis_id=job.analysis_id, attempts=job.attempts)
         return
-    if not record.lab:
-        record.status = "failed"
-        record.progress_stage = "failed"
-        record.failure_reason = "empty_lab_payload"
-        record.error_message = "Lab payload is empty"
-        record.updated_at = _now_iso()
-        log_event('analysis_completed', analysis_id=analysis_id, status='failed', reason='empty_lab_payload')
-        reset_correlation_id(token)
+    log_event('analysis_completed', analysis_id=job.analysis_id, status='success', result_status=result.status)
+
+
+def run_analysis_job(job: ClaimedJob) -> None:
+    """Score a claimed job and settle it: completed, failed, back in the queue, or dead-lettered."""
+    if _reject_unrunnable(job):
+        return
+
+    log_event('analysis_processing_started', analysis_id=job.analysis_id, attempt=job.attempts)
+    try:
+        # Background jobs wait for an inference slot rather than being rejected like API calls.
+        result = get_inference_executor().call(predict_payload, job.input_payload)
+    except _RETRYABLE_ERRORS as exc:
+        _retry_analysis(job, exc)
+        return
+    except Exception as exc:
+        fail_job(job, "inference_error", str(exc))
+        log_event('analysis_completed', analysis_id=job.analysis_id, status='failed', reason='inference_error')
+        return
+    _log_completed(job, result, complete_job(job, result.model_dump()))
+
+
+def run_analysis_jobs(jobs: list[ClaimedJob]) -> None:
+    """Score claimed jobs with one vectorized predict+SHAP call and store the results in one transaction.
+
+    Invalid inputs come back as per-row needs_input responses, so one bad
+    analysis does not affect the others. If the batch call itself raises, a
+    transient error puts every job back in the queue; anything else is
+    retried job by job so only the analyses that fail on their own are failed.
+    """
+    runnable = [job for job in jobs if not _reject_unrunnable(job)]
+    if len(runnable) <= 1:
+        for job in runnable:
+            run_analysis_job(job)
         return
 
-    log_event('analysis_processing_started', analysis_id=analysis_id)
-    record.status = "processing"
-    record.progress_stage = "model_inference"
-    record.updated_at = _now_iso()
+    log_event('analysis_batch_started', jobs=len(runnable))
     try:
-        result = predict_payload(record.lab)
-        record.result = result
-        record.status = "completed"
-        record.progress_stage = "completed"
-        log_event('analysis_completed', analysis_id=analysis_id, status='success', result_status=result.status)
+        results = get_inference_executor().call(predict_batch_payloads, [job.input_payload for job in runnable])
+    except _RETRYABLE_ERRORS as exc:
+        for job in runnable:
+            _retry_analysis(job, exc)
+        return
     except Exception as exc:
-        record.status = "failed"
-        record.progress_stage = "failed"
-        record.failure_reason = "inference_error"
-        record.error_message = str(exc)
-        log_event('analysis_completed', analysis_id=analysis_id, status='failed', reason='inference_error')
-    record.updated_at = _now_iso()
-    _db_save_analysis(record)
-    reset_correlation_id(token)
+        log_event('analysis_batch_fallback', jobs=len(runnable), error=str(exc))
+        for job in runnable:
+            run_analysis_job(job)
+        return
+    settled = complete_jobs([(job, result.model_dump()) for job, result in zip(runnable, results)])
+    for job, result, job_settled in zip(runnable, results, settled):
+        _log_completed(job, result, job_settled)
+
+
+def process_analysis_job(analysis_id: str, correlation_id: str | None = None) -> None:
+    """Claim one queued analysis in this process and run it (the inline, BackgroundTasks path)."""
+    token = set_correlation_id(correlation_id or analysis_id)
+    try:
+        if not _await_pending_create(analysis_id):
+            return
+        # pid read per call: with a preloading server this module is imported before the fork.
+        jobs = claim_jobs(f"api:{socket.gethostname()}:{os.getpid()}", analysis_id=analysis_id)
+        if not jobs:
+            # Missing, not due yet, or already claimed by a worker or an earlier run of this job.
+            log_event('analysis_job_skipped', analysis_id=analysis_id)
+            return
+        run_analysis_job(jobs[0])
+    finally:
+        reset_correlation_id(token)
 
 
 def create_analysis(user_id: str, payload: CreateAnalysisRequest) -> CreateAnalysisResponse:
-    now = _now_iso()
+    now = _now_utc()
     analysis_id = str(uuid.uuid4())
     job_id = str(uuid.uuid4())
     lab_dict = payload.lab.model_dump()
-    record = AnalysisRecord(
-        analysis_id=analysis_id,
+    statement = insert(AnalysisModel).values(
+        id=analysis_id,
         user_id=user_id,
         status="pending",
         progress_stage="queued",
         created_at=now,
         updated_at=now,
-        upload=payload.upload,
-        lab=lab_dict,
+        available_at=now,
     )
-    _ANALYSES[analysis_id] = record
-    _db_save_analysis(record, input_payload=lab_dict)
+    # Same transaction: a claimable analysis always has its input.
+    payload_row = [(insert(AnalysisPayload).values(analysis_id=analysis_id, input_payload=lab_dict, result_payload=None), None)]
+    if ANALYSIS_CREATE_WRITE_BEHIND:
+        state = AnalysisState(analysis_id, user_id, "pending", "queued", None, _format_ts(now))
+        with _PENDING_CREATES_LOCK:
+            future = get_analysis_writer().submit(statement, then=payload_row)
+            _PENDING_CREATES[analysis_id] = (state, future)
+        future.add_done_callback(lambda done: _forget_pending_create(analysis_id, done))
+    else:
+        get_analysis_writer().execute(statement, then=payload_row)
     log_event(
         'analysis_created',
         analysis_id=analysis_id,
@@ -193,38 +329,20 @@ def create_analysis(user_id: str, payload: CreateAnalysisRequest) -> CreateAnaly
         status="pending",
         progress_stage="queued",
         job=JobInfo(id=job_id, status="queued"),
-        created_at=now,
-        updated_at=now,
+        created_at=_format_ts(now),
+        updated_at=_format_ts(now),
     )
 
 
-def get_analysis_status(user_id: str, analysis_id: str) -> AnalysisStatusResponse | None:
-    mem = _ANALYSES.get(analysis_id)
-    if mem is not None:
-        if mem.user_id != user_id:
-            return None
-        return AnalysisStatusResponse(
-            analysis_id=mem.analysis_id,
-            status=mem.status,
-            progress_stage=mem.progress_stage,
-            error_code=mem.failure_reason if mem.status == "failed" else None,
-            failure_diagnostic=mem.failure_reason if mem.status == "failed" else None,
-            updated_at=mem.updated_at,
-        )
+def is_analysis_finished(state: AnalysisStatusResponse) -> bool:
+    return state.status in _TERMINAL_STATUSES
 
-    with SessionLocal() as session:
-        row = session.get(AnalysisModel, analysis_id)
-    if row is None or row.user_id != user_id:
-        return None
 
-    return AnalysisStatusResponse(
-        analysis_id=row.id,
-        status=row.status,
-        progress_stage=row.progress_stage,
-        error_code=row.failure_reason if row.status == "failed" else None,
-        failure_diagnostic=row.failure_reason if row.status == "failed" else None,
-        updated_at=row.updated_at.strftime("%Y-%m-%dT%H:%M:%SZ"),
-    )
+def get_analysis_status(user_id: str, analysis_id: str) -> AnalysisStatusResponse | None:
+    state = _load_state(analysis_id)
+    if state is None or state.user_id != user_id:
+        return None
+    return state.as_status_response()
 
 
 def advance_analysis_state(
@@ -234,37 +352,47 @@ def advance_analysis_state(
     status: str = "completed",
     progress_stage: str | None = None,
 ) -> AnalysisStatusResponse | None:
-    record = _ANALYSES.get(analysis_id)
-    if record is None or record.user_id != user_id:
-        return None
-
-    _set_status(record, status, progress_stage=progress_stage or status)
-
-    return AnalysisStatusResponse(
-        analysis_id=record.analysis_id,
-        status=record.status,
-        progress_stage=record.progress_stage,
-        error_code=record.failure_reason if record.status == "failed" else None,
-        failure_diagnostic=record.failure_reason if record.status == "failed" else None,
-        updated_at=record.updated_at,
+    # One conditional UPDATE: the allowed source states are in the WHERE clause, so nothing is read first.
+    sources = [source for source, allowed in _ALLOWED_TRANSITIONS.items() if source == status or status in allowed]
+    _await_pending_create(analysis_id)
+    rows = get_analysis_writer().execute(
+        update(AnalysisModel)
+        .where(AnalysisModel.id == analysis_id, AnalysisModel.user_id == user_id, AnalysisModel.status.in_(sources))
+        .values(status=status, progress_stage=progress_stage or status, error_message=None, failure_reason=None, updated_at=_now_utc())
+        .returning(
+            AnalysisModel.id,
+            AnalysisModel.user_id,
+            AnalysisModel.status,
+            AnalysisModel.progress_stage,
+            AnalysisModel.failure_reason,
+            AnalysisModel.updated_at,
+        )
+        .execution_options(synchronize_session=False)
     )
+    if not rows:
+        # Only the error path reads the row, to tell a missing analysis from a refused transition.
+        current = _load_state(analysis_id)
+        if current is None or current.user_id != user_id:
+            return None
+        raise ValueError(f"Invalid status transition: {current.status} -> {status}")
+    publish_analysis_change(analysis_id)
+    return AnalysisState.from_row(rows[0]).as_status_response()
 
 
 def get_analysis_result(user_id: str, analysis_id: str) -> PredictResponse | None:
     with SessionLocal() as session:
-        row = session.get(AnalysisModel, analysis_id)
+        row = session.execute(
+            select(AnalysisModel.user_id, AnalysisModel.status, AnalysisPayload.result_payload)
+            .outerjoin(AnalysisPayload, AnalysisPayload.analysis_id == AnalysisModel.id)
+            .where(AnalysisModel.id == analysis_id)
+        ).first()
     if row is None or row.user_id != user_id:
         return None
-    if row.status != "completed":
+    if row.status != "completed" or row.result_payload is None:
         return None
-    if row.result_payload is None:
-        mem = _ANALYSES.get(analysis_id)
-        return mem.result if mem else None
     return PredictResponse.model_validate(row.result_payload)
 
 
-
-
 class AnalysisInputResponse(BaseModel):
     analysis_id: str
     status: str
@@ -273,38 +401,86 @@ class AnalysisInputResponse(BaseModel):
     updated_at: str
 
 
-def get_latest_analysis_input(user_id: str) -> AnalysisInputResponse | None:
-    with SessionLocal() as session:
-        row = (
-            session.query(AnalysisModel)
-            .filter(AnalysisModel.user_id == user_id)
-            .order_by(AnalysisModel.created_at.desc())
-            .first()
-        )
+def _analysis_input_query() -> Select:
+    return select(
+        AnalysisModel.id,
+        AnalysisModel.user_id,
+        AnalysisModel.status,
+        AnalysisModel.created_at,
+        AnalysisModel.updated_at,
+        AnalysisPayload.input_payload,
+    ).outerjoin(AnalysisPayload, AnalysisPayload.analysis_id == AnalysisModel.id)
 
-    if row is None:
-        return None
 
+def _analysis_input_response(row: Row) -> AnalysisInputResponse:
     return AnalysisInputResponse(
         analysis_id=row.id,
         status=row.status,
         input_payload=row.input_payload or {},
-        created_at=row.created_at.strftime("%Y-%m-%dT%H:%M:%SZ"),
-        updated_at=row.updated_at.strftime("%Y-%m-%dT%H:%M:%SZ"),
+        created_at=_format_ts(row.created_at),
+        updated_at=_format_ts(row.updated_at),
     )
 
 
+def get_latest_analysis_input(user_id: str) -> AnalysisInputResponse | None:
+    with SessionLocal() as session:
+        row = session.execute(
+            _analysis_input_query()
+            .where(AnalysisModel.user_id == user_id)
+            .order_by(AnalysisModel.created_at.desc(), AnalysisModel.id.desc())
+            .limit(1)
+        ).first()
+
+    if row is None:
+        return None
+
+    return _analysis_input_response(row)
+
+
 def get_analysis_input(user_id: str, analysis_id: str) -> AnalysisInputResponse | None:
     with SessionLocal() as session:
-        row = session.get(AnalysisModel, analysis_id)
+        row = session.execute(_analysis_input_query().where(AnalysisModel.id == analysis_id)).first()
     if row is None or row.user_id != user_id:
         return None
-    return AnalysisInputResponse(
-        analysis_id=row.id,
-        status=row.status,
-        input_payload=row.input_payload or {},
-        created_at=row.created_at.strftime("%Y-%m-%dT%H:%M:%SZ"),
-        updated_at=row.updated_at.strftime("%Y-%m-%dT%H:%M:%SZ"),
+    return _analysis_input_response(row)
+
+
+class WhatIfRequest(BaseModel):
+    changes: PredictRequest
+
+
+class WhatIfResponse(BaseModel):
+    base_analysis_id: str
+    changed_features: list[str]
+    trees_rescored: int
+    trees_total: int
+    result: PredictResponse
+
+
+def score_analysis_what_if(base: AnalysisInputResponse, payload: WhatIfRequest) -> WhatIfResponse:
+    """Rescore a saved analysis input with some fields changed; only explicitly sent fields are applied.
+
+    Pure scoring: the caller reads ``base`` (``get_analysis_input``) and runs this on the inference executor.
+    """
+    analysis_id = base.analysis_id
+    score = predict_what_if(
+        base.input_payload,
+        payload.changes.model_dump(exclude_unset=True),
+        base_key=analysis_id,
+    )
+    log_event(
+        'analysis_what_if',
+        analysis_id=analysis_id,
+        status=score.response.status,
+        changed_features=score.changed_features,
+        trees_rescored=score.trees_rescored,
+    )
+    return WhatIfResponse(
+        base_analysis_id=analysis_id,
+        changed_features=score.changed_features,
+        trees_rescored=score.trees_rescored,
+        trees_total=score.trees_total,
+        result=score.response,
     )
 
 
@@ -316,22 +492,61 @@ class AnalysisListItem(BaseModel):
 
 class ListAnalysesResponse(BaseModel):
     analyses: list[AnalysisListItem]
+    # Pass as `cursor` to get the next page; null on the last page.
+    next_cursor: str | None = None
+
+
+def encode_list_cursor(created_at: datetime, analysis_id: str) -> str:
+    raw = f"{created_at.isoformat()}|{analysis_id}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_list_cursor(cursor: str) -> tuple[datetime, str]:
+    """The ``(created_at, id)`` of the last listed analysis; ValueError for a malformed cursor."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        created_at, analysis_id = raw.split("|", 1)
+        return datetime.fromisoformat(created_at), analysis_id
+    except (binascii.Error, UnicodeDecodeError, ValueError) as exc:
+        raise ValueError("Malformed analyses cursor") from exc
 
 
-def list_analyses(user_id: str) -> ListAnalysesResponse:
+def list_analyses(
+    user_id: str,
+    *,
+    limit: int = ANALYSIS_LIST_DEFAULT_LIMIT,
+    cursor: str | None = None,
+) -> ListAnalysesResponse:
+    """Newest first, one page at a time.
+
+    Keyset pagination on ``(created_at, id)``: a page continues strictly after
+    the cursor's row, so it is one index range scan on
+    ``ix_analyses_user_created`` however deep the client pages, and analyses
+    created meanwhile do not shift later pages. Only the listed columns are
+    selected; the JSON payloads are never read.
+    """
+    limit = min(max(1, limit), ANALYSIS_LIST_MAX_LIMIT)
+    query = (
+        select(AnalysisModel.id, AnalysisModel.status, AnalysisModel.created_at)
+        .where(AnalysisModel.user_id == user_id)
+        .order_by(AnalysisModel.created_at.desc(), AnalysisModel.id.desc())
+        .limit(limit + 1)
+    )
+    if cursor is not None:
+        after_created_at, after_id = decode_list_cursor(cursor)
+        # Row-value comparison: both SQLite and Postgres turn it into a range on the index.
+        query = query.where(tuple_(AnalysisModel.created_at, AnalysisModel.id) < tuple_(after_created_at, after_id))
     with SessionLocal() as session:
-        rows = (
-            session.query(AnalysisModel)
-            .filter(AnalysisModel.user_id == user_id)
-            .order_by(AnalysisModel.created_at.desc())
-            .all()
-        )
+        rows = session.execute(query).all()
+
+    page = rows[:limit]
     items = [
         AnalysisListItem(
             analysis_id=row.id,
             status=row.status,
-            created_at=row.created_at.strftime("%Y-%m-%dT%H:%M:%SZ"),
+            created_at=_format_ts(row.created_at),
         )
-        for row in rows
+        for row in page
     ]
-    return ListAnalysesResponse(analyses=items)
+    next_cursor = encode_list_cursor(page[-1].created_at, page[-1].id) if len(rows) > limit else None
+    return ListAnalysesResponse(analyses=items, next_cursor=next_cursor)
@@ -0,0 +1,149 @@
+from __future__ import annotations
+
+import asyncio
+import os
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from functools import lru_cache
+from typing import Iterator
+
+from sqlalchemy import select
+
+from app.core.observability import log_event
+from app.db.database import SessionLocal
+from app.db.models import Analysis as AnalysisModel
+
+# Changes written by other processes (worker processes, other API workers) are found by polling the DB this often.
+ANALYSIS_EVENTS_DB_POLL_SECONDS = float(os.getenv("ANALYSIS_EVENTS_DB_POLL_SECONDS", "2"))
+# SSE comment sent on an idle stream so proxies do not drop it.
+ANALYSIS_EVENTS_HEARTBEAT_SECONDS = float(os.getenv("ANALYSIS_EVENTS_HEARTBEAT_SECONDS", "15"))
+# An SSE stream closes after this long; EventSource clients reconnect on their own.
+ANALYSIS_EVENTS_MAX_SECONDS = float(os.getenv("ANALYSIS_EVENTS_MAX_SECONDS", "300"))
+# Upper bound for the `timeout` of GET /analyses/{id}/wait.
+ANALYSIS_LONG_POLL_MAX_SECONDS = float(os.getenv("ANALYSIS_LONG_POLL_MAX_SECONDS", "30"))
+
+_DB_POLL_CHUNK = 500
+
+
+class AnalysisWatcher:
+    """One waiting SSE stream or long-poll request; woken from any thread."""
+
+    def __init__(self, analysis_id: str, loop: asyncio.AbstractEventLoop) -> None:
+        self.analysis_id = analysis_id
+        self._loop = loop
+        self._changed = asyncio.Event()
+
+    def notify(self) -> None:
+        try:
+            self._loop.call_soon_threadsafe(self._changed.set)
+        except RuntimeError:
+            pass  # loop already closed: the request is gone
+
+    async def wait(self, timeout: float) -> bool:
+        """True when the analysis may have changed since the last wait, False on timeout."""
+        try:
+            await asyncio.wait_for(self._changed.wait(), max(0.0, timeout))
+        except TimeoutError:
+            return False
+        self._changed.clear()
+        return True
+
+
+class AnalysisEventBus:
+    """In-process notification of analysis state changes.
+
+    The queue publishes every transition it commits, which wakes watchers in
+    the same process at once. Transitions committed by other processes are
+    picked up by one poller thread that reads ``updated_at`` of all watched
+    analyses in a single query every ``poll_seconds``; it runs only while
+    something is watched. A wake-up only says "re-read the state": watchers
+    load the status themselves, so spurious wake-ups are harmless.
+    """
+
+    def __init__(self, poll_seconds: float = ANALYSIS_EVENTS_DB_POLL_SECONDS) -> None:
+        self.poll_seconds = poll_seconds
+        self._lock = threading.Lock()
+        self._watchers: dict[str, set[AnalysisWatcher]] = {}
+        self._seen: dict[str, datetime] = {}
+        self._poller: threading.Thread | None = None
+        self._published = 0
+        self._db_polls = 0
+
+    @contextmanager
+    def subscribe(self, analysis_id: str) -> Iterator[AnalysisWatcher]:
+        watcher = AnalysisWatcher(analysis_id, asyncio.get_running_loop())
+        with self._lock:
+            self._watchers.setdefault(analysis_id, set()).add(watcher)
+            if self.poll_seconds > 0 and (self._poller is None or not self._poller.is_alive()):
+                self._poller = threading.Thread(target=self._poll_db, name="analysis-events", daemon=True)
+                self._poller.start()
+        try:
+            yield watcher
+        finally:
+            with self._lock:
+                watchers = self._watchers.get(analysis_id)
+                watchers.discard(watcher)
+                if not watchers:
+                    del self._watchers[analysis_id]
+                    self._seen.pop(analysis_id, None)
+
+    def publish(self, *analysis_ids: str) -> None:
+        with self._lock:
+            watchers = [watcher for analysis_id in analysis_ids for watcher in self._watchers.get(analysis_id, ())]
+            self._published += len(analysis_ids)
+        for watcher in watchers:
+            watcher.notify()
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return {
+                "watched_analyses": len(self._watchers),
+                "watchers": sum(len(watchers) for watchers in self._watchers.values()),
+                "published": self._published,
+                "db_polls": self._db_polls,
+            }
+
+    def _poll_db(self) -> None:
+        while True:
+            time.sleep(self.poll_seconds)
+            with self._lock:
+                analysis_ids = list(self._watchers)
+                if not analysis_ids:
+                    self._poller = None
+                    return
+                self._db_polls += 1
+            try:
+                changed = self._changed_in_db(analysis_ids)
+            except Exception as exc:
+                log_event('analysis_events_poll_failed', error=str(exc))
+                continue
+            if changed:
+                self.publish(*changed)
+
+    def _changed_in_db(self, analysis_ids: list[str]) -> list[str]:
+        rows: list[tuple[str, datetime]] = []
+        with SessionLocal() as session:
+            for start in range(0, len(analysis_ids), _DB_POLL_CHUNK):
+                chunk = analysis_ids[start : start + _DB_POLL_CHUNK]
+                rows += session.execute(
+                    select(AnalysisModel.id, AnalysisModel.updated_at).where(AnalysisModel.id.in_(chunk))
+                ).all()
+        changed = []
+        with self._lock:
+            for analysis_id, updated_at in rows:
+                # First sight counts as a change: the watcher may have read the row before this poll.
+                if analysis_id in self._watchers and self._seen.get(analysis_id) != updated_at:
+                    self._seen[analysis_id] = updated_at
+                    changed.append(analysis_id)
+        return changed
+
+
+@lru_cache
+def get_analysis_event_bus() -> AnalysisEventBus:
+    return AnalysisEventBus()
+
+
+def publish_analysis_change(*analysis_ids: str) -> None:
+    get_analysis_event_bus().publish(*analysis_ids)
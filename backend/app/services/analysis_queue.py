@@ -0,0 +1,205 @@
+from __future__ import annotations
+
+import os
+import uuid
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import and_, bindparam, or_, select, update
+from sqlalchemy.sql import Select
+
+from app.db.database import SessionLocal
+from app.db.models import Analysis as AnalysisModel
+from app.db.models import AnalysisPayload
+from app.services.analysis_events import publish_analysis_change
+from app.services.analysis_writes import get_analysis_writer
+
+# API processes run new analyses themselves (FastAPI BackgroundTasks); 0 leaves them to `python -m app.worker`.
+ANALYSIS_JOBS_INLINE = os.getenv("ANALYSIS_JOBS_INLINE", "1") != "0"
+# Job threads per worker process; scale further with more worker processes.
+ANALYSIS_WORKER_CONCURRENCY = max(1, int(os.getenv("ANALYSIS_WORKER_CONCURRENCY", "2")))
+# Jobs a worker thread claims, scores (one vectorized call) and settles (one transaction) at a time.
+ANALYSIS_WORKER_BATCH_SIZE = max(1, int(os.getenv("ANALYSIS_WORKER_BATCH_SIZE", "64")))
+# How long an idle worker thread sleeps before polling the queue again.
+ANALYSIS_QUEUE_POLL_SECONDS = float(os.getenv("ANALYSIS_QUEUE_POLL_SECONDS", "1"))
+# Visibility timeout: a claimed job whose worker died becomes claimable again after this long.
+ANALYSIS_JOB_LEASE_SECONDS = float(os.getenv("ANALYSIS_JOB_LEASE_SECONDS", "300"))
+# Runs per job (including lease expiries) before it is dead-lettered.
+ANALYSIS_JOB_MAX_ATTEMPTS = max(1, int(os.getenv("ANALYSIS_JOB_MAX_ATTEMPTS", "3")))
+# Retry delay doubles from the base per attempt, capped at the max.
+ANALYSIS_JOB_RETRY_BASE_SECONDS = float(os.getenv("ANALYSIS_JOB_RETRY_BASE_SECONDS", "5"))
+ANALYSIS_JOB_RETRY_MAX_SECONDS = float(os.getenv("ANALYSIS_JOB_RETRY_MAX_SECONDS", "300"))
+
+# failure_reason of jobs that ran out of attempts; they stay in `analyses` for inspection.
+DEAD_LETTER_REASON = "retries_exhausted"
+
+
+def _now_utc() -> datetime:
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+@dataclass(frozen=True, slots=True)
+class ClaimedJob:
+    analysis_id: str
+    lease_token: str
+    attempts: int
+    input_payload: dict
+
+
+def retry_delay_seconds(attempts: int) -> float:
+    return min(ANALYSIS_JOB_RETRY_BASE_SECONDS * 2 ** max(0, attempts - 1), ANALYSIS_JOB_RETRY_MAX_SECONDS)
+
+
+def _claimable(now: datetime):
+    return or_(
+        and_(AnalysisModel.status == "pending", AnalysisModel.available_at <= now),
+        and_(AnalysisModel.status == "processing", AnalysisModel.lease_expires_at < now),
+    )
+
+
+def claim_candidates_query(now: datetime, limit: int, analysis_id: str | None = None) -> Select:
+    """Oldest claimable jobs; on Postgres the rows stay locked and other claimers skip them."""
+    query = select(AnalysisModel.id).where(_claimable(now))
+    if analysis_id is not None:
+        query = query.where(AnalysisModel.id == analysis_id)
+    return query.order_by(AnalysisModel.available_at).limit(limit).with_for_update(skip_locked=True)
+
+
+def claim_jobs(worker_id: str, limit: int = 1, *, analysis_id: str | None = None) -> list[ClaimedJob]:
+    """Lease up to ``limit`` queued jobs (or only ``analysis_id``) to ``worker_id``.
+
+    One ``UPDATE ... WHERE id IN (<candidates>) RETURNING`` statement: on
+    Postgres the candidate subquery locks its rows with ``FOR UPDATE SKIP
+    LOCKED`` so concurrent claimers get different jobs; SQLite runs the whole
+    statement under its single writer lock. Expired leases are claimed like
+    pending jobs, and every claim counts as an attempt. The jobs of one claim
+    share a lease token. Claims of concurrent workers are group-committed;
+    the inputs are read afterwards from ``analysis_payloads``.
+    """
+    now = _now_utc()
+    lease_token = f"{worker_id}:{uuid.uuid4().hex[:12]}"
+    candidates = claim_candidates_query(now, limit, analysis_id).scalar_subquery()
+    rows = get_analysis_writer().execute(
+        update(AnalysisModel)
+        .where(AnalysisModel.id.in_(candidates), _claimable(now))
+        .values(
+            status="processing",
+            progress_stage="model_inference",
+            attempts=AnalysisModel.attempts + 1,
+            claimed_by=lease_token,
+            lease_expires_at=now + timedelta(seconds=ANALYSIS_JOB_LEASE_SECONDS),
+            updated_at=now,
+        )
+        .returning(AnalysisModel.id, AnalysisModel.attempts)
+        .execution_options(synchronize_session=False)
+    )
+    if not rows:
+        return []
+    publish_analysis_change(*(row.id for row in rows))
+    with SessionLocal() as session:
+        # Inputs never change after the insert, so reading them outside the claim transaction is safe.
+        inputs = dict(
+            session.execute(
+                select(AnalysisPayload.analysis_id, AnalysisPayload.input_payload).where(
+                    AnalysisPayload.analysis_id.in_([row.id for row in rows])
+                )
+            ).all()
+        )
+    return [
+        ClaimedJob(analysis_id=row.id, lease_token=lease_token, attempts=row.attempts, input_payload=inputs.get(row.id) or {})
+        for row in rows
+    ]
+
+
+def _settle(job: ClaimedJob, values: dict) -> bool:
+    # Fenced by the lease token: a worker whose lease expired and was re-claimed cannot overwrite the new owner.
+    settled = get_analysis_writer().execute(
+        update(AnalysisModel)
+        .where(
+            AnalysisModel.id == job.analysis_id,
+            AnalysisModel.status == "processing",
+            AnalysisModel.claimed_by == job.lease_token,
+        )
+        .values(lease_expires_at=None, updated_at=_now_utc(), **values)
+    )
+    if settled:
+        publish_analysis_change(job.analysis_id)
+    return bool(settled)
+
+
+def complete_job(job: ClaimedJob, result_payload: dict) -> bool:
+    return complete_jobs([(job, result_payload)])[0]
+
+
+def complete_jobs(results: list[tuple[ClaimedJob, dict]]) -> list[bool]:
+    """Store results with executemany UPDATEs in one group-committed transaction; returns per job whether it was still leased."""
+    table = AnalysisModel.__table__
+    statement = (
+        update(table)
+        .where(
+            table.c.id == bindparam("job_id"),
+            table.c.status == "processing",
+            table.c.claimed_by == bindparam("lease_token"),
+        )
+        .values(
+            status="completed",
+            progress_stage="completed",
+            error_message=None,
+            failure_reason=None,
+            lease_expires_at=None,
+            updated_at=_now_utc(),
+        )
+    )
+    payloads = AnalysisPayload.__table__
+    # Same transaction, fenced the same way: only rows this lease just completed get a result.
+    store_results = (
+        update(payloads)
+        .where(
+            payloads.c.analysis_id == bindparam("job_id"),
+            payloads.c.analysis_id.in_(
+                select(table.c.id).where(
+                    table.c.id == bindparam("job_id"),
+                    table.c.status == "completed",
+                    table.c.claimed_by == bindparam("lease_token"),
+                )
+            ),
+        )
+        .values(result_payload=bindparam("result", type_=payloads.c.result_payload.type))
+    )
+    params = [{"job_id": job.analysis_id, "lease_token": job.lease_token, "result": result} for job, result in results]
+    settled = get_analysis_writer().execute(statement, params, then=[(store_results, params)])
+    publish_analysis_change(*(job.analysis_id for job, _ in results))
+    if settled == len(results):
+        return [True] * len(results)
+    # Some leases were lost: those rows now carry another claimer's token.
+    with SessionLocal() as session:
+        owners = dict(
+            session.execute(
+                select(AnalysisModel.id, AnalysisModel.claimed_by).where(
+                    AnalysisModel.id.in_([job.analysis_id for job, _ in results])
+                )
+            ).all()
+        )
+    return [owners.get(job.analysis_id) == job.lease_token for job, _ in results]
+
+
+def fail_job(job: ClaimedJob, failure_reason: str, error_message: str) -> bool:
+    return _settle(
+        job,
+        {"status": "failed", "progress_stage": "failed", "failure_reason": failure_reason, "error_message": error_message},
+    )
+
+
+def retry_job(job: ClaimedJob, error_message: str) -> tuple[bool, bool]:
+    """Put a job back in the queue after a backoff, or dead-letter it when out of attempts.
+
+    Returns ``(settled, dead_lettered)``.
+    """
+    if job.attempts >= ANALYSIS_JOB_MAX_ATTEMPTS:
+        return fail_job(job, DEAD_LETTER_REASON, error_message), True
+    available_at = _now_utc() + timedelta(seconds=retry_delay_seconds(job.attempts))
+    settled = _settle(
+        job,
+        {"status": "pending", "progress_stage": "queued", "error_message": error_message, "available_at": available_at},
+    )
+    return settled, False
@@ -0,0 +1,105 @@
+from __future__ import annotations
+
+import os
+import socket
+import threading
+
+from app.core.observability import log_event, reset_correlation_id, set_correlation_id
+from app.services.analyses_service import run_analysis_jobs
+from app.services.analysis_queue import (
+    ANALYSIS_QUEUE_POLL_SECONDS,
+    ANALYSIS_WORKER_BATCH_SIZE,
+    ANALYSIS_WORKER_CONCURRENCY,
+    claim_jobs,
+)
+
+
+class AnalysisWorker:
+    """Pulls analysis jobs from the DB queue and scores them outside the API processes.
+
+    ``concurrency`` threads each claim up to ``batch_size`` jobs at a time and
+    score them together, sleeping for ``poll_seconds`` when the queue is empty.
+    ``stop()`` lets every thread finish the batch it holds; a job interrupted
+    harder than that is picked up again once its lease expires.
+    """
+
+    def __init__(
+        self,
+        concurrency: int = ANALYSIS_WORKER_CONCURRENCY,
+        poll_seconds: float = ANALYSIS_QUEUE_POLL_SECONDS,
+        *,
+        batch_size: int = ANALYSIS_WORKER_BATCH_SIZE,
+        worker_id: str | None = None,
+    ) -> None:
+        self.concurrency = max(1, concurrency)
+        self.poll_seconds = poll_seconds
+        self.batch_size = max(1, batch_size)
+        self.worker_id = worker_id or f"worker:{socket.gethostname()}:{os.getpid()}"
+        self._stop = threading.Event()
+        self._lock = threading.Lock()
+        self._processed = 0
+        self._errors = 0
+
+    def stop(self) -> None:
+        self._stop.set()
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return {"processed": self._processed, "errors": self._errors}
+
+    def run_next(self) -> int:
+        """Claim and run one batch of jobs; returns how many were claimed (0 when none was claimable)."""
+        try:
+            jobs = claim_jobs(self.worker_id, self.batch_size)
+        except Exception as exc:
+            # DB unavailable or locked: count it and poll again later.
+            with self._lock:
+                self._errors += 1
+            log_event('analysis_worker_claim_failed', worker_id=self.worker_id, error=str(exc))
+            return 0
+        if not jobs:
+            return 0
+        token = set_correlation_id(jobs[0].analysis_id if len(jobs) == 1 else f"{self.worker_id}:batch")
+        try:
+            run_analysis_jobs(jobs)
+        except Exception as exc:
+            # Could not even record the outcome; the leases expire and the jobs run again.
+            with self._lock:
+                self._errors += 1
+            log_event('analysis_worker_job_crashed', analysis_ids=[job.analysis_id for job in jobs], error=str(exc))
+        finally:
+            reset_correlation_id(token)
+        with self._lock:
+            self._processed += len(jobs)
+        return len(jobs)
+
+    def drain(self) -> int:
+        """Run jobs in the calling thread until none is claimable; returns how many ran."""
+        processed = 0
+        while not self._stop.is_set() and (claimed := self.run_next()):
+            processed += claimed
+        return processed
+
+    def _poll(self) -> None:
+        while not self._stop.is_set():
+            if not self.run_next():
+                self._stop.wait(self.poll_seconds)
+
+    def run(self) -> None:
+        """Serve the queue with ``concurrency`` threads until ``stop()``."""
+        log_event(
+            'analysis_worker_started',
+            worker_id=self.worker_id,
+            concurrency=self.concurrency,
+            batch_size=self.batch_size,
+            poll_seconds=self.poll_seconds,
+        )
+        threads = [
+            threading.Thread(target=self._poll, name=f"analysis-worker-{index}", daemon=True)
+            for index in range(self.concurrency)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        log_event('analysis_worker_stopped', worker_id=self.worker_id, **self.stats())
@@ -0,0 +1,193 @@
+from __future__ import annotations
+
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any, Callable, Sequence
+
+from sqlalchemy.engine import CursorResult
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import Executable
+
+from app.core.observability import log_event
+from app.db.database import SessionLocal
+
+# Status writes from concurrent jobs and requests share one transaction of up to this many writes; 0 commits each write on its own.
+ANALYSIS_GROUP_COMMIT_MAX_WRITES = max(0, int(os.getenv("ANALYSIS_GROUP_COMMIT_MAX_WRITES", "256")))
+# Extra time a group waits for more writes; 0 groups only what queued up while the previous commit ran.
+ANALYSIS_GROUP_COMMIT_WINDOW_MS = max(0.0, float(os.getenv("ANALYSIS_GROUP_COMMIT_WINDOW_MS", "0")))
+
+
+WriteStep = tuple[Executable, dict | list[dict] | None]
+
+
+@dataclass(slots=True)
+class _Write:
+    statement: Executable
+    params: dict | list[dict] | None
+    then: Sequence[WriteStep]
+    future: Future
+
+
+class GroupCommitWriter:
+    """Runs write statements from many threads in shared transactions (group commit).
+
+    Callers hand over a statement and block on its future; one writer thread
+    executes everything queued in one transaction and commits once, so N
+    concurrent status writes cost one commit (one fsync) instead of N. While a
+    commit runs the next group fills up, so a lone write is not delayed by a
+    timer. A statement that fails rolls back its group; the group is then
+    rerun one write per transaction so only the failing write raises.
+
+    A write resolves to its rows when the statement returns rows
+    (``RETURNING``) and to its rowcount otherwise; statements passed as
+    ``then`` run right after it in the same transaction. With
+    ``max_writes=0`` writes run in the caller's thread, each in its own
+    transaction.
+    """
+
+    def __init__(
+        self,
+        session_factory: Callable[[], Session],
+        max_writes: int = ANALYSIS_GROUP_COMMIT_MAX_WRITES,
+        window_seconds: float = ANALYSIS_GROUP_COMMIT_WINDOW_MS / 1000,
+    ) -> None:
+        self.max_writes = max(0, max_writes)
+        self.window_seconds = max(0.0, window_seconds)
+        self._session_factory = session_factory
+        self._ready = threading.Condition()
+        self._writes: deque[_Write] = deque()
+        self._thread: threading.Thread | None = None
+        self._in_flight = 0
+        self._stopping = False
+        self._writes_committed = 0
+        self._commits = 0
+        self._largest_group = 0
+        self._failed_groups = 0
+
+    def submit(
+        self,
+        statement: Executable,
+        params: dict | list[dict] | None = None,
+        *,
+        then: Sequence[WriteStep] = (),
+    ) -> Future:
+        """Queue a write; its future resolves once the write is committed."""
+        write = _Write(statement, params, then, Future())
+        if self.max_writes == 0:
+            self._commit([write])
+            return write.future
+        with self._ready:
+            if self._stopping:
+                raise RuntimeError("Analysis writer is shut down")
+            self._writes.append(write)
+            if self._thread is None:
+                # Started on first use, so a preloading server forks before any writer thread exists.
+                self._thread = threading.Thread(target=self._run, name="analysis-writes", daemon=True)
+                self._thread.start()
+            self._ready.notify_all()
+        return write.future
+
+    def execute(
+        self,
+        statement: Executable,
+        params: dict | list[dict] | None = None,
+        *,
+        then: Sequence[WriteStep] = (),
+    ) -> Any:
+        """Write and wait for the commit."""
+        return self.submit(statement, params, then=then).result()
+
+    def flush(self) -> None:
+        """Wait until every write queued so far is committed (or failed)."""
+        with self._ready:
+            while self._writes or self._in_flight:
+                self._ready.wait()
+
+    def stats(self) -> dict[str, int]:
+        with self._ready:
+            return {
+                "queued": len(self._writes),
+                "writes": self._writes_committed,
+                "commits": self._commits,
+                "largest_group": self._largest_group,
+                "failed_groups": self._failed_groups,
+            }
+
+    def shutdown(self) -> None:
+        with self._ready:
+            self._stopping = True
+            self._ready.notify_all()
+            thread = self._thread
+        if thread is not None:
+            thread.join()
+
+    def _run(self) -> None:
+        while True:
+            with self._ready:
+                while not self._writes and not self._stopping:
+                    self._ready.wait()
+                if not self._writes:
+                    return
+                deadline = time.monotonic() + self.window_seconds
+                while len(self._writes) < self.max_writes and not self._stopping:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._ready.wait(remaining)
+                count = min(len(self._writes), self.max_writes)
+                group = [self._writes.popleft() for _ in range(count)]
+                self._in_flight = count
+            try:
+                self._commit(group)
+            finally:
+                with self._ready:
+                    self._in_flight = 0
+                    self._ready.notify_all()
+
+    def _commit(self, group: list[_Write]) -> None:
+        try:
+            with self._session_factory() as session:
+                values = [self._execute(session, write) for write in group]
+                session.commit()
+        except Exception as exc:
+            with self._ready:
+                self._failed_groups += 1
+            if len(group) == 1:
+                group[0].future.set_exception(exc)
+                return
+            log_event('analysis_write_group_failed', writes=len(group), error=str(exc))
+            for write in group:
+                self._commit([write])
+            return
+        with self._ready:
+            self._writes_committed += len(group)
+            self._commits += 1
+            self._largest_group = max(self._largest_group, len(group))
+        for write, value in zip(group, values):
+            write.future.set_result(value)
+
+    @staticmethod
+    def _execute(session: Session, write: _Write) -> Any:
+        result = session.execute(write.statement, write.params)
+        # ORM statements with RETURNING come back as plain (non-cursor) results.
+        value = result.rowcount if isinstance(result, CursorResult) and not result.returns_rows else result.all()
+        for statement, params in write.then:
+            session.execute(statement, params)
+        return value
+
+
+@lru_cache
+def get_analysis_writer() -> GroupCommitWriter:
+    # The factory is looked up per transaction, so a patched SessionLocal is honoured.
+    return GroupCommitWriter(lambda: SessionLocal())
+
+
+def shutdown_analysis_writer() -> None:
+    """Commit queued (write-behind) writes and stop the writer thread."""
+    get_analysis_writer().shutdown()
+    get_analysis_writer.cache_clear()
@@ -6,10 +6,11 @@ import time
 import uuid
 from dataclasses import dataclass
 from datetime import datetime, timezone
+from functools import lru_cache
+from typing import TYPE_CHECKING
 
 from fastapi import HTTPException, status
 from jose import JWTError, ExpiredSignatureError, jwt
-from passlib.context import CryptContext
 from pydantic import BaseModel, Field, field_validator
 
 from app.db.database import SessionLocal
@@ -17,6 +18,9 @@ from app.db.models import User
 from app.core.observability import log_event
 from app.repositories.user_repository import UserRepository
 
+if TYPE_CHECKING:
+    from passlib.context import CryptContext
+
 # По умолчанию 30 дней (B2C удобство); для строже — задать AUTH_TOKEN_TTL_SECONDS (сек)
 TOKEN_TTL_SECONDS = int(os.getenv("AUTH_TOKEN_TTL_SECONDS", "2592000"))
 TOKEN_SECRET = os.getenv("AUTH_TOKEN_SECRET", "dev-secret-change-me")
@@ -26,7 +30,13 @@ APP_ENV = os.getenv("APP_ENV", "dev").strip().lower()
 EMAIL_RE = re.compile(r"^[^@\s]+@[^@\s]+\.[^@\s]+$")
 PASSWORD_RE = re.compile(r"^(?=.*[A-Za-z])(?=.*\d).{8,128}$")
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+
+@lru_cache(maxsize=1)
+def password_context() -> CryptContext:
+    # passlib/bcrypt load on the first register/login instead of at app import.
+    from passlib.context import CryptContext
+
+    return CryptContext(schemes=["bcrypt"], deprecated="auto")
 
 
 class RegisterRequest(BaseModel):
@@ -100,11 +110,11 @@ def _to_record(user: User) -> UserRecord:
 
 
 def _hash_password(password: str) -> str:
-    return pwd_context.hash(password)
+    return password_context().hash(password)
 
 
 def _verify_password(password: str, password_hash: str) -> bool:
-    return pwd_context.verify(password, password_hash)
+    return password_context().verify(password, password_hash)
 
 
 def _build_token(user_id: str, expires_in: int) -> str:
@@ -0,0 +1,196 @@
+from __future__ import annotations
+
+import csv
+import json
+import os
+from typing import Any, AsyncIterator, Awaitable, Callable
+
+from pydantic import ValidationError
+from starlette.responses import StreamingResponse
+from starlette.types import Receive, Scope, Send
+
+from app.services.prediction_service import (
+    PredictRequest,
+    PredictResponse,
+    build_needs_input_response,
+    predict_batch_payloads,
+)
+from app.services.response_encoding import encode_predict_response
+
+# Rows per vectorized scoring call; also bounds how many rows are held in memory.
+BULK_CHUNK_ROWS = max(1, int(os.getenv("BULK_CHUNK_ROWS", "256")))
+# The first chunk is small so results start flowing at once; chunks then double up to BULK_CHUNK_ROWS.
+BULK_FIRST_CHUNK_ROWS = max(1, int(os.getenv("BULK_FIRST_CHUNK_ROWS", "16")))
+BULK_MAX_LINE_BYTES = int(os.getenv("BULK_MAX_LINE_BYTES", "65536"))
+
+BULK_MEDIA_TYPES = {
+    "text/csv": "csv",
+    "application/x-ndjson": "ndjson",
+    "application/jsonl": "ndjson",
+}
+
+
+class BulkFormatError(ValueError):
+    pass
+
+
+def resolve_bulk_format(content_type: str | None) -> str:
+    media_type = (content_type or "").split(";", 1)[0].strip().lower()
+    try:
+        return BULK_MEDIA_TYPES[media_type]
+    except KeyError:
+        raise BulkFormatError(f"Unsupported content type: {media_type or 'missing'}") from None
+
+
+class RowDecoder:
+    """Turns raw lines of one upload into payload dicts or a per-row error message.
+
+    CSV input needs a header line with feature names; empty cells are missing
+    values. One record per line: quoted cells must not contain newlines.
+    """
+
+    def __init__(self, file_format: str) -> None:
+        self.file_format = file_format
+        self.header: list[str] | None = None
+
+    def decode(self, lines: list[bytes]) -> list[dict[str, Any] | str]:
+        if self.file_format == "ndjson":
+            return [self._decode_json(line) for line in lines]
+        records = csv.reader(line.decode("utf-8", errors="replace") for line in lines)
+        if self.header is None:
+            header = next(records, None)
+            if header is None:
+                return []
+            self.header = [name.strip().lstrip("\ufeff") for name in header]
+        return [self._decode_csv(cells) for cells in records]
+
+    @staticmethod
+    def _decode_json(line: bytes) -> dict[str, Any] | str:
+        try:
+            payload = json.loads(line)
+        except ValueError:
+            return "Row is not valid JSON"
+        if not isinstance(payload, dict):
+            return "Row must be a JSON object"
+        return payload
+
+    def _decode_csv(self, cells: list[str]) -> dict[str, Any] | str:
+        if len(cells) != len(self.header):
+            return f"Row has {len(cells)} cells, header has {len(self.header)}"
+        return {name: (cell.strip() or None) for name, cell in zip(self.header, cells)}
+
+
+def _invalid_row(message: str, invalid_fields: list[dict[str, str]] | None = None) -> PredictResponse:
+    return build_needs_input_response(
+        confidence="low",
+        missing_required_fields=[],
+        error_code="invalid_row",
+        message=message,
+        invalid_fields=invalid_fields,
+    )
+
+
+def _encode_result(row: int, response: PredictResponse) -> bytes:
+    return b'{"row":%d,' % row + encode_predict_response(response)[1:] + b"\n"
+
+
+def score_lines(decoder: RowDecoder, lines: list[bytes], first_row: int) -> tuple[bytes, int]:
+    """Parse, validate and score one chunk; returns NDJSON result lines and the row count."""
+    responses: list[PredictResponse | None] = []
+    payloads: list[dict[str, Any]] = []
+    for decoded in decoder.decode(lines):
+        if isinstance(decoded, str):
+            responses.append(_invalid_row(decoded))
+            continue
+        try:
+            payloads.append(PredictRequest.model_validate(decoded).model_dump())
+        except ValidationError as exc:
+            invalid_fields = [
+                {"field": ".".join(str(part) for part in error["loc"]), "reason": error["type"]}
+                for error in exc.errors()
+            ]
+            responses.append(_invalid_row("Row does not match PredictRequest", invalid_fields))
+            continue
+        responses.append(None)
+
+    scored = iter(predict_batch_payloads(payloads)) if payloads else iter(())
+    output = []
+    for offset, response in enumerate(responses):
+        if response is None:
+            response = next(scored)
+        output.append(_encode_result(first_row + offset, response))
+    return b"".join(output), len(responses)
+
+
+class UploadStreamingResponse(StreamingResponse):
+    """Streams a body generator that is itself still reading the request body.
+
+    ``StreamingResponse`` listens for ``http.disconnect`` concurrently, which
+    consumes the ``http.request`` messages the generator needs. Here the
+    generator reads the upload through ``Request.stream()``, which raises
+    ``ClientDisconnect`` on its own when the client goes away.
+    """
+
+    media_type = "application/x-ndjson"
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        await self.stream_response(send)
+        if self.background is not None:
+            await self.background()
+
+
+async def iter_line_batches(stream: AsyncIterator[bytes], max_line_bytes: int = BULK_MAX_LINE_BYTES) -> AsyncIterator[list[bytes]]:
+    """Complete non-blank lines per received body part; only the unfinished tail is buffered."""
+    buffer = b""
+    async for part in stream:
+        if not part:
+            continue
+        *lines, buffer = (buffer + part).split(b"\n")
+        if len(buffer) > max_line_bytes:
+            raise BulkFormatError(f"Line exceeds {max_line_bytes} bytes")
+        lines = [line for line in (line.rstrip(b"\r") for line in lines) if line.strip()]
+        if lines:
+            yield lines
+    tail = buffer.rstrip(b"\r")
+    if tail.strip():
+        yield [tail]
+
+
+async def stream_bulk_predictions(
+    stream: AsyncIterator[bytes],
+    file_format: str,
+    *,
+    run: Callable[..., Awaitable[tuple[bytes, int]]],
+    chunk_rows: int = BULK_CHUNK_ROWS,
+    first_chunk_rows: int = BULK_FIRST_CHUNK_ROWS,
+    max_line_bytes: int = BULK_MAX_LINE_BYTES,
+    on_complete: Callable[[int], None] | None = None,
+) -> AsyncIterator[bytes]:
+    """Yield NDJSON results chunk by chunk while the upload is still being read.
+
+    ``run`` executes ``score_lines`` off the event loop. Chunks start at
+    ``first_chunk_rows`` and double up to ``chunk_rows``; at most one chunk plus
+    one received body part is held at a time. A line longer than
+    ``max_line_bytes`` ends the stream with a final ``invalid_row`` line.
+    """
+    decoder = RowDecoder(file_format)
+    pending: list[bytes] = []
+    rows = 0
+    size = min(first_chunk_rows, chunk_rows)
+    try:
+        async for lines in iter_line_batches(stream, max_line_bytes):
+            pending.extend(lines)
+            while len(pending) >= size:
+                chunk, pending = pending[:size], pending[size:]
+                output, count = await run(score_lines, decoder, chunk, rows)
+                rows += count
+                size = min(size * 2, chunk_rows)
+                yield output
+        if pending:
+            output, count = await run(score_lines, decoder, pending, rows)
+            rows += count
+            yield output
+    except BulkFormatError as exc:
+        yield _encode_result(rows, _invalid_row(str(exc)))
+    if on_complete is not None:
+        on_complete(rows)
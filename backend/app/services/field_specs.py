@@ -0,0 +1,353 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any, Mapping, Sequence
+
+import numpy as np
+
+_NUMERIC_TYPES = (int, float)
+_PLAIN_TYPES = frozenset({int, float, bool, type(None)})
+
+
+@dataclass(frozen=True)
+class UnitRule:
+    """Detect a value entered in an alternative unit and convert it.
+
+    The value is converted when it is above ``threshold`` (``above=True``) or
+    below it. ``divide`` keeps rules that were written as ``value / 10``
+    bit-identical to the original arithmetic.
+    """
+
+    threshold: float
+    above: bool
+    factor: float
+    divide: bool = False
+
+    def applies(self, value: float) -> bool:
+        return value > self.threshold if self.above else value < self.threshold
+
+    def convert(self, value: float) -> float:
+        return value / self.factor if self.divide else value * self.factor
+
+
+@dataclass(frozen=True)
+class FieldSpec:
+    name: str
+    model_feature: bool = True
+    required: bool = False
+    recommended: bool = False
+    positive: bool = False
+    unit: UnitRule | None = None
+    # Reference interval used by the clinical adjustment, shared or per RIAGENDR code.
+    reference: tuple[float, float] | None = None
+    gender_reference: Mapping[int, tuple[float, float]] | None = None
+    # RDW is penalised above the upper bound; everything else below the lower bound.
+    penalize_above: bool = False
+
+
+# Required fields come first, in the order they are reported as missing.
+FIELD_SPECS: tuple[FieldSpec, ...] = (
+    FieldSpec(
+        "LBXHGB",
+        required=True,
+        unit=UnitRule(threshold=50, above=True, factor=10, divide=True),
+        gender_reference={1: (13.0, 17.0), 2: (12.0, 16.0)},
+    ),
+    FieldSpec("LBXMCVSI", required=True, reference=(80.0, 100.0)),
+    FieldSpec(
+        "LBXMCHSI",
+        required=True,
+        unit=UnitRule(threshold=100, above=True, factor=10, divide=True),
+        reference=(30.0, 38.0),
+    ),
+    FieldSpec("LBXRDW", required=True, reference=(11.5, 14.5), penalize_above=True),
+    FieldSpec("LBXRBCSI", required=True, gender_reference={1: (4.0, 5.0), 2: (3.9, 4.7)}),
+    FieldSpec("LBXHCT", required=True, gender_reference={1: (40.0, 48.0), 2: (36.0, 42.0)}),
+    FieldSpec("RIDAGEYR", required=True, positive=True),
+    FieldSpec("LBXWBCSI", recommended=True),
+    FieldSpec("LBXLYPCT"),
+    FieldSpec("LBXMOPCT"),
+    FieldSpec("LBXNEPCT"),
+    FieldSpec("LBXEOPCT"),
+    FieldSpec("LBXBAPCT"),
+    FieldSpec("LBXMC"),
+    FieldSpec("LBXPLTSI", recommended=True),
+    FieldSpec("LBXMPSI", recommended=True),
+    FieldSpec("RIAGENDR"),
+    FieldSpec("LBXSGL", recommended=True, unit=UnitRule(threshold=25, above=False, factor=18.01)),
+    FieldSpec("LBXSCH", recommended=True, unit=UnitRule(threshold=25, above=False, factor=38.67)),
+    FieldSpec("BMXBMI", positive=True),
+    FieldSpec("BMXHT", positive=True),
+    FieldSpec("BMXWT", positive=True),
+    FieldSpec("BMXWAIST", recommended=True),
+    FieldSpec("BP_SYS", recommended=True),
+    FieldSpec("BP_DIA", recommended=True),
+    # Accepted for unit normalization only; not model inputs.
+    FieldSpec("LBXSCR", model_feature=False, unit=UnitRule(threshold=10, above=True, factor=1 / 88.4)),
+    FieldSpec("LBXSUA", model_feature=False, unit=UnitRule(threshold=10, above=True, factor=1 / 59.48)),
+    FieldSpec("LBXSTB", model_feature=False, unit=UnitRule(threshold=10, above=True, factor=1 / 17.1)),
+)
+
+BMI_OR_HEIGHT_WEIGHT = "BMXBMI_or_BMXHT_BMXWT"
+
+
+@dataclass
+class FieldBatch:
+    """Column-oriented view of many payloads after validation and normalization.
+
+    ``values`` holds raw numbers and ``present`` marks fields that were not None;
+    ``normalized`` applies unit rules and derives BMI. Rows with ``scorable``
+    False need the per-payload path for their needs_input response.
+    """
+
+    values: np.ndarray  # (rows, columns) float64, NaN where absent or non-numeric
+    present: np.ndarray  # (rows, columns) bool
+    normalized: np.ndarray  # (rows, columns) float64
+    scorable: np.ndarray  # (rows,) bool
+    confidence: np.ndarray  # (rows,) str
+    penalty: np.ndarray  # (rows,) float64, clinical adjustment subtracted from iron_index
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+
+class FieldEngine:
+    """Validation, normalization and clinical adjustment compiled from ``FIELD_SPECS``.
+
+    The per-payload methods keep the exact semantics of the original dict
+    rules; ``prepare_rows``/``prepare_columns`` apply the same table to a whole
+    batch with one NumPy pass per column.
+    """
+
+    def __init__(self, specs: Sequence[FieldSpec], features: Sequence[str]) -> None:
+        self.specs = tuple(specs)
+        self.features = tuple(features)
+        self.columns = tuple(spec.name for spec in self.specs)
+        self.column_index = {name: position for position, name in enumerate(self.columns)}
+        missing = set(self.features) - set(self.column_index)
+        if missing:
+            raise ValueError(f"Features without a field spec: {sorted(missing)}")
+
+        self.required = [spec.name for spec in self.specs if spec.required]
+        self.recommended = [spec.name for spec in self.specs if spec.recommended]
+        self.validated = frozenset(spec.name for spec in self.specs if spec.model_feature)
+        self.positive = frozenset(spec.name for spec in self.specs if spec.positive)
+        self.unit_rules = [(spec.name, spec.unit) for spec in self.specs if spec.unit is not None]
+        self.shared_references = [
+            (spec.name, *spec.reference, spec.penalize_above) for spec in self.specs if spec.reference is not None
+        ]
+        genders = sorted({gender for spec in self.specs for gender in (spec.gender_reference or {})})
+        self.gender_references = {
+            gender: [
+                (spec.name, *spec.gender_reference[gender], spec.penalize_above)
+                for spec in self.specs
+                if spec.gender_reference and gender in spec.gender_reference
+            ]
+            for gender in genders
+        }
+
+        self._feature_columns = np.asarray([self.column_index[name] for name in self.features])
+        self._validated_columns = np.asarray([self.column_index[name] for name in self.columns if name in self.validated])
+        self._positive_columns = np.asarray([spec.positive for spec in self.specs])
+        self._required_columns = np.asarray([self.column_index[name] for name in self.required])
+        self._recommended_columns = np.asarray([self.column_index[name] for name in self.recommended])
+
+    # Per-payload rules.
+
+    def normalize(self, data: dict[str, Any]) -> dict[str, Any]:
+        normalized = dict(data)
+        for name, rule in self.unit_rules:
+            value = normalized.get(name)
+            # Non-numeric values are left for validation (or ignored on non-model fields).
+            if isinstance(value, _NUMERIC_TYPES) and rule.applies(value):
+                normalized[name] = rule.convert(value)
+        return normalized
+
+    def validate(self, payload: dict[str, Any]) -> list[dict[str, str]]:
+        invalid_fields: list[dict[str, str]] = []
+        for field_name, value in payload.items():
+            if value is None or field_name not in self.validated:
+                continue
+
+            if isinstance(value, _NUMERIC_TYPES):
+                numeric = float(value)
+                if not np.isfinite(numeric):
+                    invalid_fields.append({"field": field_name, "reason": "must_be_finite_number"})
+                    continue
+                if numeric < 0:
+                    invalid_fields.append({"field": field_name, "reason": "must_be_non_negative"})
+                    continue
+                if field_name in self.positive and numeric <= 0:
+                    invalid_fields.append({"field": field_name, "reason": "must_be_positive"})
+                continue
+
+            invalid_fields.append({"field": field_name, "reason": "must_be_number"})
+
+        return invalid_fields
+
+    def missing_required(self, payload: dict[str, Any]) -> list[str]:
+        missing = [name for name in self.required if payload.get(name) is None]
+        has_bmi = payload.get("BMXBMI") is not None
+        has_hw = payload.get("BMXHT") is not None and payload.get("BMXWT") is not None
+        if not has_bmi and not has_hw:
+            missing.append(BMI_OR_HEIGHT_WEIGHT)
+        return missing
+
+    def confidence(self, payload: dict[str, Any], missing_required: list[str]) -> str:
+        if missing_required:
+            return "low"
+        rec_present = sum(payload.get(name) is not None for name in self.recommended)
+        return "high" if rec_present >= len(self.recommended) / 2 else "medium"
+
+    def clinical_penalty(self, gender: Any, normalized: dict[str, Any]) -> float:
+        references = list(self.shared_references)
+        if gender in self.gender_references:
+            references += self.gender_references[gender]
+
+        penalty = 0.0
+        for key, lo, hi, penalize_above in references:
+            val = normalized.get(key)
+            if val is None:
+                continue
+            if penalize_above:
+                if val > hi:
+                    penalty += (val - hi) / hi * 4.0
+            else:
+                if val < lo:
+                    penalty += (lo - val) / lo * 4.0
+        return penalty
+
+    def feature_row(self, normalized: dict[str, Any]) -> np.ndarray:
+        """Normalized model features of one payload, gender included, NaN where absent."""
+        return np.asarray([normalized.get(name) for name in self.features], dtype=np.float64)
+
+    # Column-oriented rules.
+
+    def prepare_rows(self, rows: Sequence[dict[str, Any]]) -> FieldBatch:
+        return self.prepare_columns({name: [row.get(name) for row in rows] for name in self.columns}, len(rows))
+
+    def prepare_columns(self, columns: Mapping[str, Sequence[Any] | np.ndarray], row_count: int) -> FieldBatch:
+        """Validate and normalize a column-oriented batch; absent columns count as all-None."""
+        values = np.full((row_count, len(self.columns)), np.nan, dtype=np.float64)
+        present = np.zeros((row_count, len(self.columns)), dtype=bool)
+        numeric = np.zeros((row_count, len(self.columns)), dtype=bool)
+        for name, column in columns.items():
+            position = self.column_index.get(name)
+            if position is None:
+                continue
+            values[:, position], present[:, position], numeric[:, position] = _numeric_column(column, row_count)
+
+        invalid = self._invalid_rows(values, present, numeric)
+        missing = ~present[:, self._required_columns].all(axis=1)
+        has_bmi = present[:, self.column_index["BMXBMI"]]
+        has_hw = present[:, self.column_index["BMXHT"]] & present[:, self.column_index["BMXWT"]]
+        missing |= ~has_bmi & ~has_hw
+
+        recommended_present = present[:, self._recommended_columns].sum(axis=1)
+        confidence = np.where(recommended_present >= len(self.recommended) / 2, "high", "medium")
+        confidence = np.where(missing | invalid, "low", confidence)
+
+        normalized, normalized_present = self._normalize_columns(values, present)
+        return FieldBatch(
+            values=values,
+            present=present,
+            normalized=normalized,
+            scorable=~invalid & ~missing,
+            confidence=confidence,
+            penalty=self._penalty_columns(values, present, normalized, normalized_present),
+        )
+
+    def model_features(self, batch: FieldBatch, rows: np.ndarray | None = None) -> np.ndarray:
+        """Model input matrix in FEATURES order; gender is never sent to the model."""
+        features = batch.normalized[:, self._feature_columns] if rows is None else batch.normalized[rows][:, self._feature_columns]
+        features[:, self.features.index("RIAGENDR")] = np.nan
+        return features
+
+    def feature_rows(self, batch: FieldBatch, rows: np.ndarray) -> np.ndarray:
+        """Normalized model features with gender kept, matching ``feature_row``."""
+        return batch.normalized[rows][:, self._feature_columns]
+
+    def _invalid_rows(self, values: np.ndarray, present: np.ndarray, numeric: np.ndarray) -> np.ndarray:
+        columns = self._validated_columns
+        checked_present = present[:, columns]
+        checked_numeric = numeric[:, columns]
+        checked = values[:, columns]
+        with np.errstate(invalid="ignore"):
+            finite = np.isfinite(checked)
+            bad = checked_present & ~checked_numeric
+            bad |= checked_present & checked_numeric & ~finite
+            bad |= checked_present & finite & (checked < 0)
+            bad |= checked_present & finite & (checked <= 0) & self._positive_columns[columns]
+        return bad.any(axis=1)
+
+    def _normalize_columns(self, values: np.ndarray, present: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        normalized = values.copy()
+        normalized_present = present.copy()
+        with np.errstate(invalid="ignore"):
+            for name, rule in self.unit_rules:
+                position = self.column_index[name]
+                column = values[:, position]
+                mask = (column > rule.threshold) if rule.above else (column < rule.threshold)
+                normalized[mask, position] = column[mask] / rule.factor if rule.divide else column[mask] * rule.factor
+
+            bmi = self.column_index["BMXBMI"]
+            height = normalized[:, self.column_index["BMXHT"]]
+            weight = normalized[:, self.column_index["BMXWT"]]
+            # Same truthiness as the dict rule: height and weight present and non-zero.
+            derive = ~present[:, bmi] & (height != 0) & (weight != 0) & ~np.isnan(height) & ~np.isnan(weight)
+            height_m = height[derive] / 100
+            normalized[derive, bmi] = weight[derive] / (height_m * height_m)
+            normalized_present[derive, bmi] = True
+        return normalized, normalized_present
+
+    def _penalty_columns(
+        self,
+        values: np.ndarray,
+        present: np.ndarray,
+        normalized: np.ndarray,
+        normalized_present: np.ndarray,
+    ) -> np.ndarray:
+        penalty = np.zeros(len(values), dtype=np.float64)
+        gender_position = self.column_index["RIAGENDR"]
+        gender = np.where(present[:, gender_position], values[:, gender_position], np.nan)
+        # Shared references first, then gender ones, in the same order as the dict rule adds them.
+        passes = [(np.ones(len(values), dtype=bool), self.shared_references)]
+        passes += [(gender == code, references) for code, references in self.gender_references.items()]
+        with np.errstate(invalid="ignore"):
+            for rows, references in passes:
+                for key, lo, hi, penalize_above in references:
+                    position = self.column_index[key]
+                    val = normalized[:, position]
+                    if penalize_above:
+                        hit = rows & normalized_present[:, position] & (val > hi)
+                        penalty[hit] += (val[hit] - hi) / hi * 4.0
+                    else:
+                        hit = rows & normalized_present[:, position] & (val < lo)
+                        penalty[hit] += (lo - val[hit]) / lo * 4.0
+        return penalty
+
+
+def _numeric_column(column: Sequence[Any] | np.ndarray, row_count: int) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Float values, not-None mask and is-number mask of one input column."""
+    if isinstance(column, np.ndarray) and column.dtype.kind in "fiub":
+        values = column.astype(np.float64, copy=False)
+        # NumPy columns (e.g. parsed CSV) mark absent cells as NaN.
+        present = ~np.isnan(values) if column.dtype.kind == "f" else np.ones(row_count, dtype=bool)
+        return values, present, np.ones(row_count, dtype=bool)
+
+    items = list(column)
+    if _PLAIN_TYPES.issuperset(map(type, items)):
+        present = np.fromiter((item is not None for item in items), dtype=bool, count=row_count)
+        return np.asarray(items, dtype=np.float64), present, np.ones(row_count, dtype=bool)
+
+    values = np.full(row_count, np.nan, dtype=np.float64)
+    present = np.zeros(row_count, dtype=bool)
+    numeric = np.zeros(row_count, dtype=bool)
+    for position, item in enumerate(items):
+        if item is None:
+            continue
+        present[position] = True
+        if isinstance(item, _NUMERIC_TYPES):
+            numeric[position] = True
+            values[position] = float(item)
+    return values, present, numeric
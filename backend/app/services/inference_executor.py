@@ -0,0 +1,189 @@
+from __future__ import annotations
+
+import asyncio
+import contextvars
+import os
+import threading
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import lru_cache
+from typing import Any, Callable, TypeVar
+
+from app.core.observability import log_event
+
+R = TypeVar("R")
+
+_CPU_COUNT = os.cpu_count() or 1
+
+INFERENCE_WORKERS = max(1, int(os.getenv("INFERENCE_WORKERS", str(min(4, _CPU_COUNT)))))
+INFERENCE_QUEUE_SIZE = max(0, int(os.getenv("INFERENCE_QUEUE_SIZE", "64")))
+# CatBoost threads per predict/SHAP call; by default workers * threads stays within the core count.
+INFERENCE_THREAD_COUNT = int(os.getenv("INFERENCE_THREAD_COUNT", str(max(1, _CPU_COUNT // INFERENCE_WORKERS))))
+INFERENCE_RETRY_AFTER_SECONDS = int(os.getenv("INFERENCE_RETRY_AFTER_SECONDS", "1"))
+
+
+class InferenceOverloadedError(RuntimeError):
+    def __init__(self, retry_after_seconds: int) -> None:
+        super().__init__("Inference queue is full")
+        self.retry_after_seconds = retry_after_seconds
+
+
+class InferenceExecutor:
+    """Dedicated thread pool for model scoring with a bounded backlog.
+
+    At most ``workers`` calls run and ``queue_size`` more wait; anything beyond
+    that is rejected immediately with ``InferenceOverloadedError`` instead of
+    queueing without limit. Scoring never competes with DB or bcrypt work in
+    Starlette's shared threadpool.
+    """
+
+    def __init__(
+        self,
+        workers: int = INFERENCE_WORKERS,
+        queue_size: int = INFERENCE_QUEUE_SIZE,
+        *,
+        retry_after_seconds: int = INFERENCE_RETRY_AFTER_SECONDS,
+    ) -> None:
+        self.workers = max(1, workers)
+        self.queue_size = max(0, queue_size)
+        self.retry_after_seconds = retry_after_seconds
+        self._pool = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="inference")
+        self._slots = threading.BoundedSemaphore(self.workers + self.queue_size)
+        self._lock = threading.Lock()
+        # Coroutines of run_when_free() waiting for a slot; a freed slot goes to the oldest one.
+        self._waiters: deque[tuple[asyncio.AbstractEventLoop, asyncio.Future[None]]] = deque()
+        self._in_flight = 0
+        self._completed = 0
+        self._rejected = 0
+
+    def submit(self, fn: Callable[..., R], *args: Any, block: bool = False, timeout: float | None = None) -> Future[R]:
+        """Schedule ``fn``; without ``block`` a full backlog raises at once."""
+        self._acquire(block, timeout)
+        context = contextvars.copy_context()
+        try:
+            future = self._pool.submit(context.run, fn, *args)
+        except BaseException:
+            self._abandon()
+            raise
+        future.add_done_callback(self._release)
+        return future
+
+    def admit(self, start: Callable[[], Future[R]]) -> Future[R]:
+        """Count work scored elsewhere (the micro-batching scheduler) against the backlog.
+
+        The slot is held until the returned future completes but no worker thread
+        waits on it, so concurrent requests can gather into one batch however
+        few workers there are. A full backlog raises at once, as in ``submit``.
+        """
+        self._acquire(False, None)
+        try:
+            future = start()
+        except BaseException:
+            self._abandon()
+            raise
+        future.add_done_callback(self._release)
+        return future
+
+    async def run(self, fn: Callable[..., R], *args: Any) -> R:
+        return await asyncio.wrap_future(self.submit(fn, *args))
+
+    async def run_admitted(self, start: Callable[[], Future[R]]) -> R:
+        return await asyncio.wrap_future(self.admit(start))
+
+    async def run_when_free(self, fn: Callable[..., R], *args: Any) -> R:
+        """Async ``call``: waits for a free slot instead of failing, on the event loop rather than in a thread."""
+        await self._acquire_waiting()
+        context = contextvars.copy_context()
+        try:
+            future = self._pool.submit(context.run, fn, *args)
+        except BaseException:
+            self._abandon()
+            raise
+        future.add_done_callback(self._release)
+        return await asyncio.wrap_future(future)
+
+    def call(self, fn: Callable[..., R], *args: Any, timeout: float | None = None) -> R:
+        """Blocking variant for background jobs: waits for a free slot instead of failing."""
+        return self.submit(fn, *args, block=True, timeout=timeout).result()
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return {
+                "workers": self.workers,
+                "queue_size": self.queue_size,
+                "in_flight": self._in_flight,
+                "completed": self._completed,
+                "rejected": self._rejected,
+            }
+
+    def shutdown(self) -> None:
+        self._pool.shutdown(wait=True)
+
+    def _acquire(self, block: bool, timeout: float | None) -> None:
+        acquired = self._slots.acquire(timeout=timeout) if block else self._slots.acquire(blocking=False)
+        if not acquired:
+            with self._lock:
+                self._rejected += 1
+            log_event("inference_rejected", workers=self.workers, queue_size=self.queue_size)
+            raise InferenceOverloadedError(self.retry_after_seconds)
+        with self._lock:
+            self._in_flight += 1
+
+    async def _acquire_waiting(self) -> None:
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            if self._slots.acquire(blocking=False):
+                self._in_flight += 1
+                return
+            waiter = loop.create_future()
+            self._waiters.append((loop, waiter))
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            with self._lock:
+                queued = (loop, waiter) in self._waiters
+                if queued:
+                    self._waiters.remove((loop, waiter))
+            if not queued and not waiter.cancelled():
+                self._abandon()  # cancelled after the slot was handed over
+            raise
+
+    def _abandon(self) -> None:
+        with self._lock:
+            self._in_flight -= 1
+        self._free_slot()
+
+    def _release(self, _: Future) -> None:
+        with self._lock:
+            self._in_flight -= 1
+            self._completed += 1
+        self._free_slot()
+
+    def _free_slot(self) -> None:
+        """Hand the slot to the oldest waiting coroutine, or back to the semaphore."""
+        with self._lock:
+            while self._waiters:
+                loop, waiter = self._waiters.popleft()
+                try:
+                    loop.call_soon_threadsafe(self._wake, waiter)
+                except RuntimeError:
+                    continue  # its event loop is closed
+                self._in_flight += 1
+                return
+            self._slots.release()
+
+    def _wake(self, waiter: asyncio.Future[None]) -> None:
+        if waiter.done():
+            self._abandon()  # cancelled before it could take the slot
+        else:
+            waiter.set_result(None)
+
+
+@lru_cache
+def get_inference_executor() -> InferenceExecutor:
+    return InferenceExecutor()
+
+
+def shutdown_inference_executor() -> None:
+    get_inference_executor().shutdown()
+    get_inference_executor.cache_clear()
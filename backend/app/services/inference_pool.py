@@ -0,0 +1,225 @@
+from __future__ import annotations
+
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+import numpy as np
+
+from app.core.observability import log_event
+
+if TYPE_CHECKING:
+    from app.services.prediction_service import ModelRunner
+
+# Worker processes that hold their own ModelRunner; 0 keeps scoring in the API process.
+INFERENCE_PROCESSES = int(os.getenv("INFERENCE_PROCESSES", "0"))
+# CatBoost threads per worker process; one thread per process keeps N processes on N cores.
+INFERENCE_PROCESS_THREAD_COUNT = int(os.getenv("INFERENCE_PROCESS_THREAD_COUNT", "1"))
+
+_WORKER_RUNNER: "ModelRunner | None" = None
+
+
+class WorkerModelMismatchError(RuntimeError):
+    """A worker loaded another model than the pool's runner, e.g. the model file changed on disk."""
+
+
+def _init_worker(model_path: str, explanation_mode: str, thread_count: int, engine: str) -> None:
+    global _WORKER_RUNNER
+    from app.services.prediction_service import ModelRunner, warm_up_runner
+
+    runner = ModelRunner(Path(model_path), explanation_mode, thread_count, engine)
+    warm_up_runner(runner)
+    _WORKER_RUNNER = runner
+
+
+def _worker_identity(hold_seconds: float = 0.0) -> tuple[int, str]:
+    # Holding the task briefly lets the other workers take the remaining pings.
+    time.sleep(hold_seconds)
+    return os.getpid(), _WORKER_RUNNER.version
+
+
+def _score_in_worker(features: np.ndarray) -> tuple[list[float], list[list[dict[str, Any]]]]:
+    from app.services.prediction_service import ScoringContext
+
+    context = ScoringContext.from_features(features)
+    return _WORKER_RUNNER.predict_context(context), _WORKER_RUNNER.explain_context(context)
+
+
+class ProcessInferencePool:
+    """Scores feature matrices in worker processes, each holding a warmed ModelRunner.
+
+    Only the float64 feature matrix crosses the process boundary; predictions
+    and explanations come back. Workers are spawned (not forked) so they never
+    inherit the API process's threads. A crashed worker breaks the pool; the
+    next call rebuilds it once and retries. Workers load the model from
+    ``runner.model_path``; if they report another version than ``runner`` the
+    pool refuses them and ``version`` becomes None, so callers score in-process.
+    """
+
+    def __init__(self, runner: "ModelRunner", processes: int, thread_count: int = INFERENCE_PROCESS_THREAD_COUNT) -> None:
+        self.processes = max(1, processes)
+        self.thread_count = thread_count
+        self._runner = runner
+        self._lock = threading.Lock()
+        # Serializes restarts, so the newest requested runner is always the one left running.
+        self._restart_lock = threading.RLock()
+        self._pending_runner: "ModelRunner | None" = None
+        self._executor: ProcessPoolExecutor | None = None
+        # Set when respawned workers loaded another model; a successful restart clears it.
+        self._refused = False
+        self.restarts = 0
+
+    @property
+    def version(self) -> str | None:
+        return None if self._refused else self._runner.version
+
+    def start(self) -> "ProcessInferencePool":
+        """Spawn every worker and wait until each has loaded and warmed the model."""
+        started = time.perf_counter()
+        with self._lock:
+            self._executor = self._spawn(self._runner)
+            executor = self._executor
+        try:
+            pids = self._ping(executor, self._runner)
+        except WorkerModelMismatchError:
+            self.shutdown()
+            raise
+        log_event(
+            "inference_pool_started",
+            processes=self.processes,
+            version=self.version,
+            worker_pids=sorted(pids),
+            duration_ms=round((time.perf_counter() - started) * 1000, 1),
+        )
+        return self
+
+    def score(self, features: np.ndarray) -> tuple[list[float], list[list[dict[str, Any]]]]:
+        executor = self._current()
+        try:
+            return executor.submit(_score_in_worker, features).result()
+        except BrokenProcessPool:
+            log_event("inference_pool_broken", processes=self.processes, version=self.version)
+            return self._restart_after(executor).submit(_score_in_worker, features).result()
+        except RuntimeError:
+            # Submitting to a pool that a concurrent restart just shut down; use its replacement.
+            if self._executor is executor:
+                raise
+            return self._current().submit(_score_in_worker, features).result()
+
+    def worker_pids(self) -> set[int]:
+        return self._ping(self._current(), self._runner)
+
+    def restart(self, runner: "ModelRunner | None" = None) -> None:
+        """Replace every worker, e.g. after the registry swapped in a new model.
+
+        The new workers are warmed before the swap; until then ``version`` still
+        names the old model, so callers scoring a newer runner stay in-process.
+        """
+        with self._restart_lock:
+            runner = runner or self._runner
+            replacement = self._spawn(runner)
+            try:
+                self._ping(replacement, runner)
+            except WorkerModelMismatchError:
+                replacement.shutdown(wait=True)
+                raise
+            with self._lock:
+                previous, running = self._executor, self._executor is not None or self._refused
+                if running:
+                    self._executor = replacement
+                    self._runner = runner
+                    self._refused = False
+                    self.restarts += 1
+            if not running:
+                # Shut down while the replacement was warming up.
+                replacement.shutdown(wait=True)
+                return
+            if previous is not None:
+                previous.shutdown(wait=True)
+            log_event("inference_pool_restarted", processes=self.processes, version=self.version)
+
+    def restart_in_background(self, runner: "ModelRunner") -> threading.Thread:
+        """``restart`` on a background thread; swaps requested meanwhile end on the newest runner."""
+        with self._lock:
+            self._pending_runner = runner
+        thread = threading.Thread(target=self._restart_pending, name="inference-pool-restart", daemon=True)
+        thread.start()
+        return thread
+
+    def shutdown(self) -> None:
+        """Let in-flight calls finish, then stop the workers."""
+        with self._restart_lock, self._lock:
+            self._pending_runner = None
+            self._refused = False
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True)
+            log_event("inference_pool_stopped", processes=self.processes)
+
+    def _current(self) -> ProcessPoolExecutor:
+        executor = self._executor
+        if executor is None:
+            if self._refused:
+                raise WorkerModelMismatchError(f"Inference workers do not serve {self._runner.version}")
+            raise RuntimeError("Inference process pool is not running")
+        return executor
+
+    def _restart_pending(self) -> None:
+        with self._restart_lock:
+            with self._lock:
+                runner, self._pending_runner = self._pending_runner, None
+            if runner is None:
+                return  # an earlier thread already restarted onto it, or the pool was shut down
+            try:
+                self.restart(runner)
+            except Exception as exc:
+                # The workers keep the previous model; its callers keep scoring in-process.
+                log_event("inference_pool_restart_failed", processes=self.processes, version=runner.version, error=str(exc))
+
+    def _restart_after(self, broken: ProcessPoolExecutor) -> ProcessPoolExecutor:
+        try:
+            with self._lock:
+                # Another caller may already have replaced (or refused) the broken pool.
+                if self._executor is broken:
+                    replacement = self._spawn(self._runner)
+                    try:
+                        self._ping(replacement, self._runner)
+                    except WorkerModelMismatchError as exc:
+                        replacement.shutdown(wait=False, cancel_futures=True)
+                        self._executor, self._refused = None, True
+                        log_event("inference_pool_refused", processes=self.processes, error=str(exc))
+                        raise
+                    self._executor = replacement
+                    self.restarts += 1
+                executor = self._executor
+        finally:
+            broken.shutdown(wait=False, cancel_futures=True)
+        return executor if executor is not None else self._current()
+
+    def _spawn(self, runner: "ModelRunner") -> ProcessPoolExecutor:
+        return ProcessPoolExecutor(
+            max_workers=self.processes,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+            initargs=(str(runner.model_path), runner.explanation_mode, self.thread_count, runner.engine),
+        )
+
+    def _ping(self, executor: ProcessPoolExecutor, runner: "ModelRunner") -> set[int]:
+        """Wait until every worker process has loaded and warmed the model and answered.
+
+        Raises WorkerModelMismatchError when a worker serves another version than ``runner``.
+        """
+        pids: set[int] = set()
+        while len(pids) < self.processes:
+            futures = [executor.submit(_worker_identity, 0.05) for _ in range(self.processes)]
+            for future in futures:
+                pid, version = future.result()
+                if version != runner.version:
+                    raise WorkerModelMismatchError(f"Inference worker {pid} loaded {version}, expected {runner.version}")
+                pids.add(pid)
+        return pids
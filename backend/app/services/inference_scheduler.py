@@ -0,0 +1,112 @@
+from __future__ import annotations
+
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Callable, Generic, TypeVar
+
+from app.core.observability import log_event
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+class InferenceScheduler(Generic[T, R]):
+    """Collects concurrent single-item requests into batches for one vectorized call.
+
+    A batch is dispatched when ``window_seconds`` has passed since its first item
+    arrived or when it reaches ``max_batch_size``, whichever comes first. Each
+    caller blocks only on its own future; a failing batch fails every waiter in it.
+    """
+
+    def __init__(
+        self,
+        score_batch: Callable[[list[T]], list[R]],
+        *,
+        window_seconds: float,
+        max_batch_size: int,
+        name: str = "inference-scheduler",
+    ) -> None:
+        self._score_batch = score_batch
+        self.window_seconds = window_seconds
+        self.max_batch_size = max(1, max_batch_size)
+        self._name = name
+        self._queue: queue.SimpleQueue[tuple[T, Future[R]] | None] = queue.SimpleQueue()
+        self._thread: threading.Thread | None = None
+        self._start_lock = threading.Lock()
+        self.batches = 0
+        self.items = 0
+        self.largest_batch = 0
+
+    def submit(self, item: T) -> Future[R]:
+        self._ensure_started()
+        future: Future[R] = Future()
+        self._queue.put((item, future))
+        return future
+
+    def run(self, item: T, timeout: float | None = None) -> R:
+        return self.submit(item).result(timeout)
+
+    def stop(self) -> None:
+        with self._start_lock:
+            thread = self._thread
+            self._thread = None
+        if thread is not None:
+            self._queue.put(None)
+            thread.join()
+
+    def stats(self) -> dict[str, float]:
+        return {
+            "batches": self.batches,
+            "items": self.items,
+            "largest_batch": self.largest_batch,
+            "mean_batch": round(self.items / self.batches, 2) if self.batches else 0.0,
+        }
+
+    def _ensure_started(self) -> None:
+        if self._thread is not None:
+            return
+        with self._start_lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._loop, name=self._name, daemon=True)
+                self._thread.start()
+
+    def _loop(self) -> None:
+        stopping = False
+        while not stopping:
+            first = self._queue.get()
+            if first is None:
+                return
+            batch = [first]
+            deadline = time.monotonic() + self.window_seconds
+            while len(batch) < self.max_batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if item is None:
+                    stopping = True
+                    break
+                batch.append(item)
+            self._dispatch(batch)
+
+    def _dispatch(self, batch: list[tuple[T, Future[R]]]) -> None:
+        live = [(item, future) for item, future in batch if future.set_running_or_notify_cancel()]
+        if not live:
+            return
+        self.batches += 1
+        self.items += len(live)
+        self.largest_batch = max(self.largest_batch, len(live))
+        try:
+            results = self._score_batch([item for item, _ in live])
+        except Exception as exc:
+            log_event("inference_batch_failed", batch_size=len(live), error=str(exc))
+            for _, future in live:
+                future.set_exception(exc)
+            return
+        for (_, future), result in zip(live, results):
+            future.set_result(result)
@@ -0,0 +1,249 @@
+from __future__ import annotations
+
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING, Callable
+
+from pydantic import BaseModel, ConfigDict
+
+from app.core.observability import log_event
+
+if TYPE_CHECKING:
+    from app.services.prediction_service import ModelRunner
+
+MODEL_REGISTRY_MAX_VERSIONS = int(os.getenv("MODEL_REGISTRY_MAX_VERSIONS", "3"))
+MODEL_WATCH_INTERVAL_SECONDS = float(os.getenv("MODEL_WATCH_INTERVAL_SECONDS", "0"))
+
+
+def _now_iso() -> str:
+    return time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())
+
+
+@dataclass(frozen=True)
+class ModelVersionInfo:
+    version: str
+    model_path: str
+    checksum: str
+    loaded_at: str
+
+
+@dataclass
+class ReloadStatus:
+    state: str = "idle"
+    requested_path: str | None = None
+    version: str | None = None
+    error: str | None = None
+    updated_at: str | None = None
+
+
+class ModelReloadRequest(BaseModel):
+    model_config = ConfigDict(protected_namespaces=())
+
+    model_file: str | None = None
+    wait: bool = False
+
+
+class ModelActivateRequest(BaseModel):
+    version: str
+
+
+class ModelRegistryResponse(BaseModel):
+    active_version: str
+    versions: list[ModelVersionInfo]
+    reload: ReloadStatus
+
+
+def resolve_model_file(model_dir: Path, model_file: str | None, default: Path) -> Path:
+    """Resolve an admin-supplied artifact name; only ``.cbm`` files inside ``model_dir`` are allowed."""
+    if model_file is None:
+        return default
+    if Path(model_file).name != model_file or not model_file.endswith(".cbm") or model_file.startswith("."):
+        raise ValueError("model_file must be a .cbm file name inside the model directory")
+    return model_dir.resolve() / model_file
+
+
+class ModelRegistry:
+    """Holds loaded CatBoost runners and swaps the active one atomically.
+
+    ``active()`` is a single attribute read, so a request that grabbed a runner
+    keeps scoring on it even if a reload swaps in a newer one meanwhile.
+    Reloads load and warm the new artifact on a background thread before the
+    swap; a failed load leaves the current model serving. Swaps (reloads and
+    activations) run one at a time under ``_reload_lock``.
+    """
+
+    def __init__(
+        self,
+        model_path: Path,
+        *,
+        loader: Callable[[Path], "ModelRunner"],
+        warm_up: Callable[["ModelRunner"], None],
+        on_swap: Callable[["ModelRunner"], None] | None = None,
+        max_versions: int = MODEL_REGISTRY_MAX_VERSIONS,
+    ) -> None:
+        self.model_path = model_path
+        self._loader = loader
+        self._warm_up = warm_up
+        self._on_swap = on_swap
+        self._max_versions = max(1, max_versions)
+        self._runners: OrderedDict[str, "ModelRunner"] = OrderedDict()
+        self._infos: dict[str, ModelVersionInfo] = {}
+        # Held for a whole reload and for an activation, so the later of the two always wins.
+        self._reload_lock = threading.Lock()
+        # Guards the loaded versions, the reload thread and reload_status.
+        self._state_lock = threading.Lock()
+        self._reload_thread: threading.Thread | None = None
+        self._watch_thread: threading.Thread | None = None
+        self._watch_stop = threading.Event()
+        self._watched_stat: tuple[float, int] | None = self._stat(model_path)
+        self.reload_status = ReloadStatus()
+
+        runner = loader(model_path)
+        self._active = runner
+        self._remember(runner)
+        self._evict()
+        if on_swap is not None:
+            on_swap(runner)
+
+    def active(self) -> "ModelRunner":
+        return self._active
+
+    def versions(self) -> list[ModelVersionInfo]:
+        with self._state_lock:
+            return [self._infos[version] for version in self._runners]
+
+    def activate(self, version: str) -> "ModelRunner":
+        """Switch back to an already loaded version without reloading it.
+
+        Waits for a reload in progress, so the reload cannot swap its model in
+        over this activation afterwards.
+        """
+        with self._reload_lock:
+            with self._state_lock:
+                runner = self._runners.get(version)
+            if runner is None:
+                raise KeyError(version)
+            self._swap(runner)
+        return runner
+
+    def reload(self, model_path: Path | None = None, *, wait: bool = False) -> ReloadStatus:
+        """Load ``model_path`` (default: the configured path) in the background and swap it in."""
+        path = model_path or self.model_path
+        with self._state_lock:
+            if self._reload_thread is not None and self._reload_thread.is_alive():
+                return self.reload_status
+            self.reload_status = ReloadStatus(state="loading", requested_path=str(path), updated_at=_now_iso())
+            self._reload_thread = threading.Thread(target=self._reload, args=(path,), name="model-reload", daemon=True)
+            self._reload_thread.start()
+            thread = self._reload_thread
+        if wait:
+            thread.join()
+        return self.reload_status
+
+    def start_watching(self, interval_seconds: float = MODEL_WATCH_INTERVAL_SECONDS) -> bool:
+        """Poll the configured model path and reload when its mtime or size changes."""
+        if interval_seconds <= 0 or (self._watch_thread is not None and self._watch_thread.is_alive()):
+            return False
+        self._watch_stop.clear()
+        self._watch_thread = threading.Thread(
+            target=self._watch,
+            args=(interval_seconds,),
+            name="model-watch",
+            daemon=True,
+        )
+        self._watch_thread.start()
+        return True
+
+    def stop_watching(self) -> None:
+        self._watch_stop.set()
+        if self._watch_thread is not None:
+            self._watch_thread.join()
+            self._watch_thread = None
+
+    def _reload(self, path: Path) -> None:
+        with self._reload_lock:
+            started = time.perf_counter()
+            try:
+                if not path.exists():
+                    raise FileNotFoundError(f"Model file not found: {path}")
+                runner = self._loader(path)
+                if runner.model is None:
+                    raise RuntimeError(f"Model could not be loaded: {path}")
+                self._warm_up(runner)
+            except Exception as exc:
+                self._set_reload_status(
+                    ReloadStatus(state="failed", requested_path=str(path), error=str(exc), updated_at=_now_iso())
+                )
+                log_event("model_reload_failed", model_path=str(path), error=str(exc))
+                return
+
+            self._remember(runner)
+            self._swap(runner)
+            self._evict()
+            self._set_reload_status(
+                ReloadStatus(state="completed", requested_path=str(path), version=runner.version, updated_at=_now_iso())
+            )
+            log_event(
+                "model_reloaded",
+                model_path=str(path),
+                version=runner.version,
+                duration_ms=round((time.perf_counter() - started) * 1000, 1),
+            )
+
+    def _set_reload_status(self, status: ReloadStatus) -> None:
+        with self._state_lock:
+            self.reload_status = status
+
+    def _remember(self, runner: "ModelRunner") -> None:
+        with self._state_lock:
+            self._runners[runner.version] = runner
+            self._runners.move_to_end(runner.version)
+            self._infos[runner.version] = ModelVersionInfo(
+                version=runner.version,
+                model_path=str(runner.model_path),
+                checksum=runner.model_checksum,
+                loaded_at=_now_iso(),
+            )
+
+    def _evict(self) -> None:
+        with self._state_lock:
+            evictable = [version for version in self._runners if self._runners[version] is not self._active]
+            while len(self._runners) > self._max_versions and evictable:
+                oldest = evictable.pop(0)
+                del self._runners[oldest]
+                del self._infos[oldest]
+
+    def _swap(self, runner: "ModelRunner") -> None:
+        previous = self._active
+        self._active = runner
+        if runner is not previous and self._on_swap is not None:
+            self._on_swap(runner)
+
+    def _watch(self, interval_seconds: float) -> None:
+        while not self._watch_stop.wait(interval_seconds):
+            current = self._stat(self.model_path)
+            if current is None or current == self._watched_stat:
+                continue
+            self._watched_stat = current
+            log_event("model_file_changed", model_path=str(self.model_path))
+            self.reload()
+
+    @staticmethod
+    def _stat(path: Path) -> tuple[float, int] | None:
+        try:
+            stat = path.stat()
+        except OSError:
+            return None
+        return stat.st_mtime, stat.st_size
+
+
+def describe_registry(registry: ModelRegistry) -> ModelRegistryResponse:
+    return ModelRegistryResponse(
+        active_version=registry.active().version,
+        versions=registry.versions(),
+        reload=registry.reload_status,
+    )
@@ -0,0 +1,299 @@
+from __future__ import annotations
+
+import json
+import math
+import tempfile
+from dataclasses import dataclass
+from functools import cached_property
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+# CatBoost nan_value_treatment -> value NaN is replaced with before comparing against borders.
+# "AsIs" (no NaNs seen in training) compares NaN directly, which is never greater than a border.
+_NAN_FILL = {"AsIs": -np.inf, "AsFalse": -np.inf, "AsTrue": np.inf}
+
+
+@dataclass(frozen=True)
+class TreeScoreState:
+    """Leaf of every tree plus running totals for one row, so an edit only rescores affected trees."""
+
+    features: np.ndarray  # (features,) float64
+    leaves: np.ndarray  # (trees,)
+    raw: float  # sum of leaf values before scale and bias
+    shap: np.ndarray  # (features + 1,) laid out like CatBoost ShapValues
+
+
+@dataclass(frozen=True)
+class ObliviousTreeModel:
+    """A CatBoost oblivious-tree regressor as plain NumPy arrays.
+
+    Tree ``t`` compares feature ``split_features[t, d]`` against
+    ``split_borders[t, d]`` at level ``d``; the comparison bits form the leaf
+    index (bit ``d`` from level ``d``). Shallower trees are padded with splits
+    that are never true. Because a tree sees a row only through its leaf index,
+    exact (path-dependent) TreeSHAP is precomputed per leaf in ``leaf_shap``,
+    so explaining a row costs the same table lookups as predicting it.
+    """
+
+    feature_names: tuple[str, ...]
+    split_features: np.ndarray  # (trees, depth) int32
+    split_borders: np.ndarray  # (trees, depth) float32
+    leaf_values: np.ndarray  # (trees, 2**depth) float64
+    leaf_shap: np.ndarray  # (trees, 2**depth, depth) float64, contribution of the feature split at each level
+    nan_fill: np.ndarray  # (features,) float32
+    scale: float
+    bias: float
+    expected_value: float
+    source_checksum: str = ""
+
+    @property
+    def tree_count(self) -> int:
+        return self.split_features.shape[0]
+
+    @property
+    def depth(self) -> int:
+        return self.split_features.shape[1]
+
+    @cached_property
+    def _feature_projection(self) -> np.ndarray:
+        # (trees * depth, features) one-hot map that sums per-level SHAP into feature columns.
+        projection = np.zeros((self.split_features.size, len(self.feature_names)), dtype=np.float64)
+        projection[np.arange(self.split_features.size), self.split_features.ravel()] = 1.0
+        return projection
+
+    @cached_property
+    def _trees_by_feature(self) -> list[np.ndarray]:
+        # Padding levels (infinite border) never depend on their placeholder feature.
+        real_split = np.isfinite(self.split_borders)
+        return [
+            np.flatnonzero(((self.split_features == feature) & real_split).any(axis=1))
+            for feature in range(len(self.feature_names))
+        ]
+
+    @classmethod
+    def from_catboost_json(cls, model_json: dict[str, Any], source_checksum: str = "") -> "ObliviousTreeModel":
+        """Build the arrays from ``CatBoost.save_model(..., format="json")`` output."""
+        float_features = model_json["features_info"]["float_features"]
+        if model_json["features_info"].get("categorical_features"):
+            raise ValueError("Categorical features are not supported")
+        # Features the model never splits on may be missing; flat indices keep the input layout.
+        feature_count = max(feature["flat_feature_index"] for feature in float_features) + 1
+        names = [str(position) for position in range(feature_count)]
+        nan_fill = np.full(feature_count, -np.inf, dtype=np.float32)
+        for feature in float_features:
+            position = feature["flat_feature_index"]
+            names[position] = feature.get("feature_id") or names[position]
+            treatment = feature.get("nan_value_treatment", "AsIs")
+            if treatment not in _NAN_FILL:
+                raise ValueError(f"Unsupported nan_value_treatment: {treatment}")
+            nan_fill[position] = _NAN_FILL[treatment]
+        feature_names = tuple(names)
+
+        trees = model_json["oblivious_trees"]
+        depth = max(len(tree["splits"]) for tree in trees)
+        split_features = np.zeros((len(trees), depth), dtype=np.int32)
+        split_borders = np.full((len(trees), depth), np.inf, dtype=np.float32)
+        leaf_values = np.zeros((len(trees), 2**depth), dtype=np.float64)
+        leaf_shap = np.zeros((len(trees), 2**depth, depth), dtype=np.float64)
+        expected_value = 0.0
+        for position, tree in enumerate(trees):
+            splits = tree["splits"]
+            for level, split in enumerate(splits):
+                if split.get("split_type", "FloatFeature") != "FloatFeature":
+                    raise ValueError(f"Unsupported split type: {split['split_type']}")
+                split_features[position, level] = split["float_feature_index"]
+                split_borders[position, level] = split["border"]
+            values = np.asarray(tree["leaf_values"], dtype=np.float64)
+            weights = np.asarray(tree["leaf_weights"], dtype=np.float64)
+            leaf_values[position, : len(values)] = values
+            shap, tree_expected = _tree_shap_table(split_features[position, : len(splits)], values, weights)
+            leaf_shap[position, : len(values), : len(splits)] = shap
+            expected_value += tree_expected
+
+        scale, bias = model_json.get("scale_and_bias", [1.0, [0.0]])
+        bias = float(bias[0] if isinstance(bias, list) else bias)
+        return cls(
+            feature_names=feature_names,
+            split_features=split_features,
+            split_borders=split_borders,
+            leaf_values=leaf_values,
+            leaf_shap=leaf_shap,
+            nan_fill=nan_fill,
+            scale=float(scale),
+            bias=bias,
+            expected_value=float(scale) * expected_value + bias,
+            source_checksum=source_checksum,
+        )
+
+    @classmethod
+    def from_catboost_json_file(cls, path: Path, source_checksum: str = "") -> "ObliviousTreeModel":
+        with path.open(encoding="utf-8") as model_file:
+            return cls.from_catboost_json(json.load(model_file), source_checksum)
+
+    @classmethod
+    def from_catboost(cls, model: Any, source_checksum: str = "") -> "ObliviousTreeModel":
+        """Export a loaded CatBoost model through its JSON format."""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            json_path = Path(tmp_dir) / "model.json"
+            model.save_model(str(json_path), format="json")
+            return cls.from_catboost_json_file(json_path, source_checksum)
+
+    def save(self, path: Path) -> None:
+        np.savez_compressed(
+            path,
+            feature_names=np.asarray(self.feature_names),
+            split_features=self.split_features,
+            split_borders=self.split_borders,
+            leaf_values=self.leaf_values,
+            leaf_shap=self.leaf_shap,
+            nan_fill=self.nan_fill,
+            scalars=np.asarray([self.scale, self.bias, self.expected_value], dtype=np.float64),
+            source_checksum=np.asarray(self.source_checksum),
+        )
+
+    @classmethod
+    def load(cls, path: Path) -> "ObliviousTreeModel":
+        with np.load(path, allow_pickle=False) as arrays:
+            scale, bias, expected_value = arrays["scalars"].tolist()
+            return cls(
+                feature_names=tuple(arrays["feature_names"].tolist()),
+                split_features=arrays["split_features"],
+                split_borders=arrays["split_borders"],
+                leaf_values=arrays["leaf_values"],
+                leaf_shap=arrays["leaf_shap"],
+                nan_fill=arrays["nan_fill"],
+                scale=scale,
+                bias=bias,
+                expected_value=expected_value,
+                source_checksum=str(arrays["source_checksum"]),
+            )
+
+    def leaf_indices(self, features: np.ndarray, trees: np.ndarray | None = None) -> np.ndarray:
+        """Leaf index of every row in every tree (or only in ``trees``), shape (rows, trees)."""
+        split_features = self.split_features if trees is None else self.split_features[trees]
+        split_borders = self.split_borders if trees is None else self.split_borders[trees]
+        # CatBoost compares float32 values against float32 borders.
+        values = np.asarray(features, dtype=np.float32)
+        values = np.where(np.isnan(values), self.nan_fill, values)
+        leaves = np.zeros((len(values), len(split_features)), dtype=np.intp)
+        for level in range(self.depth):
+            leaves |= (values[:, split_features[:, level]] > split_borders[:, level]).astype(np.intp) << level
+        return leaves
+
+    def predict(self, features: np.ndarray) -> np.ndarray:
+        leaves = self.leaf_indices(features)
+        raw = self.leaf_values[np.arange(self.tree_count), leaves].sum(axis=1)
+        return self.scale * raw + self.bias
+
+    def shap_values(self, features: np.ndarray) -> np.ndarray:
+        """Exact SHAP matrix laid out like CatBoost ``ShapValues``: features, then expected value."""
+        leaves = self.leaf_indices(features)
+        per_level = self.leaf_shap[np.arange(self.tree_count), leaves]  # (rows, trees, depth)
+        shap = np.empty((len(leaves), len(self.feature_names) + 1), dtype=np.float64)
+        shap[:, :-1] = per_level.reshape(len(leaves), -1) @ self._feature_projection
+        shap[:, :-1] *= self.scale
+        shap[:, -1] = self.expected_value
+        return shap
+
+    def row_state(self, row: np.ndarray) -> TreeScoreState:
+        features = np.asarray(row, dtype=np.float64)
+        leaves = self.leaf_indices(features[None, :])[0]
+        raw = float(self.leaf_values[np.arange(self.tree_count), leaves].sum())
+        return TreeScoreState(features=features, leaves=leaves, raw=raw, shap=self.shap_values(features[None, :])[0])
+
+    def prediction(self, state: TreeScoreState) -> float:
+        return self.scale * state.raw + self.bias
+
+    def update_state(self, state: TreeScoreState, row: np.ndarray) -> tuple[TreeScoreState, np.ndarray, np.ndarray]:
+        """Rescore ``row`` starting from ``state``, touching only trees that split on changed features.
+
+        Returns the new state, the indices of changed features and of rescored trees.
+        """
+        features = np.asarray(row, dtype=np.float64)
+        same = (features == state.features) | (np.isnan(features) & np.isnan(state.features))
+        changed = np.flatnonzero(~same)
+        if not len(changed):
+            return state, changed, changed
+        trees = np.unique(np.concatenate([self._trees_by_feature[feature] for feature in changed]))
+        if not len(trees):
+            return TreeScoreState(features, state.leaves, state.raw, state.shap), changed, trees
+
+        old_leaves = state.leaves[trees]
+        new_leaves = self.leaf_indices(features[None, :], trees)[0]
+        raw = state.raw + float((self.leaf_values[trees, new_leaves] - self.leaf_values[trees, old_leaves]).sum())
+        shap_delta = np.zeros(len(self.feature_names) + 1, dtype=np.float64)
+        np.add.at(
+            shap_delta,
+            self.split_features[trees].ravel(),
+            (self.leaf_shap[trees, new_leaves] - self.leaf_shap[trees, old_leaves]).ravel(),
+        )
+        shap = state.shap.copy()
+        shap[:-1] += self.scale * shap_delta[:-1]
+        leaves = state.leaves.copy()
+        leaves[trees] = new_leaves
+        return TreeScoreState(features, leaves, raw, shap), changed, trees
+
+
+def _tree_shap_table(split_features: np.ndarray, values: np.ndarray, weights: np.ndarray) -> tuple[np.ndarray, float]:
+    """Exact path-dependent SHAP of one oblivious tree for every possible leaf index.
+
+    A row reaches the tree only through its leaf index, so the Shapley values of
+    the game ``v(S)`` (follow the row on splits over features in ``S``, average
+    by leaf weights elsewhere) are enumerated over the tree's few distinct
+    features once. The contribution of each feature is stored at the first
+    level that splits on it.
+    """
+    depth = len(split_features)
+    leaves = 2**depth
+    unique_features = list(dict.fromkeys(split_features.tolist()))
+    members = len(unique_features)
+    subsets = 2**members
+    level_member = np.asarray([unique_features.index(feature) for feature in split_features.tolist()])
+    row_leaves = np.arange(leaves)
+
+    # game[s, r]: v(S_s) for a row whose leaf index is r. The leaf table gets one axis per
+    # level (C order, so the last axis is level 0). CatBoost's ShapValues treat the last
+    # split as the root, so levels are collapsed bottom-up starting from level 0.
+    node_values = np.broadcast_to(values.reshape((2,) * depth), (subsets, leaves) + (2,) * depth).copy()
+    node_weights = weights.reshape((2,) * depth)
+    axis_levels = list(range(depth - 1, -1, -1))
+    for level in range(depth):
+        axis = axis_levels.index(level)
+        axis_levels.pop(axis)
+        low_values, high_values = np.take(node_values, 0, axis=axis + 2), np.take(node_values, 1, axis=axis + 2)
+        low_weights, high_weights = np.take(node_weights, 0, axis=axis), np.take(node_weights, 1, axis=axis)
+        total = low_weights + high_weights
+        with np.errstate(invalid="ignore", divide="ignore"):
+            averaged = np.where(
+                total > 0,
+                (low_values * low_weights + high_values * high_weights) / total,
+                (low_values + high_values) / 2,
+            )
+        followed = ((np.arange(subsets) >> level_member[level]) & 1).astype(bool)
+        row_bit = ((row_leaves >> level) & 1).astype(bool)
+        extra = (1,) * len(axis_levels)
+        chosen = np.where(row_bit.reshape((1, leaves) + extra), high_values, low_values)
+        node_values = np.where(followed.reshape((subsets, 1) + extra), chosen, averaged)
+        node_weights = total
+    game = node_values.reshape(subsets, leaves)
+
+    coefficients = np.zeros((members, subsets))
+    for subset in range(subsets):
+        size = bin(subset).count("1")
+        for member in range(members):
+            if (subset >> member) & 1:
+                coefficients[member, subset] += _shapley_weight(size - 1, members)
+            else:
+                coefficients[member, subset] -= _shapley_weight(size, members)
+    member_shap = (coefficients @ game).T  # (leaves, members)
+
+    table = np.zeros((leaves, depth))
+    for member, feature in enumerate(unique_features):
+        table[:, int(np.argmax(split_features == feature))] = member_shap[:, member]
+    return table, float(game[0, 0])
+
+
+def _shapley_weight(subset_size: int, members: int) -> float:
+    return math.factorial(subset_size) * math.factorial(members - subset_size - 1) / math.factorial(members)
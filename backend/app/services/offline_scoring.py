@@ -0,0 +1,296 @@
+from __future__ import annotations
+
+import json
+import multiprocessing
+import os
+import shutil
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Iterator
+
+import numpy as np
+import pandas as pd
+
+from app.services.prediction_service import (
+    FEATURES,
+    FIELD_ENGINE,
+    ModelRunner,
+    ScoringContext,
+    get_display_risk,
+    needs_input_response,
+    resolve_tier_from_iron_index,
+)
+
+OFFLINE_OUTPUT_FORMATS = ("parquet", "csv")
+CHECKPOINT_FILE = "_checkpoint.json"
+
+
+@dataclass(frozen=True)
+class OfflineScoringConfig:
+    input_path: Path
+    output_dir: Path
+    model_path: Path
+    chunk_rows: int = 50_000
+    # 0 scores in the calling process; N > 0 spawns N workers with one ModelRunner each.
+    processes: int = 1
+    with_shap: bool = False
+    output_format: str = "parquet"
+    keep_columns: tuple[str, ...] = ()
+    engine: str | None = None
+    explanation_mode: str | None = None
+    overwrite: bool = False
+
+
+@dataclass
+class OfflineScoringReport:
+    rows: int = 0
+    scored_rows: int = 0
+    chunks_written: int = 0
+    chunks_skipped: int = 0
+    seconds: float = 0.0
+    model_version: str = ""
+    part_files: list[str] = field(default_factory=list)
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.rows / self.seconds if self.seconds > 0 else 0.0
+
+
+def score_frame(
+    runner: ModelRunner,
+    frame: pd.DataFrame,
+    *,
+    first_row: int = 0,
+    with_shap: bool = False,
+    keep_columns: tuple[str, ...] = (),
+) -> pd.DataFrame:
+    """Score one input chunk with the same rules and model as the API.
+
+    Validation, normalization and the clinical adjustment run column-wise
+    through ``FIELD_ENGINE``; cells that are empty or not numbers count as
+    missing. Rejected rows keep ``status=needs_input`` with their error code.
+    """
+    columns = {
+        name: pd.to_numeric(frame[name], errors="coerce").to_numpy(dtype=np.float64)
+        for name in FIELD_ENGINE.columns
+        if name in frame.columns
+    }
+    batch = FIELD_ENGINE.prepare_columns(columns, len(frame))
+    scorable = np.flatnonzero(batch.scorable)
+
+    output = pd.DataFrame({"row": np.arange(first_row, first_row + len(frame), dtype=np.int64)})
+    for name in keep_columns:
+        output[name] = frame[name].to_numpy()
+    output["status"] = np.where(batch.scorable, "ok", "needs_input")
+    output["confidence"] = batch.confidence
+    error_codes: list[str | None] = [None] * len(frame)
+    missing: list[str | None] = [None] * len(frame)
+    for position in np.flatnonzero(~batch.scorable):
+        payload = {name: _cell(values[position]) for name, values in columns.items()}
+        rejected = needs_input_response(payload)
+        error_codes[position] = rejected.error_code
+        missing[position] = ",".join(rejected.missing_required_fields)
+    output["error_code"] = error_codes
+    output["missing_required_fields"] = missing
+
+    iron_index = np.full(len(frame), np.nan)
+    risk_percent = np.full(len(frame), np.nan)
+    risk_tier: list[str | None] = [None] * len(frame)
+    shap = np.full((len(frame), len(FEATURES) + 1), np.nan)
+    if len(scorable):
+        context = ScoringContext.from_features(FIELD_ENGINE.model_features(batch, scorable))
+        adjusted = np.asarray(runner.predict_context(context), dtype=np.float64) - batch.penalty[scorable]
+        for position, value in zip(scorable, adjusted):
+            iron_index[position] = round(float(value), 2)
+            risk_percent[position] = get_display_risk(value)
+            risk_tier[position] = resolve_tier_from_iron_index(value)
+        if with_shap:
+            shap[scorable] = runner.shap_values(context)
+    output["iron_index"] = iron_index
+    output["risk_percent"] = risk_percent
+    output["risk_tier"] = risk_tier
+    if with_shap:
+        for position, name in enumerate(FEATURES):
+            output[f"shap_{name}"] = shap[:, position]
+        output["shap_base_value"] = shap[:, -1]
+    return output
+
+
+def _cell(value: float) -> float | None:
+    return None if np.isnan(value) else float(value)
+
+
+def iter_input_chunks(path: Path, chunk_rows: int) -> Iterator[pd.DataFrame]:
+    """CSV or Parquet input in chunks of ``chunk_rows`` rows, never loading the whole file."""
+    if path.suffix.lower() in {".parquet", ".pq"}:
+        import pyarrow.parquet as pq
+
+        for batch in pq.ParquetFile(path).iter_batches(batch_size=chunk_rows):
+            yield batch.to_pandas()
+        return
+    yield from pd.read_csv(path, chunksize=chunk_rows)
+
+
+def _checkpoint_manifest(config: OfflineScoringConfig, runner: ModelRunner) -> dict[str, Any]:
+    stat = config.input_path.stat()
+    return {
+        "input_path": str(config.input_path.resolve()),
+        "input_size": stat.st_size,
+        "input_mtime": stat.st_mtime,
+        "chunk_rows": config.chunk_rows,
+        "model_checksum": runner.model_checksum,
+        # CatBoost and the numpy tree evaluator may differ in the last float bits.
+        "engine": runner.engine,
+        "with_shap": config.with_shap,
+        "output_format": config.output_format,
+        "keep_columns": list(config.keep_columns),
+        "explanation_mode": config.explanation_mode,
+    }
+
+
+def _prepare_output_dir(config: OfflineScoringConfig, manifest: dict[str, Any]) -> None:
+    """Create the output directory or verify it holds a checkpoint of the same job."""
+    checkpoint = config.output_dir / CHECKPOINT_FILE
+    if config.overwrite and config.output_dir.exists():
+        shutil.rmtree(config.output_dir)
+    if checkpoint.exists():
+        previous = json.loads(checkpoint.read_text(encoding="utf-8"))
+        if previous != manifest:
+            raise ValueError(
+                f"{config.output_dir} holds a checkpoint of a different job (input, model, engine or options changed); "
+                "pass overwrite (--overwrite) or choose another output directory"
+            )
+        return
+    if config.output_dir.exists() and any(config.output_dir.iterdir()):
+        raise ValueError(f"{config.output_dir} is not empty and has no checkpoint")
+    config.output_dir.mkdir(parents=True, exist_ok=True)
+    checkpoint.write_text(json.dumps(manifest, indent=2), encoding="utf-8")
+
+
+def part_path(output_dir: Path, index: int, output_format: str) -> Path:
+    return output_dir / f"part-{index:06d}.{output_format}"
+
+
+def _write_part(frame: pd.DataFrame, path: Path, output_format: str) -> None:
+    # Written under a temporary name and renamed, so a part file on disk is always complete.
+    temporary = path.with_name(f".{path.name}.tmp")
+    if output_format == "parquet":
+        frame.to_parquet(temporary, index=False)
+    else:
+        frame.to_csv(temporary, index=False)
+    os.replace(temporary, path)
+
+
+_WORKER_RUNNER: ModelRunner | None = None
+
+
+def _init_worker(model_path: str, explanation_mode: str | None, engine: str | None) -> None:
+    global _WORKER_RUNNER
+    _WORKER_RUNNER = ModelRunner(Path(model_path), explanation_mode, thread_count=1, engine=engine)
+
+
+def _score_part(
+    frame: pd.DataFrame,
+    first_row: int,
+    path: str,
+    output_format: str,
+    with_shap: bool,
+    keep_columns: tuple[str, ...],
+) -> tuple[int, int]:
+    output = score_frame(_WORKER_RUNNER, frame, first_row=first_row, with_shap=with_shap, keep_columns=keep_columns)
+    _write_part(output, Path(path), output_format)
+    return len(output), int((output["status"] == "ok").sum())
+
+
+def run_offline_scoring(
+    config: OfflineScoringConfig,
+    progress: Callable[[OfflineScoringReport], None] | None = None,
+) -> OfflineScoringReport:
+    """Score ``config.input_path`` into one part file per chunk under ``config.output_dir``.
+
+    Chunks whose part file already exists are skipped, so rerunning the same
+    job after an interruption resumes where it stopped. Workers load the model
+    once and write their own part files; only input chunks cross the process
+    boundary.
+    """
+    if config.output_format not in OFFLINE_OUTPUT_FORMATS:
+        raise ValueError(f"Unknown output format: {config.output_format}")
+    if config.chunk_rows < 1:
+        raise ValueError("chunk_rows must be positive")
+
+    global _WORKER_RUNNER
+    runner = ModelRunner(config.model_path, config.explanation_mode, thread_count=1, engine=config.engine)
+    if config.with_shap and (runner.model is None or runner.explanation_mode == "off"):
+        raise ValueError("SHAP columns need a loaded model and an explanation mode other than off")
+    _prepare_output_dir(config, _checkpoint_manifest(config, runner))
+
+    report = OfflineScoringReport(model_version=runner.version)
+    started = time.perf_counter()
+    executor: ProcessPoolExecutor | None = None
+    if config.processes > 0:
+        executor = ProcessPoolExecutor(
+            max_workers=config.processes,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+            initargs=(str(config.model_path), config.explanation_mode, config.engine),
+        )
+    else:
+        _WORKER_RUNNER = runner
+
+    in_flight: set[Future[tuple[int, int]]] = set()
+    max_in_flight = max(1, config.processes) * 2
+
+    def _collect(done: set[Future[tuple[int, int]]]) -> None:
+        for future in done:
+            rows, scored = future.result()
+            report.rows += rows
+            report.scored_rows += scored
+            report.chunks_written += 1
+            report.seconds = time.perf_counter() - started
+            if progress is not None:
+                progress(report)
+
+    try:
+        first_row = 0
+        for index, frame in enumerate(iter_input_chunks(config.input_path, config.chunk_rows)):
+            path = part_path(config.output_dir, index, config.output_format)
+            report.part_files.append(path.name)
+            chunk_first_row, first_row = first_row, first_row + len(frame)
+            if path.exists():
+                report.chunks_skipped += 1
+                continue
+            args = (frame, chunk_first_row, str(path), config.output_format, config.with_shap, config.keep_columns)
+            if executor is None:
+                _collect({_completed(_score_part(*args))})
+                continue
+            in_flight.add(executor.submit(_score_part, *args))
+            if len(in_flight) >= max_in_flight:
+                done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                _collect(done)
+        if in_flight:
+            done, _ = wait(in_flight)
+            _collect(done)
+    finally:
+        if executor is not None:
+            executor.shutdown(wait=True, cancel_futures=True)
+        else:
+            _WORKER_RUNNER = None
+
+    report.seconds = time.perf_counter() - started
+    return report
+
+
+def _completed(result: tuple[int, int]) -> Future[tuple[int, int]]:
+    future: Future[tuple[int, int]] = Future()
+    future.set_result(result)
+    return future
+
+
+def report_as_dict(report: OfflineScoringReport) -> dict[str, Any]:
+    summary = asdict(report)
+    summary.pop("part_files")
+    summary["seconds"] = round(report.seconds, 3)
+    summary["rows_per_second"] = round(report.rows_per_second, 1)
+    return summary
@@ -1,17 +1,58 @@
 from __future__ import annotations
 
+import hashlib
+import json
 import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
 from functools import lru_cache
 from pathlib import Path
-from typing import Any
+from typing import TYPE_CHECKING, Any, Callable, Generic, TypeVar
 
 import numpy as np
-import pandas as pd
-from catboost import CatBoostRegressor, Pool
 from pydantic import BaseModel, ConfigDict, Field
 
+from app.core.observability import log_event
+from app.core.readiness import mark_not_ready, mark_ready
+from app.core.startup import mark_startup_ready, startup_phase
+from app.services.field_specs import FIELD_SPECS, FieldEngine
+from app.services.inference_executor import INFERENCE_THREAD_COUNT
+from app.services.inference_pool import INFERENCE_PROCESSES, ProcessInferencePool, WorkerModelMismatchError
+from app.services.inference_scheduler import InferenceScheduler
+from app.services.model_registry import ModelRegistry
+from app.services.oblivious_trees import ObliviousTreeModel, TreeScoreState
+
+if TYPE_CHECKING:
+    import pandas as pd
+    from catboost import CatBoostRegressor, Pool
+
+# catboost (which pulls in pandas) is imported on first model load, not with the app:
+# the lifespan loads the model in a background thread, so it stays off the cold-start path.
+
 MODEL_NAME = os.getenv("MODEL_NAME", "ironrisk_bi_reg_29n.cbm")
 MODEL_PATH = Path(os.getenv("MODEL_PATH", f"/{MODEL_NAME}"))
+PREDICT_BATCH_MAX_ROWS = int(os.getenv("PREDICT_BATCH_MAX_ROWS", "50000"))
+# "numpy" feeds CatBoost a preallocated float64 matrix; "pandas" keeps the named DataFrame path for A/B checks.
+FEATURE_BACKEND = os.getenv("FEATURE_BACKEND", "numpy").strip().lower()
+FEATURE_BACKENDS = ("numpy", "pandas")
+# "exact" is CatBoost's regular TreeSHAP, "approximate" its Saabas-style path attribution, "off" skips SHAP.
+EXPLANATION_MODE = os.getenv("EXPLANATION_MODE", "exact").strip().lower()
+EXPLANATION_MODES = ("exact", "approximate", "off")
+_SHAP_CALC_TYPES = {"exact": "Regular", "approximate": "Approximate"}
+# "catboost" scores through CatBoost; "numpy" evaluates the exported tree arrays (SHAP is always exact there).
+INFERENCE_ENGINE = os.getenv("INFERENCE_ENGINE", "catboost").strip().lower()
+INFERENCE_ENGINES = ("catboost", "numpy")
+# Result cache for repeated lab panels; PREDICTION_CACHE_SIZE=0 disables it.
+PREDICTION_CACHE_SIZE = int(os.getenv("PREDICTION_CACHE_SIZE", "4096"))
+PREDICTION_CACHE_TTL_SECONDS = float(os.getenv("PREDICTION_CACHE_TTL_SECONDS", "900"))
+# Micro-batching of concurrent single predictions; INFERENCE_BATCH_WINDOW_MS=0 scores each request inline.
+INFERENCE_BATCH_WINDOW_MS = float(os.getenv("INFERENCE_BATCH_WINDOW_MS", "0"))
+INFERENCE_MAX_BATCH_SIZE = int(os.getenv("INFERENCE_MAX_BATCH_SIZE", "64"))
+# Per-tree base states kept for what-if delta scoring, keyed by model version and analysis.
+WHAT_IF_BASE_CACHE_SIZE = int(os.getenv("WHAT_IF_BASE_CACHE_SIZE", "1024"))
+WHAT_IF_BASE_CACHE_TTL_SECONDS = float(os.getenv("WHAT_IF_BASE_CACHE_TTL_SECONDS", "3600"))
 
 FEATURES = [
     "LBXWBCSI", "LBXLYPCT", "LBXMOPCT", "LBXNEPCT", "LBXEOPCT", "LBXBAPCT",
@@ -19,61 +60,16 @@ FEATURES = [
     "LBXPLTSI", "LBXMPSI", "RIAGENDR", "RIDAGEYR", "LBXSGL", "LBXSCH",
     "BMXBMI", "BMXHT", "BMXWT", "BMXWAIST", "BP_SYS", "BP_DIA"
 ]
+FEATURE_INDEX = {feature: position for position, feature in enumerate(FEATURES)}
 
-REQUIRED_FIELDS = [
-    "LBXHGB",
-    "LBXMCVSI",
-    "LBXMCHSI",
-    "LBXRDW",
-    "LBXRBCSI",
-    "LBXHCT",
-    "RIDAGEYR",
-]
-
-RECOMMENDED_FIELDS = [
-    "LBXPLTSI",
-    "LBXWBCSI",
-    "LBXMPSI",
-    "BP_SYS",
-    "BP_DIA",
-    "BMXWAIST",
-    "LBXSCH",
-    "LBXSGL",
-]
-
-
-UNIT_CONVERSIONS = {
-    "LBXSCR": 1 / 88.4,
-    "LBXSUA": 1 / 59.48,
-    "LBXSTB": 1 / 17.1,
-}
+FIELD_ENGINE = FieldEngine(FIELD_SPECS, FEATURES)
+REQUIRED_FIELDS = FIELD_ENGINE.required
+RECOMMENDED_FIELDS = FIELD_ENGINE.recommended
 
 
 def normalize_input(data: dict[str, Any]) -> dict[str, Any]:
-    normalized = dict(data)
-
-    hgb = normalized.get("LBXHGB")
-    if hgb is not None and hgb > 50:
-        normalized["LBXHGB"] = hgb / 10
-
-    mchc = normalized.get("LBXMCHSI")
-    if mchc is not None and mchc > 100:
-        normalized["LBXMCHSI"] = mchc / 10
-
-    glucose = normalized.get("LBXSGL")
-    if glucose is not None and glucose < 25:
-        normalized["LBXSGL"] = glucose * 18.01
-
-    cholesterol = normalized.get("LBXSCH")
-    if cholesterol is not None and cholesterol < 25:
-        normalized["LBXSCH"] = cholesterol * 38.67
-
-    for feature_name, multiplier in UNIT_CONVERSIONS.items():
-        value = normalized.get(feature_name)
-        if value is not None and value > 10:
-            normalized[feature_name] = value * multiplier
-
-    return normalized
+    """Convert values entered in alternative units according to ``FIELD_SPECS``."""
+    return FIELD_ENGINE.normalize(data)
 
 FEATURE_LABELS = {
     "LBXWBCSI": "Лейкоциты (WBC)",
@@ -150,6 +146,20 @@ class PredictResponse(BaseModel):
     explanations: list[dict[str, Any]] = Field(default_factory=list)
 
 
+class PredictBatchRequest(BaseModel):
+    rows: list[PredictRequest] = Field(min_length=1, max_length=PREDICT_BATCH_MAX_ROWS)
+
+
+class PredictBatchResponse(BaseModel):
+    results: list[PredictResponse]
+
+
+_SHOW_IN_EXPLANATIONS = {
+    "LBXRDW", "LBXMC", "LBXMCVSI", "LBXMCHSI",
+    "LBXHGB", "LBXHCT", "LBXRBCSI",
+}
+
+
 def build_explanation_text(feature_name: str, direction: str) -> str:
     if direction == "negative":
         negative_map = {
@@ -175,89 +185,277 @@ def build_explanation_text(feature_name: str, direction: str) -> str:
     )
 
 
+# Explanation label and text per (feature, direction), built once instead of per explanation item.
+EXPLANATION_TEXTS: dict[tuple[str, str], tuple[str, str]] = {
+    (feature, direction): (FEATURE_LABELS.get(feature, feature), build_explanation_text(feature, direction))
+    for feature in FEATURES
+    for direction in ("negative", "positive")
+}
+
+
+def prepare_model_input(payload: dict[str, Any]) -> dict[str, Any]:
+    """Normalize units and derive BMI from height/weight when it is not given."""
+    prepared = normalize_input(payload)
+    if prepared.get("BMXBMI") is None and prepared.get("BMXHT") and prepared.get("BMXWT"):
+        height_m = prepared["BMXHT"] / 100
+        prepared["BMXBMI"] = prepared["BMXWT"] / (height_m * height_m)
+    return prepared
+
+
+class ScoringContext:
+    """Model input for one scoring call, shared by prediction, SHAP and clinical adjustment.
+
+    Payloads are normalized once and the feature matrix is built once; the
+    CatBoost ``Pool`` is created lazily on first use and then reused.
+    ``backend`` selects a float64 NumPy matrix (default) or a named DataFrame;
+    both feed CatBoost identical values.
+    """
+
+    def __init__(
+        self,
+        payloads: list[dict[str, Any]],
+        backend: str | None = None,
+        *,
+        normalized: list[dict[str, Any]] | None = None,
+    ) -> None:
+        backend = backend or FEATURE_BACKEND
+        if backend not in FEATURE_BACKENDS:
+            raise ValueError(f"Unknown feature backend: {backend}")
+        self.backend = backend
+        self.payloads = payloads
+        if normalized is None:
+            normalized = [prepare_model_input(payload) for payload in payloads]
+        self.normalized = normalized
+        if backend == "pandas":
+            self.features: np.ndarray | pd.DataFrame = self._build_frame(self.normalized)
+        else:
+            self.features = self._build_matrix(self.normalized)
+        self._pool: Pool | None = None
+
+    @classmethod
+    def for_payload(cls, payload: dict[str, Any], backend: str | None = None) -> "ScoringContext":
+        return cls([payload], backend)
+
+    @classmethod
+    def from_features(cls, features: np.ndarray) -> "ScoringContext":
+        """Context over an already built NumPy feature matrix; payloads are not kept."""
+        context = cls([], "numpy")
+        context.features = features
+        return context
+
+    def __len__(self) -> int:
+        return len(self.features)
+
+    @property
+    def pool(self) -> Pool:
+        if self._pool is None:
+            from catboost import Pool
+
+            self._pool = Pool(self.features)
+        return self._pool
+
+    def value(self, row: int, feature: str) -> Any:
+        if self.backend == "pandas":
+            return self.features[feature].iloc[row]
+        return self.features[row, FEATURE_INDEX[feature]]
+
+    @staticmethod
+    def _build_matrix(normalized: list[dict[str, Any]]) -> np.ndarray:
+        matrix = np.full((len(normalized), len(FEATURES)), np.nan, dtype=np.float64)
+        for row, values in enumerate(normalized):
+            for feature, value in values.items():
+                position = FEATURE_INDEX.get(feature)
+                if position is not None and value is not None:
+                    matrix[row, position] = value
+        # Gender is accepted by API and can be persisted upstream, but is not sent into model scoring.
+        matrix[:, FEATURE_INDEX["RIAGENDR"]] = np.nan
+        return matrix
+
+    @classmethod
+    def _build_frame(cls, normalized: list[dict[str, Any]]) -> pd.DataFrame:
+        import pandas as pd
+
+        return pd.DataFrame([cls._feature_row(values) for values in normalized], columns=FEATURES)
+
+    @staticmethod
+    def _feature_row(normalized: dict[str, Any]) -> dict[str, Any]:
+        row: dict[str, Any] = {feature: np.nan for feature in FEATURES}
+        row.update(normalized)
+        # Gender is accepted by API and can be persisted upstream, but is not sent into model scoring.
+        row["RIAGENDR"] = np.nan
+        return row
+
+
+def _is_present(value: Any) -> bool:
+    return value is not None and value == value
+
+
 class ModelRunner:
-    def __init__(self, model_path: Path) -> None:
+    def __init__(
+        self,
+        model_path: Path,
+        explanation_mode: str | None = None,
+        thread_count: int = INFERENCE_THREAD_COUNT,
+        engine: str | None = None,
+    ) -> None:
+        explanation_mode = explanation_mode or EXPLANATION_MODE
+        if explanation_mode not in EXPLANATION_MODES:
+            raise ValueError(f"Unknown explanation mode: {explanation_mode}")
+        engine = engine or INFERENCE_ENGINE
+        if engine not in INFERENCE_ENGINES:
+            raise ValueError(f"Unknown inference engine: {engine}")
         self.model_path = model_path
+        self.explanation_mode = explanation_mode
+        self.thread_count = thread_count
+        self.engine = engine
         self.model = self._load_model(model_path)
+        self.model_checksum = self._checksum(model_path) if self.model is not None else "fallback"
+        self.trees = self._load_trees() if engine == "numpy" and self.model is not None else None
+        self._delta_trees: ObliviousTreeModel | None = None
+        self._delta_trees_lock = threading.Lock()
+        # Exact artifact identity reported as PredictResponse.model_name.
+        self.version = f"{model_path.name}@{self.model_checksum[:12]}"
 
     @staticmethod
     def _load_model(path: Path) -> CatBoostRegressor | None:
         if not path.exists():
             return None
+        from catboost import CatBoostRegressor
+
         model = CatBoostRegressor()
         model.load_model(str(path))
         return model
 
+    def _load_trees(self) -> ObliviousTreeModel:
+        """Tree arrays from the ``<model>.trees.npz`` sidecar if it matches the artifact, else exported now."""
+        sidecar = self.model_path.with_suffix(".trees.npz")
+        trees = ObliviousTreeModel.load(sidecar) if sidecar.exists() else None
+        if trees is None or trees.source_checksum != self.model_checksum:
+            trees = ObliviousTreeModel.from_catboost(self.model, self.model_checksum)
+        if trees.feature_names != tuple(FEATURES):
+            raise ValueError(f"Model features do not match the API feature list: {self.model_path}")
+        return trees
+
+    def tree_model(self) -> ObliviousTreeModel | None:
+        """Tree arrays for delta scoring; under the CatBoost engine they are built on first use."""
+        if self.trees is not None or self.model is None:
+            return self.trees
+        with self._delta_trees_lock:
+            if self._delta_trees is None:
+                self._delta_trees = self._load_trees()
+        return self._delta_trees
+
     @staticmethod
-    def _build_dataframe(payload: dict[str, Any]) -> pd.DataFrame:
-        payload = normalize_input(payload)
-        if payload.get("BMXBMI") is None and payload.get("BMXHT") and payload.get("BMXWT"):
-            height_m = payload["BMXHT"] / 100
-            payload["BMXBMI"] = payload["BMXWT"] / (height_m * height_m)
+    def _checksum(path: Path) -> str:
+        digest = hashlib.sha256()
+        with path.open("rb") as model_file:
+            for chunk in iter(lambda: model_file.read(1 << 20), b""):
+                digest.update(chunk)
+        return digest.hexdigest()
 
-        row: dict[str, Any] = {feature: np.nan for feature in FEATURES}
-        row.update(payload)
-        # Gender is accepted by API and can be persisted upstream, but is not sent into model scoring.
-        row["RIAGENDR"] = np.nan
-        return pd.DataFrame([row], columns=FEATURES)
+    @staticmethod
+    def _build_dataframe(payload: dict[str, Any]) -> pd.DataFrame:
+        return ScoringContext.for_payload(payload, backend="pandas").features
 
     @staticmethod
-    def _fallback_bi(df: pd.DataFrame) -> float:
-        return float(
-            0.10 * float(df["LBXHGB"].iloc[0] if pd.notna(df["LBXHGB"].iloc[0]) else 120)
-            + 0.08 * float(df["LBXMCVSI"].iloc[0] if pd.notna(df["LBXMCVSI"].iloc[0]) else 85)
-            - 0.20 * float(df["LBXRDW"].iloc[0] if pd.notna(df["LBXRDW"].iloc[0]) else 14)
-            - 7.0
-        )
+    def _fallback_impacts(context: ScoringContext, row: int = 0) -> dict[str, float]:
+        hgb = context.value(row, "LBXHGB")
+        mcv = context.value(row, "LBXMCVSI")
+        rdw = context.value(row, "LBXRDW")
+        return {
+            "LBXHGB": 0.10 * float(hgb if _is_present(hgb) else 120),
+            "LBXMCVSI": 0.08 * float(mcv if _is_present(mcv) else 85),
+            "LBXRDW": -0.20 * float(rdw if _is_present(rdw) else 14),
+        }
 
-    def predict_iron_index(self, payload: dict[str, Any]) -> float:
-        df = self._build_dataframe(payload)
+    @classmethod
+    def _fallback_bi(cls, context: ScoringContext, row: int = 0) -> float:
+        impacts = cls._fallback_impacts(context, row)
+        return float(impacts["LBXHGB"] + impacts["LBXMCVSI"] + impacts["LBXRDW"] - 7.0)
+
+    def predict_context(self, context: ScoringContext) -> list[float]:
+        """Raw iron index for every row of the context, in one CatBoost call."""
+        if not len(context):
+            return []
 
         if self.model is None:
-            return self._fallback_bi(df)
+            return [self._fallback_bi(context, row) for row in range(len(context))]
 
-        return float(self.model.predict(df)[0])
+        if self.trees is not None:
+            return [float(value) for value in self.trees.predict(np.asarray(context.features, dtype=np.float64))]
 
-    def get_explanations(self, payload: dict[str, Any], top_n: int = 8) -> list[dict[str, Any]]:
-        df = self._build_dataframe(payload)
+        return [float(value) for value in self.model.predict(context.pool, thread_count=self.thread_count)]
+
+    def explain_context(self, context: ScoringContext, top_n: int = 8) -> list[list[dict[str, Any]]]:
+        """Explanations for every row of the context, from one ShapValues call."""
+        if not len(context):
+            return []
+
+        if self.explanation_mode == "off":
+            return [[] for _ in range(len(context))]
 
         if self.model is None:
-            fallback_impacts = {
-                "LBXHGB": 0.10 * float(df["LBXHGB"].iloc[0] if pd.notna(df["LBXHGB"].iloc[0]) else 120),
-                "LBXMCVSI": 0.08 * float(df["LBXMCVSI"].iloc[0] if pd.notna(df["LBXMCVSI"].iloc[0]) else 85),
-                "LBXRDW": -0.20 * float(df["LBXRDW"].iloc[0] if pd.notna(df["LBXRDW"].iloc[0]) else 14),
-            }
-            explanations = []
-            for feature, impact in sorted(fallback_impacts.items(), key=lambda item: item[1]):
-                direction = "negative" if impact < 0 else "positive"
-                explanations.append(
-                    {
-                        "feature": feature,
-                        "label": FEATURE_LABELS.get(feature, feature),
-                        "impact": round(float(impact), 4),
-                        "direction": direction,
-                        "text": build_explanation_text(feature, direction),
-                    }
-                )
-            return explanations
-
-        _SHOW_IN_EXPLANATIONS = {
-            "LBXRDW", "LBXMC", "LBXMCVSI", "LBXMCHSI",
-            "LBXHGB", "LBXHCT", "LBXRBCSI",
-        }
-        shap_values = self.model.get_feature_importance(Pool(df), type="ShapValues")[0]
+            return [self._fallback_explanations(context, row) for row in range(len(context))]
+
+        shap_matrix = self.shap_values(context)
+        return [self._explanations_from_shap(shap_values, top_n) for shap_values in shap_matrix]
+
+    def shap_values(self, context: ScoringContext) -> np.ndarray:
+        """Raw SHAP matrix (features + expected value column) in the runner's explanation mode."""
+        if self.trees is not None:
+            return self.trees.shap_values(np.asarray(context.features, dtype=np.float64))
+        return self.model.get_feature_importance(
+            context.pool,
+            type="ShapValues",
+            shap_calc_type=_SHAP_CALC_TYPES[self.explanation_mode],
+            thread_count=self.thread_count,
+        )
+
+    def predict_iron_index(self, payload: dict[str, Any]) -> float:
+        return self.predict_context(ScoringContext.for_payload(payload))[0]
+
+    def predict_iron_index_batch(self, payloads: list[dict[str, Any]]) -> list[float]:
+        return self.predict_context(ScoringContext(payloads))
+
+    def get_explanations(self, payload: dict[str, Any], top_n: int = 8) -> list[dict[str, Any]]:
+        return self.explain_context(ScoringContext.for_payload(payload), top_n)[0]
+
+    def get_explanations_batch(self, payloads: list[dict[str, Any]], top_n: int = 8) -> list[list[dict[str, Any]]]:
+        return self.explain_context(ScoringContext(payloads), top_n)
+
+    @classmethod
+    def _fallback_explanations(cls, context: ScoringContext, row: int = 0) -> list[dict[str, Any]]:
+        fallback_impacts = cls._fallback_impacts(context, row)
+        explanations = []
+        for feature, impact in sorted(fallback_impacts.items(), key=lambda item: item[1]):
+            direction = "negative" if impact < 0 else "positive"
+            label, text = EXPLANATION_TEXTS[(feature, direction)]
+            explanations.append(
+                {
+                    "feature": feature,
+                    "label": label,
+                    "impact": round(float(impact), 4),
+                    "direction": direction,
+                    "text": text,
+                }
+            )
+        return explanations
+
+    @staticmethod
+    def _explanations_from_shap(shap_values: np.ndarray, top_n: int) -> list[dict[str, Any]]:
         explanations = []
         for feature_name, impact in zip(FEATURES, shap_values[:-1]):
             if abs(impact) < 0.01 or feature_name not in _SHOW_IN_EXPLANATIONS:
                 continue
             direction = "negative" if impact < 0 else "positive"
+            label, text = EXPLANATION_TEXTS[(feature_name, direction)]
             explanations.append(
                 {
                     "feature": feature_name,
-                    "label": FEATURE_LABELS.get(feature_name, feature_name),
+                    "label": label,
                     "impact": round(float(impact), 4),
                     "direction": direction,
-                    "text": build_explanation_text(feature_name, direction),
+                    "text": text,
                 }
             )
 
@@ -267,25 +465,258 @@ class ModelRunner:
         return (negative[:top_n] + positive[:top_n])[:top_n]
 
 
-@lru_cache
+V = TypeVar("V")
+
+
+class PredictionCache(Generic[V]):
+    """Thread-safe LRU cache with a per-entry TTL for scored results (``PredictResponse`` by default).
+
+    Cached values are shared between callers and must be treated as read-only.
+    """
+
+    def __init__(self, max_size: int, ttl_seconds: float, clock: Callable[[], float] = time.monotonic) -> None:
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self._clock = clock
+        self._entries: OrderedDict[str, tuple[float, V]] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_size > 0
+
+    def get(self, key: str) -> V | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            expires_at, response = entry
+            if expires_at <= self._clock():
+                del self._entries[key]
+                self.expirations += 1
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return response
+
+    def put(self, key: str, response: V) -> None:
+        if not self.enabled:
+            return
+        with self._lock:
+            self._entries[key] = (self._clock() + self.ttl_seconds, response)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return {
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+            }
+
+
+_PREDICTION_CACHE: PredictionCache[PredictResponse] = PredictionCache(PREDICTION_CACHE_SIZE, PREDICTION_CACHE_TTL_SECONDS)
+
+
+def get_prediction_cache() -> PredictionCache:
+    return _PREDICTION_CACHE
+
+
+def _cache_key_prefix(runner: ModelRunner) -> bytes:
+    return json.dumps(
+        [MODEL_NAME, runner.version, runner.model_checksum, runner.explanation_mode],
+        separators=(",", ":"),
+    ).encode("utf-8")
+
+
+def feature_row_cache_keys(rows: np.ndarray, runner: ModelRunner) -> list[str]:
+    """Cache keys for normalized feature rows (``FIELD_ENGINE.feature_row`` layout)."""
+    prefix = _cache_key_prefix(runner)
+    rows = np.ascontiguousarray(rows, dtype=np.float64)
+    return [hashlib.sha256(prefix + row.tobytes()).hexdigest() for row in rows]
+
+
+def prediction_cache_key(normalized: dict[str, Any], runner: ModelRunner) -> str:
+    """Hash of the normalized model features and the model that would score them.
+
+    Everything a response depends on (features, gender, which recommended
+    fields are present) is in the feature row, so single and batch scoring
+    share cache entries.
+    """
+    return feature_row_cache_keys(FIELD_ENGINE.feature_row(normalized)[None, :], runner)[0]
+
+
+# Synthetic panels covering the SI/conventional unit branches and both BMI inputs.
+WARMUP_PAYLOADS: list[dict[str, Any]] = [
+    {
+        "LBXHGB": 120, "LBXMCVSI": 79, "LBXMCHSI": 330, "LBXRDW": 15.2, "LBXRBCSI": 4.6,
+        "LBXHCT": 37, "RIDAGEYR": 31, "BMXBMI": 22.5, "RIAGENDR": 2,
+    },
+    {
+        "LBXHGB": 14.5, "LBXMCVSI": 90, "LBXMCHSI": 34, "LBXRDW": 12.8, "LBXRBCSI": 5.0,
+        "LBXHCT": 44, "RIDAGEYR": 45, "BMXHT": 180, "BMXWT": 82, "RIAGENDR": 1,
+        "LBXSGL": 5.4, "LBXSCH": 4.9, "LBXPLTSI": 250, "LBXWBCSI": 6.1,
+    },
+    {
+        "LBXHGB": 98, "LBXMCVSI": 71, "LBXMCHSI": 29, "LBXRDW": 17.9, "LBXRBCSI": 4.1,
+        "LBXHCT": 31, "RIDAGEYR": 27, "BMXBMI": 19.0,
+    },
+]
+
+
+def warm_up_runner(runner: ModelRunner) -> None:
+    """Run synthetic single-row and batch scoring so the first real request pays no init cost."""
+    for payload in WARMUP_PAYLOADS:
+        context = ScoringContext.for_payload(payload)
+        runner.predict_context(context)
+        runner.explain_context(context)
+    batch = ScoringContext(WARMUP_PAYLOADS)
+    runner.predict_context(batch)
+    runner.explain_context(batch)
+
+
+def load_and_warm_up_model() -> bool:
+    """Load the model eagerly, warm it up and flip readiness; used by the app lifespan."""
+    mark_not_ready("warming_up")
+    started = time.perf_counter()
+    try:
+        with startup_phase("model_load"):
+            runner = get_runner()
+        with startup_phase("model_warmup"):
+            warm_up_runner(runner)
+            start_process_pool(runner)
+            get_registry().start_watching()
+    except Exception as exc:
+        mark_not_ready("warmup_failed")
+        log_event("model_warmup_failed", error=str(exc))
+        return False
+    mark_ready()
+    mark_startup_ready()
+    log_event(
+        "model_warmup_completed",
+        model_name=runner.version,
+        model_loaded=runner.model is not None,
+        explanation_mode=runner.explanation_mode,
+        duration_ms=round((time.perf_counter() - started) * 1000, 1),
+    )
+    return True
+
+
+def preload_model() -> ModelRunner:
+    """Load and warm the model in a pre-fork server master so forked workers share it copy-on-write.
+
+    Starts no threads or processes: the process pool and the registry watcher
+    belong to each worker and start in its lifespan, where ``get_runner()``
+    then returns the inherited runner.
+    """
+    with startup_phase("model_load"):
+        runner = get_runner()
+    with startup_phase("model_warmup"):
+        warm_up_runner(runner)
+        # Tree arrays for what-if delta scoring are built once here instead of once per worker.
+        runner.tree_model()
+    return runner
+
+
+_PROCESS_POOL: ProcessInferencePool | None = None
+
+
+def start_process_pool(runner: ModelRunner) -> ProcessInferencePool | None:
+    """Start INFERENCE_PROCESSES scoring workers for ``runner``; no-op when set to 0."""
+    global _PROCESS_POOL
+    if INFERENCE_PROCESSES <= 0 or _PROCESS_POOL is not None:
+        return _PROCESS_POOL
+    try:
+        _PROCESS_POOL = ProcessInferencePool(runner, INFERENCE_PROCESSES).start()
+    except WorkerModelMismatchError as exc:
+        # The model file changed since ``runner`` loaded it; score in-process until the next swap.
+        log_event("inference_pool_refused", processes=INFERENCE_PROCESSES, error=str(exc))
+    return _PROCESS_POOL
+
+
+def shutdown_process_pool() -> None:
+    global _PROCESS_POOL
+    process_pool, _PROCESS_POOL = _PROCESS_POOL, None
+    if process_pool is not None:
+        process_pool.shutdown()
+
+
+def _on_model_swap(runner: ModelRunner) -> None:
+    # A new runner means a possibly different model; drop every result scored by the old one.
+    _PREDICTION_CACHE.clear()
+    _WHAT_IF_BASES.clear()
+    if _PROCESS_POOL is not None:
+        # Spawning and warming the workers takes seconds; the swap (and an admin request that
+        # triggered it) does not wait. Until they are replaced, the new version is scored in-process.
+        _PROCESS_POOL.restart_in_background(runner)
+
+
+_REGISTRY: ModelRegistry | None = None
+# Building a registry loads and warms the model, so concurrent first calls must build only one.
+_REGISTRY_LOCK = threading.Lock()
+
+
+def get_registry() -> ModelRegistry:
+    global _REGISTRY
+    registry = _REGISTRY
+    if registry is None:
+        with _REGISTRY_LOCK:
+            if _REGISTRY is None:
+                _REGISTRY = ModelRegistry(MODEL_PATH, loader=ModelRunner, warm_up=warm_up_runner, on_swap=_on_model_swap)
+            registry = _REGISTRY
+    return registry
+
+
+def reset_registry() -> None:
+    """Drop the registry (and stop its watcher); the next call builds one from MODEL_PATH."""
+    global _REGISTRY
+    with _REGISTRY_LOCK:
+        registry, _REGISTRY = _REGISTRY, None
+    if registry is not None:
+        registry.stop_watching()
+
+
 def get_runner() -> ModelRunner:
-    return ModelRunner(MODEL_PATH)
+    """The runner that should serve the next request; grab it once per request."""
+    return get_registry().active()
+
+
+# Resetting the runner (e.g. after changing MODEL_PATH) means rebuilding the registry.
+get_runner.cache_clear = reset_registry  # type: ignore[attr-defined]
+
+
+def _active_model_name() -> str:
+    """The active runner's version, as ok responses report it; MODEL_NAME while no model is loaded.
+
+    Rejecting a payload must not be what loads the model (offline scoring workers never load the default one).
+    """
+    if _REGISTRY is None:
+        return MODEL_NAME
+    return get_runner().version
 
 
 def resolve_missing_required(payload: dict[str, Any]) -> list[str]:
-    missing = [name for name in REQUIRED_FIELDS if payload.get(name) is None]
-    has_bmi = payload.get("BMXBMI") is not None
-    has_hw = payload.get("BMXHT") is not None and payload.get("BMXWT") is not None
-    if not has_bmi and not has_hw:
-        missing.append("BMXBMI_or_BMXHT_BMXWT")
-    return missing
+    return FIELD_ENGINE.missing_required(payload)
 
 
 def resolve_confidence(payload: dict[str, Any], missing_required: list[str]) -> str:
-    if missing_required:
-        return "low"
-    rec_present = sum(payload.get(name) is not None for name in RECOMMENDED_FIELDS)
-    return "high" if rec_present >= len(RECOMMENDED_FIELDS) / 2 else "medium"
+    return FIELD_ENGINE.confidence(payload, missing_required)
 
 
 def resolve_risk_profile(iron_index: float) -> tuple[str, str]:
@@ -294,26 +725,7 @@ def resolve_risk_profile(iron_index: float) -> tuple[str, str]:
 
 
 def validate_payload_values(payload: dict[str, Any]) -> list[dict[str, str]]:
-    invalid_fields: list[dict[str, str]] = []
-    for field_name, value in payload.items():
-        if value is None or field_name not in FEATURES:
-            continue
-
-        if isinstance(value, (int, float)):
-            numeric = float(value)
-            if not np.isfinite(numeric):
-                invalid_fields.append({"field": field_name, "reason": "must_be_finite_number"})
-                continue
-            if numeric < 0:
-                invalid_fields.append({"field": field_name, "reason": "must_be_non_negative"})
-                continue
-            if field_name in {"BMXBMI", "BMXHT", "BMXWT", "RIDAGEYR"} and numeric <= 0:
-                invalid_fields.append({"field": field_name, "reason": "must_be_positive"})
-            continue
-
-        invalid_fields.append({"field": field_name, "reason": "must_be_number"})
-
-    return invalid_fields
+    return FIELD_ENGINE.validate(payload)
 
 
 def build_needs_input_response(
@@ -324,10 +736,11 @@ def build_needs_input_response(
     message: str,
     invalid_fields: list[dict[str, str]] | None = None,
 ) -> PredictResponse:
-    return PredictResponse(
+    # Built from trusted values, so validation is skipped.
+    return PredictResponse.model_construct(
         status="needs_input",
         confidence=confidence,
-        model_name=MODEL_NAME,
+        model_name=_active_model_name(),
         error_code=error_code,
         message=message,
         invalid_fields=invalid_fields or [],
@@ -359,46 +772,25 @@ def resolve_action_from_tier(tier: str) -> str:
     return actions[tier]
 
 
-_GENDER_REFS: dict[int, dict[str, tuple[float, float]]] = {
-    1: {"LBXHGB": (13.0, 17.0), "LBXRBCSI": (4.0, 5.0), "LBXHCT": (40.0, 48.0)},
-    2: {"LBXHGB": (12.0, 16.0), "LBXRBCSI": (3.9, 4.7), "LBXHCT": (36.0, 42.0)},
-}
-_SHARED_REFS: dict[str, tuple[float, float]] = {
-    "LBXMCVSI": (80.0, 100.0),
-    "LBXMCHSI": (30.0, 38.0),
-    "LBXRDW": (11.5, 14.5),
-}
-
-
-def _clinical_adjustment(iron_index: float, payload: dict[str, Any]) -> float:
+def _clinical_adjustment(
+    iron_index: float,
+    payload: dict[str, Any],
+    normalized: dict[str, Any] | None = None,
+) -> float:
     """Shift iron_index down when CBC markers fall below gender-specific references.
 
     The CatBoost model was trained exclusively on women 12-49 and scores with
     gender set to NaN, so it cannot distinguish male-range from female-range
     normals.  This post-hoc correction penalises the index proportionally to
     how far each marker lies below (or above, for RDW) its gender-aware
-    reference boundary.
-    """
-    gender = payload.get("RIAGENDR")
-    refs = {**_SHARED_REFS}
-    if gender in _GENDER_REFS:
-        refs.update(_GENDER_REFS[gender])
-
-    normalized = normalize_input(payload)
-    penalty = 0.0
-
-    for key, (lo, hi) in refs.items():
-        val = normalized.get(key)
-        if val is None:
-            continue
-        if key == "LBXRDW":
-            if val > hi:
-                penalty += (val - hi) / hi * 4.0
-        else:
-            if val < lo:
-                penalty += (lo - val) / lo * 4.0
+    reference boundary; the intervals live in ``FIELD_SPECS``.
 
-    return iron_index - penalty
+    ``normalized`` lets callers that already hold a ``ScoringContext`` skip
+    re-normalizing the payload.
+    """
+    if normalized is None:
+        normalized = normalize_input(payload)
+    return iron_index - FIELD_ENGINE.clinical_penalty(payload.get("RIAGENDR"), normalized)
 
 
 def get_display_risk(iron_index: float) -> float:
@@ -406,40 +798,280 @@ def get_display_risk(iron_index: float) -> float:
     return round(float(risk * 100), 1)
 
 
-def predict_payload(data: dict[str, Any]) -> PredictResponse:
+def _precheck_payload(data: dict[str, Any]) -> tuple[PredictResponse | None, str]:
+    """Return a needs_input response for unscorable payloads, plus the resolved confidence."""
     invalid_fields = validate_payload_values(data)
     if invalid_fields:
-        return build_needs_input_response(
-            confidence="low",
-            missing_required_fields=[],
-            error_code="invalid_payload",
-            message="Payload contains invalid numeric values",
-            invalid_fields=invalid_fields,
+        return (
+            build_needs_input_response(
+                confidence="low",
+                missing_required_fields=[],
+                error_code="invalid_payload",
+                message="Payload contains invalid numeric values",
+                invalid_fields=invalid_fields,
+            ),
+            "low",
         )
 
     missing_required = resolve_missing_required(data)
     confidence = resolve_confidence(data, missing_required)
 
     if missing_required:
-        return build_needs_input_response(
-            confidence=confidence,
-            missing_required_fields=missing_required,
-            error_code="needs_input",
-            message="Required fields are missing",
+        return (
+            build_needs_input_response(
+                confidence=confidence,
+                missing_required_fields=missing_required,
+                error_code="needs_input",
+                message="Required fields are missing",
+            ),
+            confidence,
         )
 
-    runner = get_runner()
-    raw_iron_index = runner.predict_iron_index(data)
-    iron_index = _clinical_adjustment(raw_iron_index, data)
+    return None, confidence
+
+
+def needs_input_response(data: dict[str, Any]) -> PredictResponse | None:
+    """The needs_input response the API would return for ``data``, or None when it can be scored."""
+    return _precheck_payload(data)[0]
+
+
+def _build_ok_response(
+    data: dict[str, Any],
+    *,
+    confidence: str,
+    raw_iron_index: float,
+    explanations: list[dict[str, Any]],
+    model_name: str,
+    normalized: dict[str, Any] | None = None,
+    penalty: float | None = None,
+) -> PredictResponse:
+    if penalty is None:
+        iron_index = _clinical_adjustment(raw_iron_index, data, normalized)
+    else:
+        iron_index = raw_iron_index - penalty
     risk_tier, clinical_action = resolve_risk_profile(iron_index)
 
-    return PredictResponse(
+    return PredictResponse.model_construct(
         status="ok",
         confidence=confidence,
-        model_name=MODEL_NAME,
-        iron_index=round(iron_index, 2),
+        model_name=model_name,
+        iron_index=round(float(iron_index), 2),
         risk_percent=get_display_risk(iron_index),
         risk_tier=risk_tier,
         clinical_action=clinical_action,
-        explanations=runner.get_explanations(data),
+        explanations=explanations,
     )
+
+
+@dataclass(slots=True)
+class PreparedRow:
+    """A validated payload that still needs model scoring."""
+
+    data: dict[str, Any]
+    confidence: str
+    normalized: dict[str, Any]
+    cache_key: str | None
+    # The runner the cache key was computed for; the row must be scored by it too.
+    runner: ModelRunner
+
+
+def _score_context(runner: ModelRunner, context: ScoringContext) -> tuple[Any, list[list[dict[str, Any]]]]:
+    """Raw iron_index values and explanations, in the process pool when it serves this model."""
+    process_pool = _PROCESS_POOL
+    if process_pool is not None and process_pool.version == runner.version:
+        try:
+            return process_pool.score(np.asarray(context.features, dtype=np.float64))
+        except WorkerModelMismatchError:
+            pass  # respawned workers loaded a changed model file; the pool is refused
+    return runner.predict_context(context), runner.explain_context(context)
+
+
+def _score_features(runner: ModelRunner, features: np.ndarray) -> tuple[Any, list[list[dict[str, Any]]]]:
+    return _score_context(runner, ScoringContext.from_features(features))
+
+
+def _score_prepared(runner: ModelRunner, prepared: list[PreparedRow]) -> list[PredictResponse]:
+    """Score validated cache misses with one predict call and one ShapValues call."""
+    context = ScoringContext(
+        [row.data for row in prepared],
+        normalized=[row.normalized for row in prepared],
+    )
+    raw_indices, explanations = _score_context(runner, context)
+    responses = []
+    for position, row in enumerate(prepared):
+        response = _build_ok_response(
+            row.data,
+            confidence=row.confidence,
+            raw_iron_index=raw_indices[position],
+            explanations=explanations[position],
+            model_name=runner.version,
+            normalized=row.normalized,
+        )
+        if row.cache_key is not None:
+            _PREDICTION_CACHE.put(row.cache_key, response)
+        responses.append(response)
+    return responses
+
+
+def _score_scheduled_batch(prepared: list[PreparedRow]) -> list[PredictResponse]:
+    # A model swap inside the batch window leaves rows of both runners in one batch.
+    groups: dict[int, list[int]] = {}
+    for position, row in enumerate(prepared):
+        groups.setdefault(id(row.runner), []).append(position)
+    responses: list[PredictResponse | None] = [None] * len(prepared)
+    for positions in groups.values():
+        rows = [prepared[position] for position in positions]
+        for position, response in zip(positions, _score_prepared(rows[0].runner, rows)):
+            responses[position] = response
+    return responses  # type: ignore[return-value]
+
+
+@lru_cache
+def get_inference_scheduler() -> InferenceScheduler[PreparedRow, PredictResponse] | None:
+    """Micro-batching scheduler for single predictions, or None when INFERENCE_BATCH_WINDOW_MS is 0."""
+    if INFERENCE_BATCH_WINDOW_MS <= 0:
+        return None
+    return InferenceScheduler(
+        _score_scheduled_batch,
+        window_seconds=INFERENCE_BATCH_WINDOW_MS / 1000,
+        max_batch_size=INFERENCE_MAX_BATCH_SIZE,
+    )
+
+
+def shutdown_inference_scheduler() -> None:
+    scheduler = get_inference_scheduler()
+    if scheduler is not None:
+        scheduler.stop()
+    get_inference_scheduler.cache_clear()
+
+
+def _lookup_cached(runner: ModelRunner, data: dict[str, Any], confidence: str) -> PredictResponse | PreparedRow:
+    normalized = prepare_model_input(data)
+    cache_key = prediction_cache_key(normalized, runner) if _PREDICTION_CACHE.enabled else None
+    if cache_key is not None:
+        cached = _PREDICTION_CACHE.get(cache_key)
+        if cached is not None:
+            return cached
+    return PreparedRow(data=data, confidence=confidence, normalized=normalized, cache_key=cache_key, runner=runner)
+
+
+def prepare_prediction(data: dict[str, Any], runner: ModelRunner | None = None) -> PredictResponse | PreparedRow:
+    """Validation and cache lookup of ``predict_payload``: a finished response, or the row left to score.
+
+    The row carries ``runner`` (default: the active one), which must also score it.
+    """
+    rejected, confidence = _precheck_payload(data)
+    if rejected is not None:
+        return rejected
+    return _lookup_cached(runner or get_runner(), data, confidence)
+
+
+def predict_payload(data: dict[str, Any]) -> PredictResponse:
+    # One runner for the cache lookup and the scoring, even if a swap happens in between.
+    runner = get_runner()
+    prepared = prepare_prediction(data, runner)
+    if isinstance(prepared, PredictResponse):
+        return prepared
+
+    scheduler = get_inference_scheduler()
+    if scheduler is not None:
+        return scheduler.run(prepared)
+    return _score_prepared(runner, [prepared])[0]
+
+
+_WHAT_IF_BASES: PredictionCache[TreeScoreState] = PredictionCache(WHAT_IF_BASE_CACHE_SIZE, WHAT_IF_BASE_CACHE_TTL_SECONDS)
+
+
+@dataclass(frozen=True)
+class WhatIfScore:
+    response: PredictResponse
+    changed_features: list[str]
+    trees_rescored: int
+    trees_total: int
+
+
+def predict_what_if(base_data: dict[str, Any], changes: dict[str, Any], *, base_key: str) -> WhatIfScore:
+    """Score ``base_data`` with ``changes`` applied, rescoring only trees that split on changed features.
+
+    The per-tree state of the base payload is cached under ``base_key`` and the
+    model version, so repeated tweaks of one analysis cost only the affected
+    trees. Explanations are exact TreeSHAP regardless of EXPLANATION_MODE
+    (except "off"). Without tree arrays (fallback model) the payload is scored in full.
+    """
+    data = {**base_data, **changes}
+    rejected, confidence = _precheck_payload(data)
+    if rejected is not None:
+        return WhatIfScore(rejected, [], 0, 0)
+
+    runner = get_runner()
+    normalized = prepare_model_input(data)
+    trees = runner.tree_model()
+    if trees is None:
+        response = _score_prepared(runner, [PreparedRow(data=data, confidence=confidence, normalized=normalized, cache_key=None, runner=runner)])[0]
+        return WhatIfScore(response, [], 0, 0)
+
+    state_key = f"{runner.version}:{base_key}"
+    base_state = _WHAT_IF_BASES.get(state_key)
+    if base_state is None:
+        base_state = trees.row_state(ScoringContext([base_data]).features[0])
+        _WHAT_IF_BASES.put(state_key, base_state)
+
+    row = ScoringContext([data], normalized=[normalized]).features[0]
+    state, changed, rescored = trees.update_state(base_state, row)
+    explanations = [] if runner.explanation_mode == "off" else runner._explanations_from_shap(state.shap, 8)
+    response = _build_ok_response(
+        data,
+        confidence=confidence,
+        raw_iron_index=trees.prediction(state),
+        explanations=explanations,
+        model_name=runner.version,
+        normalized=normalized,
+    )
+    return WhatIfScore(response, [FEATURES[feature] for feature in changed], len(rescored), trees.tree_count)
+
+
+def predict_batch_payloads(rows: list[dict[str, Any]]) -> list[PredictResponse]:
+    """Score many payloads at once.
+
+    Validation, unit normalization, BMI derivation and the clinical adjustment
+    run column-wise over the whole batch through ``FIELD_ENGINE``; only rejected
+    rows go through the per-payload path to build their needs_input response.
+    Rows that are not in the result cache are scored with one vectorized predict
+    call and one ShapValues call. Responses are returned in input order.
+    """
+    responses: list[PredictResponse | None] = [None] * len(rows)
+    batch = FIELD_ENGINE.prepare_rows(rows)
+    for position in np.flatnonzero(~batch.scorable):
+        responses[position] = _precheck_payload(rows[position])[0]
+
+    runner = get_runner()
+    scorable = np.flatnonzero(batch.scorable)
+    cache_keys: list[str | None] = [None] * len(scorable)
+    if _PREDICTION_CACHE.enabled and len(scorable):
+        cache_keys = feature_row_cache_keys(FIELD_ENGINE.feature_rows(batch, scorable), runner)
+
+    pending: list[int] = []
+    for index, (position, cache_key) in enumerate(zip(scorable, cache_keys)):
+        cached = _PREDICTION_CACHE.get(cache_key) if cache_key is not None else None
+        if cached is not None:
+            responses[position] = cached
+        else:
+            pending.append(index)
+
+    if pending:
+        positions = scorable[pending]
+        raw_indices, explanations = _score_features(runner, FIELD_ENGINE.model_features(batch, positions))
+        for offset, (index, position) in enumerate(zip(pending, positions)):
+            response = _build_ok_response(
+                rows[position],
+                confidence=str(batch.confidence[position]),
+                raw_iron_index=float(raw_indices[offset]),
+                explanations=explanations[offset],
+                model_name=runner.version,
+                penalty=float(batch.penalty[position]),
+            )
+            if cache_keys[index] is not None:
+                _PREDICTION_CACHE.put(cache_keys[index], response)
+            responses[position] = response
+
+    return responses  # type: ignore[return-value]
@@ -0,0 +1,82 @@
+from __future__ import annotations
+
+import json
+from typing import Any, Callable
+
+from fastapi.responses import JSONResponse
+
+from app.services.prediction_service import EXPLANATION_TEXTS, PredictBatchResponse, PredictResponse
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - exercised only without orjson installed
+    orjson = None
+
+
+def _stdlib_dumps(content: Any) -> bytes:
+    # Same settings as Starlette's JSONResponse, so both paths emit identical bytes.
+    return json.dumps(content, ensure_ascii=False, allow_nan=False, separators=(",", ":")).encode("utf-8")
+
+
+dumps: Callable[[Any], bytes] = orjson.dumps if orjson is not None else _stdlib_dumps
+
+
+def _explanation_fragments(feature: str, direction: str, label: str, text: str) -> tuple[bytes, bytes, str, str]:
+    """JSON around the ``impact`` value of one explanation item, encoded once."""
+    prefix = dumps({"feature": feature, "label": label})[:-1] + b',"impact":'
+    suffix = b"," + dumps({"direction": direction, "text": text})[1:]
+    return prefix, suffix, label, text
+
+
+_EXPLANATION_FRAGMENTS = {
+    key: _explanation_fragments(*key, label, text) for key, (label, text) in EXPLANATION_TEXTS.items()
+}
+
+
+def _encode_explanation(item: dict[str, Any]) -> bytes:
+    fragments = _EXPLANATION_FRAGMENTS.get((item.get("feature"), item.get("direction")))
+    impact = item.get("impact")
+    # Only items built from EXPLANATION_TEXTS (same string objects) take the pre-encoded path.
+    if (
+        fragments is None
+        or len(item) != 5
+        or item.get("label") is not fragments[2]
+        or item.get("text") is not fragments[3]
+        or type(impact) is not float
+    ):
+        return dumps(item)
+    return fragments[0] + float.__repr__(impact).encode() + fragments[1]
+
+
+def encode_predict_response(response: PredictResponse) -> bytes:
+    """JSON for one ``PredictResponse`` without re-validation or a ``model_dump`` round trip.
+
+    Explanation items reuse pre-encoded feature/label/direction/text fragments;
+    only ``impact`` is formatted per item. The output is byte-identical to
+    FastAPI's ``response_model`` path.
+    """
+    fields = dict(response.__dict__)
+    explanations = fields.pop("explanations")
+    head = dumps(fields)
+    if not explanations:
+        return head[:-1] + b',"explanations":[]}'
+    return head[:-1] + b',"explanations":[' + b",".join(map(_encode_explanation, explanations)) + b"]}"
+
+
+def encode_predict_batch_response(response: PredictBatchResponse) -> bytes:
+    return b'{"results":[' + b",".join(map(encode_predict_response, response.results)) + b"]}"
+
+
+class PredictJSONResponse(JSONResponse):
+    """Renders prediction models through the pre-encoded path; anything else via orjson.
+
+    Returning it from a route bypasses ``response_model`` validation and
+    serialization; the decorator's ``response_model`` still documents the schema.
+    """
+
+    def render(self, content: Any) -> bytes:
+        if isinstance(content, PredictResponse):
+            return encode_predict_response(content)
+        if isinstance(content, PredictBatchResponse):
+            return encode_predict_batch_response(content)
+        return dumps(content)
@@ -0,0 +1,54 @@
+"""Analysis job worker: scores queued analyses outside the API processes.
+
+Run from backend/ (one or more processes, next to the API with ANALYSIS_JOBS_INLINE=0):
+    python -m app.worker --concurrency 2
+"""
+from __future__ import annotations
+
+import argparse
+import logging
+import os
+import signal
+
+from app.db.database import init_db
+from app.services.analysis_queue import (
+    ANALYSIS_QUEUE_POLL_SECONDS,
+    ANALYSIS_WORKER_BATCH_SIZE,
+    ANALYSIS_WORKER_CONCURRENCY,
+)
+from app.services.analysis_worker import AnalysisWorker
+from app.services.analysis_writes import shutdown_analysis_writer
+from app.services.inference_executor import shutdown_inference_executor
+from app.services.prediction_service import load_and_warm_up_model, shutdown_inference_scheduler, shutdown_process_pool
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--concurrency", type=int, default=ANALYSIS_WORKER_CONCURRENCY)
+    parser.add_argument("--poll-seconds", type=float, default=ANALYSIS_QUEUE_POLL_SECONDS)
+    parser.add_argument("--batch-size", type=int, default=ANALYSIS_WORKER_BATCH_SIZE, help="jobs scored together per claim")
+    parser.add_argument("--drain", action="store_true", help="run queued jobs once and exit instead of polling")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=os.getenv('LOG_LEVEL', 'INFO'))
+    init_db()
+    load_and_warm_up_model()
+
+    worker = AnalysisWorker(args.concurrency, args.poll_seconds, batch_size=args.batch_size)
+    # SIGTERM (docker stop, deploys) lets in-flight jobs finish before the process exits.
+    signal.signal(signal.SIGTERM, lambda *_: worker.stop())
+    signal.signal(signal.SIGINT, lambda *_: worker.stop())
+    try:
+        if args.drain:
+            worker.drain()
+        else:
+            worker.run()
+    finally:
+        shutdown_inference_scheduler()
+        shutdown_inference_executor()
+        shutdown_process_pool()
+        shutdown_analysis_writer()
+
+
+if __name__ == "__main__":
+    main()
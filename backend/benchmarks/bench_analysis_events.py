@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+How clients learn that an analysis finished: polling GET /analyses/{id}
+versus the SSE stream (GET /analyses/{id}/events) versus long-poll
+(GET /analyses/{id}/wait). A uvicorn server enqueues only
+(ANALYSIS_JOBS_INLINE=0); this process plays the separate worker, so the
+server sees completions through its DB poll. Every request of the polling
+and long-poll clients authenticates (a DB read) and reads the status.
+
+Run from backend/:
+    python benchmarks/bench_analysis_events.py --analyses 50 --queue-seconds 5
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import signal
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import uuid
+from pathlib import Path
+
+import httpx
+
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(BACKEND_DIR))
+
+_TMP = tempfile.TemporaryDirectory()
+os.environ["DATABASE_URL"] = f"sqlite:///{_TMP.name}/bench.db"
+os.environ.setdefault("MODEL_PATH", str(BACKEND_DIR / "ironrisk_bi_reg_29n.cbm"))
+
+from app.db.database import init_db  # noqa: E402
+from app.services.analysis_worker import AnalysisWorker  # noqa: E402
+from app.services.prediction_service import load_and_warm_up_model  # noqa: E402
+
+ANALYSIS = {
+    "upload": {"filename": "report.pdf", "content_type": "application/pdf", "size_bytes": 128000, "source": "web"},
+    "lab": {"LBXHGB": 120, "LBXMCVSI": 79, "LBXMCHSI": 330, "LBXRDW": 15.2, "LBXRBCSI": 4.6, "LBXHCT": 37, "RIDAGEYR": 31, "BMXBMI": 22.5},
+}
+
+
+def free_port() -> int:
+    with socket.socket() as probe:
+        probe.bind(("127.0.0.1", 0))
+        return probe.getsockname()[1]
+
+
+async def poll(client: httpx.AsyncClient, analysis_id: str, interval: float) -> int:
+    requests = 0
+    while True:
+        requests += 1
+        if (await client.get(f"/analyses/{analysis_id}")).json()["status"] == "completed":
+            return requests
+        await asyncio.sleep(interval)
+
+
+async def stream(client: httpx.AsyncClient, analysis_id: str, _interval: float) -> int:
+    async with client.stream("GET", f"/analyses/{analysis_id}/events") as response:
+        async for line in response.aiter_lines():
+            if line.startswith("data: ") and '"status":"completed"' in line:
+                return 1
+    raise RuntimeError("stream closed before completion")
+
+
+async def long_poll(client: httpx.AsyncClient, analysis_id: str, _interval: float) -> int:
+    requests, stage = 0, None
+    while True:
+        requests += 1
+        params = {"timeout": 25} if stage is None else {"timeout": 25, "progress_stage": stage}
+        body = (await client.get(f"/analyses/{analysis_id}/wait", params=params)).json()
+        if body["status"] == "completed":
+            return requests
+        stage = body["progress_stage"]
+
+
+async def measure(base_url: str, mode, analyses: int, queue_seconds: float, interval: float) -> tuple[float, list[float]]:
+    limits = httpx.Limits(max_connections=analyses * 2)
+    async with httpx.AsyncClient(base_url=base_url, timeout=60, limits=limits) as client:
+        register = await client.post("/auth/register", json={"email": f"bench-{uuid.uuid4().hex}@example.com", "password": "password123"})
+        client.headers["X-Authorization"] = f"Bearer {register.json()['access_token']}"
+        analysis_ids = [(await client.post("/analyses", json=ANALYSIS)).json()["analysis_id"] for _ in range(analyses)]
+
+        seen_at: list[float] = []
+
+        async def _client(analysis_id: str) -> int:
+            requests = await mode(client, analysis_id, interval)
+            seen_at.append(time.perf_counter())
+            return requests
+
+        tasks = [asyncio.create_task(_client(analysis_id)) for analysis_id in analysis_ids]
+        await asyncio.sleep(queue_seconds)  # jobs wait in the queue
+        await asyncio.to_thread(AnalysisWorker(worker_id="bench").drain)
+        finished = time.perf_counter()
+        requests = await asyncio.gather(*tasks)
+    return sum(requests) / analyses, [max(0.0, at - finished) * 1000 for at in seen_at]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--analyses", type=int, default=50)
+    parser.add_argument("--queue-seconds", type=float, default=5.0, help="how long jobs wait before the worker runs")
+    parser.add_argument("--poll-interval", type=float, default=1.0)
+    parser.add_argument("--db-poll-seconds", type=float, default=0.5, help="server-side ANALYSIS_EVENTS_DB_POLL_SECONDS")
+    args = parser.parse_args()
+
+    init_db()
+    load_and_warm_up_model()
+    port = free_port()
+    env = {**os.environ, "ANALYSIS_JOBS_INLINE": "0", "ANALYSIS_EVENTS_DB_POLL_SECONDS": str(args.db_poll_seconds), "LOG_LEVEL": "WARNING"}
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(port), "--log-level", "warning"],
+        cwd=BACKEND_DIR,
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    base_url = f"http://127.0.0.1:{port}"
+    try:
+        deadline = time.monotonic() + 60
+        while True:
+            try:
+                if httpx.get(f"{base_url}/ready").status_code == 200:
+                    break
+            except httpx.TransportError:
+                pass
+            if time.monotonic() > deadline:
+                raise RuntimeError("server did not become ready")
+            time.sleep(0.2)
+
+        print(f"\n{args.analyses} analyses, queued {args.queue_seconds:.0f} s, polling every {args.poll_interval:g} s, server DB poll {args.db_poll_seconds:g} s")
+        print(f"{'client':>10}{'requests/analysis':>19}{'seen p50 ms':>13}{'seen max ms':>13}")
+        for name, mode in (("poll", poll), ("sse", stream), ("long-poll", long_poll)):
+            requests, delays = asyncio.run(measure(base_url, mode, args.analyses, args.queue_seconds, args.poll_interval))
+            print(f"{name:>10}{requests:>19.1f}{statistics.median(delays):>13.0f}{max(delays):>13.0f}")
+    finally:
+        server.send_signal(signal.SIGTERM)
+        server.wait(timeout=60)
+
+
+if __name__ == "__main__":
+    main()
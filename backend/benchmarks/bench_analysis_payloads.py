@@ -0,0 +1,227 @@
+#!/usr/bin/env python3
+"""
+Row size and query times of `analyses` with the JSON payloads inline (the
+layout before analysis_payloads) versus split out, on a synthetic SQLite
+table. The table is built in the old layout and measured; init_db() copies
+the payloads over (the copy every startup runs while the old columns exist,
+timed twice: the first copy and a later startup with nothing left to copy),
+the columns are dropped as migrations/20261017_003 does and it is measured
+again, then once more after VACUUM: dropping columns frees space inside the
+pages but the table keeps its page count until it is rebuilt.
+
+Queries, each as the app issues it:
+  status     status check by id (the ORM loaded full rows before the split)
+  poll       SSE/long-poll DB poll: updated_at of 500 watched analyses
+  page       one GET /analyses keyset page of 50
+  result     GET /analyses/{id}/result payload read
+  scan       status counts of analyses updated since a date (no index: a
+             full table scan, like reports and ad hoc admin queries)
+
+Each stage is timed twice on the same sample: cold, right after dropping the
+OS page cache (Linux, needs root; skipped otherwise), and warm.
+
+Run from backend/ (a million rows need ~6 GB of disk and several minutes):
+    python benchmarks/bench_analysis_payloads.py --rows 1000000
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+import uuid
+from datetime import datetime, timedelta
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(BACKEND_DIR))
+
+_TMP = tempfile.TemporaryDirectory(dir=os.getenv("BENCH_TMPDIR"))
+_DB_PATH = Path(_TMP.name) / "bench.db"
+os.environ["DATABASE_URL"] = f"sqlite:///{_DB_PATH}"
+os.environ.setdefault("MODEL_PATH", str(BACKEND_DIR / "ironrisk_bi_reg_29n.cbm"))
+
+from app.db.database import engine, init_db  # noqa: E402
+from app.services.prediction_service import predict_payload  # noqa: E402
+
+LAB = {"LBXHGB": 120, "LBXMCVSI": 79, "LBXMCHSI": 330, "LBXRDW": 15.2, "LBXRBCSI": 4.6, "LBXHCT": 37, "RIDAGEYR": 31, "BMXBMI": 22.5}
+ROWS_PER_USER = 50
+CHUNK = 20_000
+
+# `analyses` as created by the models before the split (payload columns in the middle of the row).
+OLD_LAYOUT = [
+    """CREATE TABLE analyses (
+        id VARCHAR(36) NOT NULL PRIMARY KEY,
+        user_id VARCHAR(36) NOT NULL,
+        status VARCHAR(32) NOT NULL,
+        progress_stage VARCHAR(64) NOT NULL,
+        error_message TEXT,
+        failure_reason VARCHAR(64),
+        input_payload JSON,
+        result_payload JSON,
+        created_at DATETIME NOT NULL,
+        updated_at DATETIME NOT NULL,
+        attempts INTEGER DEFAULT '0' NOT NULL,
+        available_at DATETIME,
+        lease_expires_at DATETIME,
+        claimed_by VARCHAR(96)
+    )""",
+    "CREATE INDEX ix_analyses_user_id ON analyses (user_id)",
+    "CREATE INDEX ix_analyses_queue ON analyses (status, available_at)",
+    "CREATE INDEX ix_analyses_user_created ON analyses (user_id, created_at DESC, id DESC)",
+]
+HOT_COLUMNS = "id, user_id, status, progress_stage, error_message, failure_reason, created_at, updated_at, attempts, available_at, lease_expires_at, claimed_by"
+STATUS_BEFORE = f"SELECT {HOT_COLUMNS}, input_payload, result_payload FROM analyses WHERE id = ?"
+STATUS_AFTER = f"SELECT {HOT_COLUMNS} FROM analyses WHERE id = ?"
+RESULT_BEFORE = "SELECT user_id, status, result_payload FROM analyses WHERE id = ?"
+RESULT_AFTER = (
+    "SELECT analyses.user_id, analyses.status, analysis_payloads.result_payload FROM analyses "
+    "LEFT OUTER JOIN analysis_payloads ON analysis_payloads.analysis_id = analyses.id WHERE analyses.id = ?"
+)
+POLL = "SELECT id, updated_at FROM analyses WHERE id IN ({})"
+PAGE = (
+    "SELECT id, status, created_at FROM analyses WHERE user_id = ? AND (created_at, id) < (?, ?) "
+    "ORDER BY created_at DESC, id DESC LIMIT 51"
+)
+SCAN = "SELECT status, count(*) FROM analyses WHERE updated_at >= '2025-01-01' GROUP BY status"
+
+
+def build(rows: int) -> list[tuple[str, str]]:
+    """Old-layout table with ``rows`` analyses, 90% completed with a result; returns (id, user_id) pairs."""
+    input_json = json.dumps(LAB)
+    result_json = json.dumps(predict_payload(LAB).model_dump())
+    started = datetime(2025, 1, 1)
+    keys = []
+    with engine.begin() as connection:
+        for statement in OLD_LAYOUT:
+            connection.exec_driver_sql(statement)
+    for offset in range(0, rows, CHUNK):
+        batch = []
+        for index in range(offset, min(rows, offset + CHUNK)):
+            analysis_id, user_id = str(uuid.uuid4()), f"user-{index % max(1, rows // ROWS_PER_USER)}"
+            created_at = (started + timedelta(seconds=index)).isoformat(sep=" ")
+            completed = index % 10 != 0
+            batch.append(
+                (
+                    analysis_id,
+                    user_id,
+                    "completed" if completed else "pending",
+                    "completed" if completed else "queued",
+                    input_json,
+                    result_json if completed else None,
+                    created_at,
+                    created_at,
+                    1 if completed else 0,
+                    created_at,
+                )
+            )
+            keys.append((analysis_id, user_id))
+        with engine.begin() as connection:
+            connection.exec_driver_sql(
+                "INSERT INTO analyses (id, user_id, status, progress_stage, input_payload, result_payload, "
+                "created_at, updated_at, attempts, available_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                batch,
+            )
+    return keys
+
+
+def table_bytes(name: str) -> int:
+    with engine.connect() as connection:
+        return connection.exec_driver_sql("SELECT coalesce(sum(pgsize), 0) FROM dbstat WHERE name = ?", (name,)).scalar()
+
+
+def drop_page_cache() -> bool:
+    try:
+        os.sync()
+        Path("/proc/sys/vm/drop_caches").write_text("3\n")
+    except OSError:
+        return False
+    return True
+
+
+def timed(run, repeat: int) -> float:
+    samples = []
+    for index in range(repeat):
+        started = time.perf_counter()
+        run(index)
+        samples.append(time.perf_counter() - started)
+    return statistics.median(samples) * 1000
+
+
+def measure(keys: list[tuple[str, str]], split: bool, lookups: int) -> dict[str, float]:
+    engine.dispose()  # SQLite's own page cache lives in the pooled connections
+    rng = random.Random(7)
+    sample = [rng.choice(keys) for _ in range(lookups)]
+    watched = [[analysis_id for analysis_id, _ in rng.sample(keys, 500)] for _ in range(20)]
+    with engine.connect() as connection:
+        cursor_row = connection.exec_driver_sql(
+            "SELECT created_at, id FROM analyses WHERE user_id = ? ORDER BY created_at DESC, id DESC LIMIT 1 OFFSET 10",
+            (sample[0][1],),
+        ).first()
+
+        def _query(sql: str, params: tuple):
+            return connection.exec_driver_sql(sql, params).all()
+
+        results = {
+            "status": timed(lambda i: _query(STATUS_AFTER if split else STATUS_BEFORE, (sample[i][0],)), lookups),
+            "poll": timed(lambda i: _query(POLL.format(", ".join("?" * 500)), tuple(watched[i])), len(watched)),
+            "page": timed(lambda i: _query(PAGE, (sample[i][1], cursor_row.created_at, cursor_row.id)), lookups),
+            "result": timed(lambda i: _query(RESULT_AFTER if split else RESULT_BEFORE, (sample[i][0],)), lookups),
+            "scan": timed(lambda _: _query(SCAN, ()), 1),
+        }
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--lookups", type=int, default=2000)
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    keys = build(args.rows)
+    print(f"\n{args.rows} analyses built in {time.perf_counter() - started:.0f} s (SQLite, {os.cpu_count()} CPU)")
+    stages = {}
+
+    def _stage(name: str, split: bool) -> None:
+        cold = measure(keys, split, args.lookups) if drop_page_cache() else None
+        stages[name] = (table_bytes("analyses"), table_bytes("analysis_payloads"), cold, measure(keys, split, args.lookups))
+
+    _stage("before", split=False)
+    started = time.perf_counter()
+    init_db()  # creates analysis_payloads and copies the payloads over
+    copied = time.perf_counter() - started
+    started = time.perf_counter()
+    init_db()
+    restarted = time.perf_counter() - started
+    started = time.perf_counter()
+    with engine.begin() as connection:
+        connection.exec_driver_sql("ALTER TABLE analyses DROP COLUMN input_payload")
+        connection.exec_driver_sql("ALTER TABLE analyses DROP COLUMN result_payload")
+    dropped = time.perf_counter() - started
+    _stage("after", split=True)
+    started = time.perf_counter()
+    with engine.connect() as connection:
+        connection.exec_driver_sql("VACUUM")
+    vacuumed = time.perf_counter() - started
+    _stage("+VACUUM", split=True)
+
+    print(f"startup copy: {copied:.0f} s, next startup: {restarted:.1f} s, DROP COLUMN: {dropped:.0f} s, VACUUM: {vacuumed:.0f} s")
+    print(f"\n{'':>22}" + "".join(f"{name:>12}" for name in stages))
+    print(f"{'analyses bytes/row':>22}" + "".join(f"{stage[0] / args.rows:>12.0f}" for stage in stages.values()))
+    print(f"{'analyses MB':>22}" + "".join(f"{stage[0] / 2**20:>12.0f}" for stage in stages.values()))
+    print(f"{'analysis_payloads MB':>22}" + "".join(f"{stage[1] / 2**20:>12.0f}" for stage in stages.values()))
+    for index, label in ((2, "cold"), (3, "warm")):
+        if stages["before"][index] is None:
+            print("(cold timings skipped: cannot drop the page cache)")
+            continue
+        for query in stages["before"][index]:
+            print(f"{query + ' ms ' + label:>22}" + "".join(f"{stage[index][query]:>12.3f}" for stage in stages.values()))
+
+
+if __name__ == "__main__":
+    main()
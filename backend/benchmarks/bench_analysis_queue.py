@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Throughput of the DB-backed analysis job queue (app/services/analysis_queue.py)
+on a fresh SQLite file: claiming alone (the queue's own overhead per job) and
+draining with AnalysisWorker threads (claim + scoring + settle), one job per
+claim versus batches scored with one vectorized call and settled in one
+transaction. Every job must end completed after exactly one attempt.
+
+Run from backend/:
+    python benchmarks/bench_analysis_queue.py --jobs 2000 --concurrency 1 2 4 --batch-size 1 64
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(BACKEND_DIR))
+
+_TMP = tempfile.TemporaryDirectory()
+os.environ["DATABASE_URL"] = f"sqlite:///{_TMP.name}/bench.db"
+os.environ.setdefault("MODEL_PATH", str(BACKEND_DIR / "ironrisk_bi_reg_29n.cbm"))
+
+from sqlalchemy import delete, func, select  # noqa: E402
+
+from app.db.database import SessionLocal, init_db  # noqa: E402
+from app.db.models import Analysis  # noqa: E402
+from app.services.analyses_service import CreateAnalysisRequest, create_analysis  # noqa: E402
+from app.services.analysis_queue import claim_jobs  # noqa: E402
+from app.services.analysis_worker import AnalysisWorker  # noqa: E402
+from app.services.prediction_service import load_and_warm_up_model  # noqa: E402
+
+REQUEST = CreateAnalysisRequest.model_validate(
+    {
+        "upload": {"filename": "report.pdf", "content_type": "application/pdf", "size_bytes": 128000, "source": "web"},
+        "lab": {"LBXHGB": 120, "LBXMCVSI": 79, "LBXMCHSI": 330, "LBXRDW": 15.2, "LBXRBCSI": 4.6, "LBXHCT": 37, "RIDAGEYR": 31, "BMXBMI": 22.5},
+    }
+)
+
+
+def enqueue(jobs: int) -> None:
+    with SessionLocal() as session:
+        session.execute(delete(Analysis))
+        session.commit()
+    for _ in range(jobs):
+        create_analysis("bench-user", REQUEST)
+
+
+def run_threads(concurrency: int, target) -> float:
+    threads = [threading.Thread(target=target, args=(f"bench-{index}",)) for index in range(concurrency)]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return time.perf_counter() - started
+
+
+def check(jobs: int, status: str) -> None:
+    with SessionLocal() as session:
+        counts = session.execute(select(Analysis.status, Analysis.attempts, func.count()).group_by(Analysis.status, Analysis.attempts)).all()
+    assert [tuple(row) for row in counts] == [(status, 1, jobs)], counts
+
+
+def claim_only(concurrency: int, batch_size: int) -> float:
+    def _claim_all(worker_id: str) -> None:
+        while claim_jobs(worker_id, batch_size):
+            pass
+
+    return run_threads(concurrency, _claim_all)
+
+
+def drain(concurrency: int, batch_size: int) -> float:
+    return run_threads(concurrency, lambda worker_id: AnalysisWorker(worker_id=worker_id, batch_size=batch_size).drain())
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--jobs", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--batch-size", type=int, nargs="+", default=[1, 64])
+    args = parser.parse_args()
+
+    init_db()
+    load_and_warm_up_model()
+    print(f"\n{args.jobs} jobs, SQLite, {os.cpu_count()} CPU")
+    print(f"{'mode':>8}{'batch':>7}{'threads':>9}{'seconds':>10}{'jobs/s':>10}{'ms/job':>9}")
+    for mode, run, status in (("claim", claim_only, "processing"), ("drain", drain, "completed")):
+        for batch_size in args.batch_size:
+            for concurrency in args.concurrency:
+                enqueue(args.jobs)
+                elapsed = run(concurrency, batch_size)
+                check(args.jobs, status)
+                print(
+                    f"{mode:>8}{batch_size:>7}{concurrency:>9}{elapsed:>10.2f}"
+                    f"{args.jobs / elapsed:>10.0f}{elapsed / args.jobs * 1000:>9.2f}"
+                )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Streaming bulk scoring of a generated CSV cohort, in process: time until the
+first NDJSON result is produced, throughput, and the peak Python heap
+(tracemalloc) while the upload is consumed. The peak should not grow with the
+row count.
+
+Run from backend/:
+    python benchmarks/bench_bulk_stream.py --rows 1000 10000 50000
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import random
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(BACKEND_DIR))
+
+import app.services.prediction_service as prediction_service  # noqa: E402
+from app.services.bulk_scoring import stream_bulk_predictions  # noqa: E402
+
+COLUMNS = ["LBXHGB", "LBXMCVSI", "LBXMCHSI", "LBXRDW", "LBXRBCSI", "LBXHCT", "RIDAGEYR", "BMXBMI", "RIAGENDR"]
+BASE = [120, 79, 330, 15.2, 4.6, 37, 31, 22.5]
+
+
+async def upload(rows: int, rows_per_part: int = 500):
+    """Body parts of roughly the size an ASGI server hands over."""
+    rng = random.Random(0)
+    yield (",".join(COLUMNS) + "\n").encode()
+    for start in range(0, rows, rows_per_part):
+        lines = []
+        for _ in range(min(rows_per_part, rows - start)):
+            values = [round(value * rng.uniform(0.8, 1.2), 2) for value in BASE]
+            lines.append(",".join(str(value) for value in values[:6]) + f",{int(values[6])},{values[7]},{rng.choice([1, 2])}")
+        yield ("\n".join(lines) + "\n").encode()
+
+
+async def run_inline(fn, *args):
+    return fn(*args)
+
+
+async def consume(rows: int) -> tuple[float, int]:
+    started = time.perf_counter()
+    first_result = None
+    results = 0
+    async for output in stream_bulk_predictions(upload(rows), "csv", run=run_inline):
+        if first_result is None:
+            first_result = time.perf_counter() - started
+        results += output.count(b"\n")
+    return first_result or 0.0, results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, nargs="+", default=[1000, 10000, 50000])
+    args = parser.parse_args()
+
+    prediction_service._PREDICTION_CACHE = prediction_service.PredictionCache(0, 0)
+    runner = prediction_service.get_runner()
+    prediction_service.warm_up_runner(runner)
+
+    print(f"engine={runner.engine} explanation_mode={runner.explanation_mode}")
+    print(f"{'rows':>8}{'first ms':>10}{'total s':>9}{'rows/s':>9}{'peak MiB':>10}")
+    for rows in args.rows:
+        started = time.perf_counter()
+        first_result, results = asyncio.run(consume(rows))
+        total = time.perf_counter() - started
+        assert results == rows
+        # Separate pass: tracemalloc slows allocation-heavy code down too much to time it.
+        tracemalloc.start()
+        asyncio.run(consume(rows))
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        print(f"{rows:>8}{first_result * 1000:>10.1f}{total:>9.2f}{rows / total:>9.0f}{peak / 2**20:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
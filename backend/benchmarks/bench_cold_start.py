@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Cold start in fresh interpreters: time to import app.main (until /health can
+answer) and the startup phases reported by GET /admin/startup once the lifespan has
+loaded and warmed the model. --eager imports catboost, pandas and passlib
+before the app, as the app itself did before they were made lazy.
+
+Run from backend/:
+    python benchmarks/bench_cold_start.py --runs 5
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+
+CHILD = """
+import json, sys, time
+started = time.perf_counter()
+if {eager}:
+    import catboost, pandas, passlib.context
+import app.main
+imported = time.perf_counter() - started
+from fastapi.testclient import TestClient
+from app.core.readiness import wait_until_ready
+from app.core.startup import startup_report
+with TestClient(app.main.app):
+    wait_until_ready(60)
+    ready = time.perf_counter() - started
+    report = startup_report()
+print(json.dumps({{"import_s": imported, "ready_s": ready, "phases_ms": report["phases_ms"]}}))
+"""
+
+
+def run_once(eager: bool, env: dict[str, str]) -> dict:
+    output = subprocess.run(
+        [sys.executable, "-c", CHILD.format(eager=eager)],
+        cwd=BACKEND_DIR,
+        env=env,
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    env = {**os.environ, "DATABASE_URL": os.getenv("DATABASE_URL", "sqlite:////tmp/verae_cold_start.db")}
+    env.setdefault("MODEL_PATH", str(BACKEND_DIR / "ironrisk_bi_reg_29n.cbm"))
+    print(f"{'mode':>8}{'import ms':>12}{'ready ms':>11}  phases (median ms)")
+    for eager in (True, False):
+        runs = [run_once(eager, env) for _ in range(args.runs)]
+        phases = {
+            name: statistics.median(run["phases_ms"][name] for run in runs)
+            for name in runs[0]["phases_ms"]
+            if name != "import"
+        }
+        print(
+            f"{'eager' if eager else 'lazy':>8}"
+            f"{statistics.median(run['import_s'] for run in runs) * 1000:>12.0f}"
+            f"{statistics.median(run['ready_s'] for run in runs) * 1000:>11.0f}  "
+            + " ".join(f"{name}={value:.0f}" for name, value in phases.items())
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+Latency of scoring one request and a 1000-row batch for every EXPLANATION_MODE.
+
+Run from backend/:
+    python benchmarks/bench_explanation_modes.py
+"""
+from __future__ import annotations
+
+import argparse
+import statistics
+import sys
+import time
+from pathlib import Path
+
+import pandas as pd
+
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(BACKEND_DIR))
+
+from app.services.prediction_service import EXPLANATION_MODES, FEATURES, ModelRunner, ScoringContext  # noqa: E402
+
+TRAIN_ROWS_FILE = BACKEND_DIR.parent / "train_data" / "X_29n.csv"
+
+
+def load_payloads(limit: int) -> list[dict]:
+    frame = pd.read_csv(TRAIN_ROWS_FILE, nrows=limit)[FEATURES]
+    return [
+        {name: (None if pd.isna(value) else value) for name, value in record.items()}
+        for record in frame.to_dict("records")
+    ]
+
+
+def time_scoring(runner: ModelRunner, payloads: list[dict], iterations: int) -> float:
+    timings = []
+    for _ in range(iterations):
+        started = time.perf_counter()
+        context = ScoringContext(payloads)
+        runner.predict_context(context)
+        runner.explain_context(context)
+        timings.append((time.perf_counter() - started) * 1000)
+    return statistics.median(timings)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--model", type=Path, default=BACKEND_DIR / "ironrisk_bi_reg_29n.cbm")
+    parser.add_argument("--iterations", type=int, default=200)
+    args = parser.parse_args()
+
+    payloads = load_payloads(1000)
+    print(f"{'mode':<14}{'1 row p50 ms':>14}{'1000 rows p50 ms':>18}")
+    for mode in EXPLANATION_MODES:
+        runner = ModelRunner(args.model, explanation_mode=mode)
+        time_scoring(runner, payloads[:1], 20)
+        single = time_scoring(runner, payloads[:1], args.iterations)
+        batch = time_scoring(runner, payloads, max(3, args.iterations // 50))
+        print(f"{mode:<14}{single:>14.3f}{batch:>18.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Validation + normalization + clinical adjustment for a batch of payloads:
+the per-payload dict rules versus the columnar FIELD_ENGINE pass. Model
+scoring is not included.
+
+Run from backend/:
+    python benchmarks/bench_field_specs.py --rows 1000 10000 50000
+"""
+from __future__ import annotations
+
+import argparse
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(BACKEND_DIR))
+
+import app.services.prediction_service as ps  # noqa: E402
+
+BASE_PAYLOAD = {
+    "LBXHGB": 120, "LBXMCVSI": 79, "LBXMCHSI": 330, "LBXRDW": 15.2, "LBXRBCSI": 4.6,
+    "LBXHCT": 37, "RIDAGEYR": 31, "BMXHT": 165, "BMXWT": 62, "RIAGENDR": 2,
+    "LBXSGL": 5.4, "LBXSCH": 190, "LBXPLTSI": 250, "LBXWBCSI": 6.1,
+}
+
+
+def make_payloads(count: int) -> list[dict]:
+    rng = random.Random(0)
+    return [{name: value * rng.uniform(0.8, 1.2) for name, value in BASE_PAYLOAD.items()} for _ in range(count)]
+
+
+def per_payload(rows: list[dict]) -> None:
+    normalized = []
+    for data in rows:
+        rejected, _ = ps._precheck_payload(data)
+        if rejected is None:
+            prepared = ps.prepare_model_input(data)
+            ps._clinical_adjustment(0.0, data, prepared)
+            normalized.append(prepared)
+    ps.ScoringContext(rows, "numpy", normalized=normalized)
+
+
+def columnar(rows: list[dict]) -> None:
+    batch = ps.FIELD_ENGINE.prepare_rows(rows)
+    ps.FIELD_ENGINE.model_features(batch)
+
+
+def time_call(fn, rows: list[dict], iterations: int) -> float:
+    timings = []
+    for _ in range(iterations):
+        started = time.perf_counter()
+        fn(rows)
+        timings.append((time.perf_counter() - started) * 1000)
+    return statistics.median(timings)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, nargs="+", default=[1000, 10000, 50000])
+    parser.add_argument("--iterations", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"{'rows':>8}{'per-payload ms':>16}{'columnar ms':>14}{'speedup':>10}")
+    for count in args.rows:
+        rows = make_payloads(count)
+        old = time_call(per_payload, rows, args.iterations)
+        new = time_call(columnar, rows, args.iterations)
+        print(f"{count:>8}{old:>16.1f}{new:>14.1f}{old / new:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
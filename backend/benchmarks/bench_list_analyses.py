@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+GET /analyses for a user with many analyses (SQLite file): the previous
+listing, which loaded every full ORM row (JSON payloads included), versus a
+keyset page of `limit` rows selecting only id/status/created_at, at the
+first page and deep in the list.
+
+Run from backend/:
+    python benchmarks/bench_list_analyses.py --analyses 5000 --other-users 200
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+import uuid
+from datetime import datetime, timedelta
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(BACKEND_DIR))
+
+_TMP = tempfile.TemporaryDirectory()
+os.environ["DATABASE_URL"] = f"sqlite:///{_TMP.name}/bench.db"
+os.environ.setdefault("MODEL_PATH", str(BACKEND_DIR / "ironrisk_bi_reg_29n.cbm"))
+
+from sqlalchemy import insert  # noqa: E402
+
+from app.db.database import SessionLocal, init_db  # noqa: E402
+from app.db.models import Analysis, AnalysisPayload  # noqa: E402
+from app.services.analyses_service import list_analyses  # noqa: E402
+from app.services.prediction_service import predict_payload  # noqa: E402
+
+LAB = {"LBXHGB": 120, "LBXMCVSI": 79, "LBXMCHSI": 330, "LBXRDW": 15.2, "LBXRBCSI": 4.6, "LBXHCT": 37, "RIDAGEYR": 31, "BMXBMI": 22.5}
+USER = "bench-list-user"
+
+
+def seed(analyses: int, other_users: int) -> None:
+    result = predict_payload(LAB).model_dump()
+    started = datetime(2026, 1, 1)
+    rows, payloads = [], []
+    for user_index in range(other_users + 1):
+        user_id = USER if user_index == 0 else f"other-{user_index}"
+        count = analyses if user_index == 0 else 20
+        for index in range(count):
+            created_at = started + timedelta(seconds=index)
+            analysis_id = str(uuid.uuid4())
+            payloads.append({"analysis_id": analysis_id, "input_payload": LAB, "result_payload": result})
+            rows.append(
+                {
+                    "id": analysis_id,
+                    "user_id": user_id,
+                    "status": "completed",
+                    "progress_stage": "completed",
+                    "created_at": created_at,
+                    "updated_at": created_at,
+                    "available_at": created_at,
+                }
+            )
+    with SessionLocal() as session:
+        session.execute(insert(Analysis), rows)
+        session.execute(insert(AnalysisPayload), payloads)
+        session.commit()
+
+
+def previous_listing(user_id: str) -> int:
+    # The payloads used to be columns of Analysis, so full rows carried them.
+    with SessionLocal() as session:
+        rows = (
+            session.query(Analysis, AnalysisPayload)
+            .join(AnalysisPayload, AnalysisPayload.analysis_id == Analysis.id)
+            .filter(Analysis.user_id == user_id)
+            .order_by(Analysis.created_at.desc())
+            .all()
+        )
+    return len(rows)
+
+
+def timed(fn, repeat: int) -> float:
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - started)
+    return statistics.median(samples) * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--analyses", type=int, default=5000)
+    parser.add_argument("--other-users", type=int, default=200)
+    parser.add_argument("--limit", type=int, default=50)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    init_db()
+    seed(args.analyses, args.other_users)
+
+    cursor = None
+    for _ in range(args.analyses // args.limit // 2):
+        cursor = list_analyses(USER, limit=args.limit, cursor=cursor).next_cursor
+    deep_cursor = cursor
+
+    print(f"\n{args.analyses} analyses of one user (+{args.other_users * 20} of others), SQLite, median of {args.repeat}")
+    print(f"{'listing':>28}{'rows':>7}{'ms':>9}")
+    print(f"{'previous: all, full rows':>28}{previous_listing(USER):>7}{timed(lambda: previous_listing(USER), args.repeat):>9.2f}")
+    first = lambda: list_analyses(USER, limit=args.limit)  # noqa: E731
+    deep = lambda: list_analyses(USER, limit=args.limit, cursor=deep_cursor)  # noqa: E731
+    print(f"{'keyset: first page':>28}{len(first().analyses):>7}{timed(first, args.repeat):>9.2f}")
+    print(f"{'keyset: middle page':>28}{len(deep().analyses):>7}{timed(deep, args.repeat):>9.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Throughput and latency of concurrent single predictions for several
+INFERENCE_BATCH_WINDOW_MS values (the result cache is disabled).
+
+Run from backend/:
+    python benchmarks/bench_micro_batching.py --threads 32
+"""
+from __future__ import annotations
+
+import argparse
+import statistics
+import sys
+import threading
+import time
+from pathlib import Path
+
+import pandas as pd
+
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(BACKEND_DIR))
+
+import app.services.prediction_service as prediction_service  # noqa: E402
+
+TRAIN_ROWS_FILE = BACKEND_DIR.parent / "train_data" / "X_29n.csv"
+
+
+def load_payloads(limit: int) -> list[dict]:
+    frame = pd.read_csv(TRAIN_ROWS_FILE, nrows=limit)[prediction_service.FEATURES]
+    return [
+        {name: (None if pd.isna(value) else value) for name, value in record.items()}
+        for record in frame.to_dict("records")
+    ]
+
+
+def run_load(payloads: list[dict], threads: int, requests_per_thread: int) -> tuple[float, list[float]]:
+    latencies: list[float] = []
+    lock = threading.Lock()
+    barrier = threading.Barrier(threads + 1)
+
+    def worker(offset: int) -> None:
+        local = []
+        barrier.wait()
+        for step in range(requests_per_thread):
+            payload = payloads[(offset * requests_per_thread + step) % len(payloads)]
+            started = time.perf_counter()
+            prediction_service.predict_payload(payload)
+            local.append((time.perf_counter() - started) * 1000)
+        with lock:
+            latencies.extend(local)
+
+    workers = [threading.Thread(target=worker, args=(offset,)) for offset in range(threads)]
+    for thread in workers:
+        thread.start()
+    barrier.wait()
+    started = time.perf_counter()
+    for thread in workers:
+        thread.join()
+    return time.perf_counter() - started, latencies
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--threads", type=int, default=32)
+    parser.add_argument("--requests-per-thread", type=int, default=50)
+    parser.add_argument("--windows", type=float, nargs="+", default=[0, 1, 2, 5, 10])
+    parser.add_argument("--max-batch-size", type=int, default=64)
+    args = parser.parse_args()
+
+    prediction_service._PREDICTION_CACHE = prediction_service.PredictionCache(0, 0)
+    prediction_service.INFERENCE_MAX_BATCH_SIZE = args.max_batch_size
+    payloads = load_payloads(2000)
+    prediction_service.warm_up_runner(prediction_service.get_runner())
+
+    print(f"{'window ms':>10}{'req/s':>10}{'p50 ms':>10}{'p99 ms':>10}{'mean batch':>12}")
+    for window in args.windows:
+        prediction_service.shutdown_inference_scheduler()
+        prediction_service.INFERENCE_BATCH_WINDOW_MS = window
+        elapsed, latencies = run_load(payloads, args.threads, args.requests_per_thread)
+        scheduler = prediction_service.get_inference_scheduler()
+        mean_batch = scheduler.stats()["mean_batch"] if scheduler is not None else 1.0
+        quantiles = statistics.quantiles(latencies, n=100)
+        print(
+            f"{'off' if window <= 0 else window:>10}{len(latencies) / elapsed:>10.0f}"
+            f"{statistics.median(latencies):>10.2f}{quantiles[98]:>10.2f}{mean_batch:>12.1f}"
+        )
+    prediction_service.shutdown_inference_scheduler()
+
+
+if __name__ == "__main__":
+    main()
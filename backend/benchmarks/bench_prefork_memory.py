@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Per-worker memory of the gunicorn server (gunicorn.conf.py) with the model
+preloaded in the master versus loaded by every worker (GUNICORN_PRELOAD=0).
+Measured after the workers are ready and have served some predictions.
+PSS splits shared pages between the processes that map them, so the PSS sum
+is the real footprint of the server.
+
+Run from backend/:
+    python benchmarks/bench_prefork_memory.py --workers 4
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import signal
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import httpx
+
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(BACKEND_DIR))
+
+from app.core.startup import process_memory  # noqa: E402
+
+PAYLOAD = {"LBXHGB": 120, "LBXMCVSI": 79, "LBXMCHSI": 330, "LBXRDW": 15.2, "LBXRBCSI": 4.6, "LBXHCT": 37, "RIDAGEYR": 31, "BMXBMI": 22.5}
+
+
+def free_port() -> int:
+    with socket.socket() as probe:
+        probe.bind(("127.0.0.1", 0))
+        return probe.getsockname()[1]
+
+
+def worker_pids(master: int) -> list[int]:
+    children = Path(f"/proc/{master}/task/{master}/children").read_text().split()
+    return [int(pid) for pid in children]
+
+
+def measure(workers: int, preload: bool, requests: int) -> None:
+    port = free_port()
+    with tempfile.TemporaryDirectory() as tmp:
+        env = {
+            **os.environ,
+            "GUNICORN_BIND": f"127.0.0.1:{port}",
+            "WEB_CONCURRENCY": str(workers),
+            "GUNICORN_PRELOAD": "1" if preload else "0",
+            "GUNICORN_MAX_REQUESTS": "0",
+            "DATABASE_URL": f"sqlite:///{tmp}/bench.db",
+        }
+        env.setdefault("MODEL_PATH", str(BACKEND_DIR / "ironrisk_bi_reg_29n.cbm"))
+        log_path = Path(tmp) / "gunicorn.log"
+        with log_path.open("w") as log:
+            server = subprocess.Popen(
+                [sys.executable, "-m", "gunicorn", "-c", "gunicorn.conf.py", "app.main:app"],
+                cwd=BACKEND_DIR,
+                env=env,
+                stdout=log,
+                stderr=subprocess.STDOUT,
+            )
+        try:
+            deadline = time.monotonic() + 120
+            while log_path.read_text().count('"event":"startup_completed"') < workers:
+                if time.monotonic() > deadline or server.poll() is not None:
+                    raise RuntimeError(log_path.read_text()[-2000:])
+                time.sleep(0.2)
+            with httpx.Client(base_url=f"http://127.0.0.1:{port}") as client:
+                for _ in range(requests):
+                    client.post("/v1/risk/predict", json=PAYLOAD).raise_for_status()
+            rows = [("master", process_memory(server.pid))]
+            rows += [(f"worker {pid}", process_memory(pid)) for pid in worker_pids(server.pid)]
+        finally:
+            server.send_signal(signal.SIGTERM)
+            server.wait(timeout=60)
+
+    print(f"\npreload={'on' if preload else 'off'}, workers={workers}")
+    print(f"{'process':>16}{'RSS MiB':>10}{'PSS MiB':>10}{'shared MiB':>12}{'private MiB':>13}")
+    for name, memory in rows:
+        print(
+            f"{name:>16}{memory['rss_kb'] / 1024:>10.1f}{memory['pss_kb'] / 1024:>10.1f}"
+            f"{memory['shared_kb'] / 1024:>12.1f}{memory['private_kb'] / 1024:>13.1f}"
+        )
+    print(f"{'PSS total':>16}{'':>10}{sum(memory['pss_kb'] for _, memory in rows) / 1024:>10.1f}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--requests", type=int, default=200)
+    args = parser.parse_args()
+
+    for preload in (False, True):
+        measure(args.workers, preload, args.requests)
+
+
+if __name__ == "__main__":
+    main()
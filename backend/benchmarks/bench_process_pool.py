@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Throughput of concurrent single-row scoring in-process (threads) versus the
+INFERENCE_PROCESSES worker pool, for 1..N worker processes.
+
+Run from backend/:
+    python benchmarks/bench_process_pool.py --processes 1 2 4 8
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import statistics
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import pandas as pd
+
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(BACKEND_DIR))
+
+from app.services.inference_pool import ProcessInferencePool  # noqa: E402
+from app.services.prediction_service import FEATURES, ModelRunner, ScoringContext  # noqa: E402
+
+TRAIN_ROWS_FILE = BACKEND_DIR.parent / "train_data" / "X_29n.csv"
+
+
+def load_contexts(limit: int) -> list[ScoringContext]:
+    frame = pd.read_csv(TRAIN_ROWS_FILE, nrows=limit)[FEATURES]
+    payloads = [
+        {name: (None if pd.isna(value) else value) for name, value in record.items()}
+        for record in frame.to_dict("records")
+    ]
+    return [ScoringContext.for_payload(payload) for payload in payloads]
+
+
+def measure(score, contexts: list[ScoringContext], concurrency: int) -> tuple[float, float]:
+    latencies: list[float] = []
+
+    def one(context: ScoringContext) -> None:
+        started = time.perf_counter()
+        score(context)
+        latencies.append((time.perf_counter() - started) * 1000)
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as clients:
+        list(clients.map(one, contexts))
+    elapsed = time.perf_counter() - started
+    return len(contexts) / elapsed, statistics.median(latencies)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--model", type=Path, default=BACKEND_DIR / "ironrisk_bi_reg_29n.cbm")
+    parser.add_argument("--processes", type=int, nargs="+", default=[1, 2, os.cpu_count() or 1])
+    parser.add_argument("--requests", type=int, default=1000)
+    args = parser.parse_args()
+
+    contexts = load_contexts(args.requests)
+    print(f"cpu_count={os.cpu_count()}")
+    print(f"{'mode':<22}{'req/s':>10}{'p50 ms':>10}")
+
+    for workers in sorted(set(args.processes)):
+        runner = ModelRunner(args.model, thread_count=1)
+
+        def in_process(context: ScoringContext) -> None:
+            runner.predict_context(context)
+            runner.explain_context(context)
+
+        measure(in_process, contexts[:20], workers)
+        throughput, p50 = measure(in_process, contexts, workers * 2)
+        print(f"{f'threads x{workers}':<22}{throughput:>10.0f}{p50:>10.2f}")
+
+        pool = ProcessInferencePool(runner, processes=workers, thread_count=1).start()
+        try:
+            measure(lambda context: pool.score(context.features), contexts[:20], workers * 2)
+            throughput, p50 = measure(lambda context: pool.score(context.features), contexts, workers * 2)
+        finally:
+            pool.shutdown()
+        print(f"{f'processes x{workers}':<22}{throughput:>10.0f}{p50:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
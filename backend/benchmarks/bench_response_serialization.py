@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Rendering a scored PredictResponse / PredictBatchResponse into the HTTP body:
+FastAPI's response_model path (re-validation, jsonable_encoder, json.dumps)
+versus PredictJSONResponse (pre-encoded explanation fragments, orjson).
+Scoring is done once up front and is not included.
+
+Run from backend/:
+    python benchmarks/bench_response_serialization.py --rows 1 1000
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(BACKEND_DIR))
+
+from fastapi.responses import JSONResponse  # noqa: E402
+from fastapi.routing import APIRoute, serialize_response  # noqa: E402
+
+import app.services.prediction_service as ps  # noqa: E402
+from app.main import app  # noqa: E402
+from app.services.response_encoding import PredictJSONResponse, orjson  # noqa: E402
+
+BASE_PAYLOAD = {
+    "LBXHGB": 120, "LBXMCVSI": 79, "LBXMCHSI": 330, "LBXRDW": 15.2, "LBXRBCSI": 4.6,
+    "LBXHCT": 37, "RIDAGEYR": 31, "BMXHT": 165, "BMXWT": 62, "RIAGENDR": 2,
+    "LBXSGL": 5.4, "LBXSCH": 190, "LBXPLTSI": 250, "LBXWBCSI": 6.1,
+}
+
+
+def make_payloads(count: int) -> list[dict]:
+    rng = random.Random(0)
+    return [{name: value * rng.uniform(0.8, 1.2) for name, value in BASE_PAYLOAD.items()} for _ in range(count)]
+
+
+def response_field(path: str):
+    for route in app.routes:
+        if isinstance(route, APIRoute) and route.path == path:
+            return route.response_field
+    raise LookupError(path)
+
+
+LOOP = asyncio.new_event_loop()
+
+
+def response_model_body(field, content) -> bytes:
+    # What the route does with a returned model: validate against response_model, encode, render.
+    serialized = LOOP.run_until_complete(serialize_response(field=field, response_content=content, is_coroutine=True))
+    return JSONResponse(serialized).body
+
+
+def time_call(fn, iterations: int) -> float:
+    timings = []
+    for _ in range(iterations):
+        started = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - started) * 1000)
+    return statistics.median(timings)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, nargs="+", default=[1, 1000])
+    parser.add_argument("--iterations", type=int, default=200)
+    args = parser.parse_args()
+
+    print(f"model loaded: {ps.get_runner().model is not None}, orjson: {orjson is not None}")
+    print(f"{'rows':>8}{'response_model ms':>20}{'pre-encoded ms':>17}{'speedup':>10}{'body bytes':>12}")
+    for count in args.rows:
+        results = ps.predict_batch_payloads(make_payloads(count))
+        if count == 1:
+            field, content = response_field("/v1/risk/predict"), results[0]
+        else:
+            field, content = response_field("/v1/risk/predict/batch"), ps.PredictBatchResponse(results=results)
+        baseline = response_model_body(field, content)
+        body = PredictJSONResponse(content).body
+        assert body == baseline, "encodings differ"
+        iterations = max(5, args.iterations // count)
+        old = time_call(lambda: response_model_body(field, content), iterations)
+        new = time_call(lambda: PredictJSONResponse(content), iterations)
+        print(f"{count:>8}{old:>20.3f}{new:>17.3f}{old / new:>9.1f}x{len(body):>12}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Per-request latency and allocations: ScoringContext vs. the legacy three-pass flow.
+
+Legacy flow (before ScoringContext): predict_iron_index, get_explanations and
+_clinical_adjustment each normalized the payload and the first two each built
+their own one-row DataFrame and Pool.
+
+Run from backend/:
+    MODEL_PATH=./ironrisk_bi_reg_29n.cbm python benchmarks/bench_scoring_context.py
+"""
+from __future__ import annotations
+
+import argparse
+import statistics
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Any, Callable
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from app.services import prediction_service as ps  # noqa: E402
+
+PAYLOAD: dict[str, Any] = {
+    "LBXHGB": 120,
+    "LBXMCVSI": 79,
+    "LBXMCHSI": 330,
+    "LBXRDW": 15.2,
+    "LBXRBCSI": 4.6,
+    "LBXHCT": 37,
+    "RIDAGEYR": 31,
+    "BMXHT": 165,
+    "BMXWT": 62,
+    "RIAGENDR": 2,
+}
+
+
+def legacy_request(runner: ps.ModelRunner, data: dict[str, Any]) -> float:
+    raw = runner.predict_iron_index(data)
+    runner.get_explanations(data)
+    return ps._clinical_adjustment(raw, data)
+
+
+def context_request(runner: ps.ModelRunner, data: dict[str, Any]) -> float:
+    context = ps.ScoringContext.for_payload(data)
+    raw = runner.predict_context(context)[0]
+    runner.explain_context(context)
+    return ps._clinical_adjustment(raw, data, context.normalized[0])
+
+
+def measure(fn: Callable[[ps.ModelRunner, dict[str, Any]], float], runner: ps.ModelRunner, iterations: int) -> dict[str, float]:
+    for _ in range(20):
+        fn(runner, PAYLOAD)
+
+    timings = []
+    for _ in range(iterations):
+        started = time.perf_counter()
+        fn(runner, PAYLOAD)
+        timings.append((time.perf_counter() - started) * 1000)
+
+    tracemalloc.start()
+    before, _ = tracemalloc.get_traced_memory()
+    tracemalloc.reset_peak()
+    fn(runner, PAYLOAD)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    timings.sort()
+    return {
+        "p50_ms": statistics.median(timings),
+        "p95_ms": timings[int(len(timings) * 0.95) - 1],
+        "peak_kib": (peak - before) / 1024,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=300)
+    args = parser.parse_args()
+
+    runner = ps.get_runner()
+    print(f"model: {runner.model_path} ({'loaded' if runner.model is not None else 'fallback'})")
+
+    legacy_value = legacy_request(runner, PAYLOAD)
+    context_value = context_request(runner, PAYLOAD)
+    assert legacy_value == context_value, (legacy_value, context_value)
+
+    results = {
+        "legacy": measure(legacy_request, runner, args.iterations),
+        "context": measure(context_request, runner, args.iterations),
+    }
+    print(f"{'path':<10}{'p50 ms':>10}{'p95 ms':>10}{'peak KiB':>12}")
+    for name, stats in results.items():
+        print(f"{name:<10}{stats['p50_ms']:>10.3f}{stats['p95_ms']:>10.3f}{stats['peak_kib']:>12.1f}")
+
+    speedup = results["legacy"]["p50_ms"] / results["context"]["p50_ms"]
+    print(f"p50 speedup: {speedup:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Latency of predict + exact SHAP through CatBoost versus the NumPy
+oblivious-tree engine (INFERENCE_ENGINE=numpy), for one row and a batch.
+
+Run from backend/:
+    python benchmarks/bench_tree_engine.py
+"""
+from __future__ import annotations
+
+import argparse
+import statistics
+import sys
+import time
+from pathlib import Path
+
+import pandas as pd
+
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(BACKEND_DIR))
+
+from app.services.prediction_service import INFERENCE_ENGINES, FEATURES, ModelRunner, ScoringContext  # noqa: E402
+
+TRAIN_ROWS_FILE = BACKEND_DIR.parent / "train_data" / "X_29n.csv"
+
+
+def load_payloads(limit: int) -> list[dict]:
+    frame = pd.read_csv(TRAIN_ROWS_FILE, nrows=limit)[FEATURES]
+    return [
+        {name: (None if pd.isna(value) else value) for name, value in record.items()}
+        for record in frame.to_dict("records")
+    ]
+
+
+def time_call(fn, iterations: int) -> float:
+    timings = []
+    for _ in range(iterations):
+        started = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - started) * 1000)
+    return statistics.median(timings)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--model", type=Path, default=BACKEND_DIR / "ironrisk_bi_reg_29n.cbm")
+    parser.add_argument("--batch-rows", type=int, default=1000)
+    parser.add_argument("--iterations", type=int, default=200)
+    args = parser.parse_args()
+
+    payloads = load_payloads(args.batch_rows)
+    single = ScoringContext(payloads[:1])
+    batch = ScoringContext(payloads)
+    print(f"{'engine':<10}{'load ms':>10}{'1 row predict':>15}{'1 row +SHAP':>13}{f'{len(payloads)} rows +SHAP':>18}")
+    for engine in INFERENCE_ENGINES:
+        started = time.perf_counter()
+        runner = ModelRunner(args.model, explanation_mode="exact", engine=engine)
+        load_ms = (time.perf_counter() - started) * 1000
+
+        def score(context: ScoringContext) -> None:
+            runner.predict_context(context)
+            runner.shap_values(context)
+
+        score(single)
+        predict_ms = time_call(lambda: runner.predict_context(single), args.iterations)
+        single_ms = time_call(lambda: score(single), args.iterations)
+        batch_ms = time_call(lambda: score(batch), max(3, args.iterations // 50))
+        print(f"{engine:<10}{load_ms:>10.0f}{predict_ms:>15.3f}{single_ms:>13.3f}{batch_ms:>18.1f}")
+
+
+if __name__ == "__main__":
+    main()
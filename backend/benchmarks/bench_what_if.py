@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Latency of a what-if tweak (one changed lab value, base state cached) versus a
+full rescore of the edited payload. The result cache is disabled.
+
+Run from backend/:
+    python benchmarks/bench_what_if.py
+"""
+from __future__ import annotations
+
+import argparse
+import statistics
+import sys
+import time
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(BACKEND_DIR))
+
+import app.services.prediction_service as prediction_service  # noqa: E402
+
+BASE_PAYLOAD = {
+    "LBXHGB": 120,
+    "LBXMCVSI": 79,
+    "LBXMCHSI": 330,
+    "LBXRDW": 15.2,
+    "LBXRBCSI": 4.6,
+    "LBXHCT": 37,
+    "RIDAGEYR": 31,
+    "BMXBMI": 22.5,
+}
+CHANGES = [{"LBXHGB": 95}, {"LBXRDW": 18.4}, {"RIDAGEYR": 45}, {"LBXSGL": 6.1}]
+
+
+def time_call(fn, iterations: int) -> float:
+    timings = []
+    for _ in range(iterations):
+        started = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - started) * 1000)
+    return statistics.median(timings)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=200)
+    args = parser.parse_args()
+
+    prediction_service._PREDICTION_CACHE = prediction_service.PredictionCache(0, 0)
+    runner = prediction_service.get_runner()
+    prediction_service.warm_up_runner(runner)
+    prediction_service.predict_what_if(BASE_PAYLOAD, {}, base_key="bench")
+
+    print(f"engine={runner.engine} explanation_mode={runner.explanation_mode}")
+    print(f"{'change':<16}{'trees':>8}{'full ms':>10}{'what-if ms':>12}")
+    for changes in CHANGES:
+        edited = {**BASE_PAYLOAD, **changes}
+        full = time_call(lambda: prediction_service.predict_payload(edited), args.iterations)
+        what_if = time_call(
+            lambda: prediction_service.predict_what_if(BASE_PAYLOAD, changes, base_key="bench"), args.iterations
+        )
+        trees = prediction_service.predict_what_if(BASE_PAYLOAD, changes, base_key="bench").trees_rescored
+        print(f"{','.join(changes):<16}{trees:>8}{full:>10.3f}{what_if:>12.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""Pre-fork multi-worker serving: one gunicorn master, WEB_CONCURRENCY uvicorn workers.
+
+    gunicorn -c gunicorn.conf.py app.main:app
+
+The master imports the app, initializes the DB schema and loads and warms the
+model before forking, so workers share the model pages copy-on-write instead
+of each loading its own copy. Each worker still runs the app lifespan (process
+pool, model file watcher, readiness), which reuses the inherited model.
+"""
+import gc
+import os
+
+bind = os.getenv("GUNICORN_BIND", "0.0.0.0:8080")
+workers = int(os.getenv("WEB_CONCURRENCY", "2"))
+# uvicorn workers that keep serving already-accepted connections while they stop (app/core/server.py).
+worker_class = "app.core.server.DrainingUvicornWorker"
+# GUNICORN_PRELOAD=0 loads the app and model in every worker instead (for comparison).
+preload_app = os.getenv("GUNICORN_PRELOAD", "1") != "0"
+# POST /admin/models/reload swaps the model only in the worker that answers it; with several
+# workers the model file watcher is what brings every worker onto a replaced MODEL_PATH file.
+if workers > 1:
+    os.environ.setdefault("MODEL_WATCH_INTERVAL_SECONDS", "5")
+# A worker is recycled after this many requests plus up to the jitter, so workers do not restart together; 0 disables.
+max_requests = int(os.getenv("GUNICORN_MAX_REQUESTS", "5000"))
+max_requests_jitter = int(os.getenv("GUNICORN_MAX_REQUESTS_JITTER", "500"))
+# A recycled or stopped worker stops accepting connections and gets this long to finish
+# in-flight requests and the background analysis jobs they started.
+graceful_timeout = int(os.getenv("GUNICORN_GRACEFUL_TIMEOUT", "120"))
+timeout = int(os.getenv("GUNICORN_TIMEOUT", "120"))
+
+
+def on_starting(server):
+    if not preload_app:
+        return
+    from app.core.observability import log_event
+    from app.core.startup import process_memory
+    from app.db.database import engine, init_db
+    from app.services.prediction_service import preload_model
+
+    init_db()
+    # Pooled connections must not be shared by forked workers; each worker opens its own.
+    engine.dispose()
+    runner = preload_model()
+    # Objects that exist before the fork are never collected in workers, so the cyclic GC
+    # does not write to (and un-share) their pages.
+    gc.collect()
+    gc.freeze()
+    log_event("prefork_master_ready", model_name=runner.version, workers=server.num_workers, **process_memory())
+
+
+def post_fork(server, worker):
+    from app.core.startup import restart_startup_clock
+
+    restart_startup_clock()
+
+
+def worker_exit(server, worker):
+    from app.core.observability import log_event
+    from app.core.startup import process_memory
+
+    log_event("worker_exit", pid=worker.pid, **process_memory())
@@ -0,0 +1,79 @@
+import uuid
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, event, update
+from sqlalchemy.orm import sessionmaker
+
+from app.db.database import Base, init_db
+from app.db.models import Analysis
+from app.main import app
+from app.services import analyses_service, analysis_writes
+from app.services.analyses_service import CreateAnalysisRequest, create_analysis, list_analyses
+
+LAB = {"LBXHGB": 120, "LBXMCVSI": 79, "LBXMCHSI": 330, "LBXRDW": 15.2, "LBXRBCSI": 4.6, "LBXHCT": 37, "RIDAGEYR": 31, "BMXBMI": 22.5}
+UPLOAD = {"filename": "report.pdf", "content_type": "application/pdf", "size_bytes": 128000, "source": "web"}
+
+
+@pytest.fixture()
+def list_db(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    engine = create_engine(f"sqlite:///{tmp_path}/list.db", connect_args={"check_same_thread": False})
+    Base.metadata.create_all(bind=engine)
+    session_factory = sessionmaker(bind=engine, autoflush=False, autocommit=False)
+    monkeypatch.setattr(analyses_service, "SessionLocal", session_factory)
+    monkeypatch.setattr(analysis_writes, "SessionLocal", session_factory)
+    yield engine, session_factory
+    engine.dispose()
+
+
+def test_pages_cover_every_analysis_once_newest_first(list_db) -> None:
+    engine, session_factory = list_db
+    request = CreateAnalysisRequest.model_validate({"upload": UPLOAD, "lab": LAB})
+    analysis_ids = [create_analysis("list-user", request).analysis_id for _ in range(7)]
+    create_analysis("other-user", request)
+    # Three analyses share a timestamp, so pages must also be split inside a tie.
+    base = datetime(2026, 10, 1, 12, 0, 0)
+    created = [base, base, base + timedelta(seconds=1), base + timedelta(seconds=1), base + timedelta(seconds=1), base + timedelta(seconds=2), base + timedelta(seconds=3)]
+    with session_factory() as session:
+        for analysis_id, created_at in zip(analysis_ids, created):
+            session.execute(update(Analysis).where(Analysis.id == analysis_id).values(created_at=created_at))
+        session.commit()
+    expected = [analysis_id for _, analysis_id in sorted(zip(created, analysis_ids), reverse=True)]
+
+    statements: list[str] = []
+    event.listen(engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+    listed: list[str] = []
+    cursor = None
+    pages = 0
+    while True:
+        page = list_analyses("list-user", limit=3, cursor=cursor)
+        listed += [item.analysis_id for item in page.analyses]
+        pages += 1
+        cursor = page.next_cursor
+        if cursor is None:
+            break
+
+    assert listed == expected
+    assert pages == 3
+    assert all("payload" not in statement for statement in statements)
+
+
+def test_list_endpoint_validates_limit_and_cursor(list_db) -> None:
+    init_db()
+    client = TestClient(app)
+    register = client.post("/auth/register", json={"email": f"list-{uuid.uuid4().hex}@example.com", "password": "password123"})
+    headers = {"X-Authorization": f"Bearer {register.json()['access_token']}"}
+    for _ in range(3):
+        assert client.post("/analyses", json={"upload": UPLOAD, "lab": LAB}, headers=headers).status_code == 202
+
+    first = client.get("/analyses", params={"limit": 2}, headers=headers).json()
+    assert len(first["analyses"]) == 2 and first["next_cursor"]
+    last = client.get("/analyses", params={"limit": 2, "cursor": first["next_cursor"]}, headers=headers).json()
+    assert len(last["analyses"]) == 1 and last["next_cursor"] is None
+
+    invalid = client.get("/analyses", params={"cursor": "not-a-cursor"}, headers=headers)
+    assert invalid.status_code == 422
+    assert invalid.json()["detail"]["error_code"] == "invalid_cursor"
+    assert client.get("/analyses", params={"limit": 0}, headers=headers).status_code == 422
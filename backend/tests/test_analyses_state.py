@@ -0,0 +1,80 @@
+import uuid
+from datetime import datetime
+
+import pytest
+
+from app.db.database import SessionLocal, init_db
+from app.db.models import Analysis, AnalysisPayload, User
+from app.services import analyses_service
+from app.services.analyses_service import (
+    CreateAnalysisRequest,
+    create_analysis,
+    get_analysis_result,
+    get_analysis_status,
+    process_analysis_job,
+)
+from app.services.prediction_service import PredictionCache
+
+LAB = {"LBXHGB": 120, "LBXMCVSI": 79, "LBXMCHSI": 330, "LBXRDW": 15.2, "LBXRBCSI": 4.6, "LBXHCT": 37, "RIDAGEYR": 31, "BMXBMI": 22.5}
+UPLOAD = {"filename": "report.pdf", "content_type": "application/pdf", "size_bytes": 128000, "source": "web"}
+
+
+@pytest.fixture()
+def user_id() -> str:
+    init_db()
+    user_id = str(uuid.uuid4())
+    with SessionLocal() as session:
+        session.add(User(id=user_id, email=f"state-{user_id}@example.com", password_hash="x", created_at=datetime.utcnow()))
+        session.commit()
+    return user_id
+
+
+@pytest.fixture()
+def state_cache(monkeypatch: pytest.MonkeyPatch) -> PredictionCache:
+    cache = PredictionCache(max_size=4, ttl_seconds=60)
+    monkeypatch.setattr(analyses_service, "_ANALYSIS_STATES", cache)
+    return cache
+
+
+def _create(user_id: str) -> str:
+    return create_analysis(user_id, CreateAnalysisRequest.model_validate({"upload": UPLOAD, "lab": LAB})).analysis_id
+
+
+def _write_status(analysis_id: str, status: str, progress_stage: str) -> None:
+    # What another worker does to the shared row.
+    with SessionLocal() as session:
+        session.query(Analysis).filter(Analysis.id == analysis_id).update({"status": status, "progress_stage": progress_stage})
+        session.commit()
+
+
+def test_status_follows_db_written_by_other_workers(user_id: str, state_cache: PredictionCache) -> None:
+    analysis_id = _create(user_id)
+    assert get_analysis_status(user_id, analysis_id).status == "pending"
+
+    _write_status(analysis_id, "processing", "model_inference")
+    assert get_analysis_status(user_id, analysis_id).progress_stage == "model_inference"
+    assert state_cache.stats()["size"] == 0
+
+    process_analysis_job(analysis_id)  # not pending any more: owned by the other worker
+    assert get_analysis_status(user_id, analysis_id).status == "processing"
+
+    _write_status(analysis_id, "failed", "failed")
+    assert get_analysis_status(user_id, analysis_id).status == "failed"
+    assert get_analysis_status(user_id, analysis_id).status == "failed"
+    assert state_cache.stats()["hits"] == 1
+    assert get_analysis_status(str(uuid.uuid4()), analysis_id) is None
+
+
+def test_job_runs_once_and_cache_stays_bounded(user_id: str, state_cache: PredictionCache) -> None:
+    analysis_ids = [_create(user_id) for _ in range(6)]
+    for analysis_id in analysis_ids:
+        process_analysis_job(analysis_id)
+        process_analysis_job(analysis_id)
+        assert get_analysis_status(user_id, analysis_id).status == "completed"
+
+    with SessionLocal() as session:
+        payload = session.get(AnalysisPayload, analysis_ids[0])
+    assert get_analysis_result(user_id, analysis_ids[0]).model_dump() == payload.result_payload
+    stats = state_cache.stats()
+    assert stats["size"] == 4
+    assert stats["evictions"] == 2
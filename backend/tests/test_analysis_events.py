@@ -0,0 +1,103 @@
+import json
+import threading
+import time
+import uuid
+from datetime import datetime
+from pathlib import Path
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, update
+from sqlalchemy.orm import sessionmaker
+
+from app.api.v1 import analyses as analyses_router
+from app.db.database import Base, init_db
+from app.db.models import Analysis
+from app.main import app
+from app.services import analyses_service, analysis_events, analysis_queue, analysis_writes
+from app.services.analysis_events import AnalysisEventBus
+from app.services.analysis_worker import AnalysisWorker
+
+LAB = {"LBXHGB": 120, "LBXMCVSI": 79, "LBXMCHSI": 330, "LBXRDW": 15.2, "LBXRBCSI": 4.6, "LBXHCT": 37, "RIDAGEYR": 31, "BMXBMI": 22.5}
+UPLOAD = {"filename": "report.pdf", "content_type": "application/pdf", "size_bytes": 128000, "source": "web"}
+
+
+@pytest.fixture()
+def queue_db(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> sessionmaker:
+    engine = create_engine(f"sqlite:///{tmp_path}/events.db", connect_args={"check_same_thread": False})
+    Base.metadata.create_all(bind=engine)
+    session_factory = sessionmaker(bind=engine, autoflush=False, autocommit=False)
+    for module in (analysis_queue, analyses_service, analysis_events, analysis_writes):
+        monkeypatch.setattr(module, "SessionLocal", session_factory)
+    monkeypatch.setattr(analyses_router, "ANALYSIS_JOBS_INLINE", False)
+    yield session_factory
+    engine.dispose()
+
+
+@pytest.fixture()
+def bus(monkeypatch: pytest.MonkeyPatch) -> AnalysisEventBus:
+    bus = AnalysisEventBus(poll_seconds=0.05)
+    monkeypatch.setattr(analyses_router, "get_analysis_event_bus", lambda: bus)
+    monkeypatch.setattr(analysis_events, "get_analysis_event_bus", lambda: bus)
+    return bus
+
+
+@pytest.fixture()
+def client() -> TestClient:
+    init_db()
+    client = TestClient(app)
+    register = client.post("/auth/register", json={"email": f"events-{uuid.uuid4().hex}@example.com", "password": "password123"})
+    client.headers["X-Authorization"] = f"Bearer {register.json()['access_token']}"
+    return client
+
+
+def _later(delay: float, fn) -> threading.Thread:
+    thread = threading.Thread(target=lambda: (time.sleep(delay), fn()))
+    thread.start()
+    return thread
+
+
+def test_sse_stream_sends_transitions_until_finished(queue_db: sessionmaker, bus: AnalysisEventBus, client: TestClient) -> None:
+    bus.poll_seconds = 0  # in-process notifications only
+    analysis_id = client.post("/analyses", json={"upload": UPLOAD, "lab": LAB}).json()["analysis_id"]
+    worker = _later(0.3, AnalysisWorker(worker_id="events-worker").drain)
+
+    response = client.get(f"/analyses/{analysis_id}/events")  # returns once the stream closes
+    worker.join()
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/event-stream")
+    events = [json.loads(line[len("data: "):]) for line in response.text.splitlines() if line.startswith("data: ")]
+    assert events[0]["progress_stage"] == "queued"
+    assert events[-1]["status"] == "completed"
+    assert bus.stats()["watchers"] == 0
+    assert bus.stats()["db_polls"] == 0
+
+    assert client.get(f"/analyses/{uuid.uuid4()}/events").status_code == 404
+
+
+def test_long_poll_wakes_on_change_from_another_process(queue_db: sessionmaker, bus: AnalysisEventBus, client: TestClient) -> None:
+    analysis_id = client.post("/analyses", json={"upload": UPLOAD, "lab": LAB}).json()["analysis_id"]
+    wait_url = f"/analyses/{analysis_id}/wait"
+
+    assert client.get(wait_url).json()["progress_stage"] == "queued"  # nothing known yet: answers at once
+    started = time.monotonic()
+    assert client.get(wait_url, params={"progress_stage": "queued", "timeout": 0.2}).json()["progress_stage"] == "queued"
+    assert time.monotonic() - started >= 0.2
+
+    def _other_process_claims() -> None:
+        # Written straight to the DB, without this process's bus: only the DB poll can see it.
+        with queue_db() as session:
+            session.execute(
+                update(Analysis)
+                .where(Analysis.id == analysis_id)
+                .values(status="processing", progress_stage="model_inference", updated_at=datetime.utcnow())
+            )
+            session.commit()
+
+    writer = _later(0.3, _other_process_claims)
+    started = time.monotonic()
+    body = client.get(wait_url, params={"progress_stage": "queued", "timeout": 10}).json()
+    writer.join()
+    assert body["progress_stage"] == "model_inference"
+    assert time.monotonic() - started < 5
+    assert bus.stats()["db_polls"] > 0
@@ -0,0 +1,62 @@
+from pathlib import Path
+
+import pytest
+from sqlalchemy import create_engine, inspect, select, text
+from sqlalchemy.orm import sessionmaker
+
+from app.db import database
+from app.db.models import AnalysisPayload
+
+
+def test_init_db_copies_payload_columns_without_dropping_them(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    engine = create_engine(f"sqlite:///{tmp_path}/old.db", connect_args={"check_same_thread": False})
+    # `analyses` as created before analysis_payloads existed.
+    with engine.begin() as connection:
+        connection.execute(
+            text(
+                "CREATE TABLE analyses (id VARCHAR(36) PRIMARY KEY, user_id VARCHAR(36) NOT NULL, status VARCHAR(32) NOT NULL, "
+                "progress_stage VARCHAR(64) NOT NULL, error_message TEXT, failure_reason VARCHAR(64), input_payload JSON, "
+                "result_payload JSON, created_at DATETIME NOT NULL, updated_at DATETIME NOT NULL)"
+            )
+        )
+        connection.execute(text("CREATE INDEX ix_analyses_user_id ON analyses (user_id)"))
+        connection.execute(
+            text(
+                "INSERT INTO analyses (id, user_id, status, progress_stage, input_payload, result_payload, created_at, updated_at) VALUES "
+                "('done', 'u', 'completed', 'completed', :lab, '{\"risk_tier\": \"LOW\"}', '2026-01-01', '2026-01-01'), "
+                "('queued', 'u', 'pending', 'queued', :lab, NULL, '2026-01-02', '2026-01-02')"
+            ),
+            {"lab": '{"LBXHGB": 120}'},
+        )
+    monkeypatch.setattr(database, "engine", engine)
+
+    database.init_db()
+    # A pre-upgrade instance keeps writing the old columns during a rolling deploy.
+    with engine.begin() as connection:
+        connection.execute(text("UPDATE analyses SET status = 'completed', result_payload = '{\"risk_tier\": \"HIGH\"}' WHERE id = 'queued'"))
+        connection.execute(
+            text(
+                "INSERT INTO analyses (id, user_id, status, progress_stage, input_payload, created_at, updated_at) "
+                "VALUES ('late', 'u', 'pending', 'queued', :lab, '2026-01-03', '2026-01-03')"
+            ),
+            {"lab": '{"LBXHGB": 90}'},
+        )
+    database.init_db()
+    database.init_db()  # API and worker both run it at startup
+
+    # Startup only copies; the columns go with the migration once no old instance reads them.
+    columns = {column["name"] for column in inspect(engine).get_columns("analyses")}
+    assert {"input_payload", "result_payload"} <= columns
+    # ix_analyses_user_created leads with user_id.
+    indexes = {index["name"] for index in inspect(engine).get_indexes("analyses")}
+    assert "ix_analyses_user_created" in indexes
+    assert "ix_analyses_user_id" not in indexes
+    with sessionmaker(bind=engine)() as session:
+        payloads = {row.analysis_id: row for row in session.scalars(select(AnalysisPayload))}
+    assert set(payloads) == {"done", "queued", "late"}
+    assert payloads["done"].input_payload == {"LBXHGB": 120}
+    assert payloads["done"].result_payload == {"risk_tier": "LOW"}
+    assert payloads["queued"].result_payload == {"risk_tier": "HIGH"}
+    assert payloads["late"].input_payload == {"LBXHGB": 90}
+    assert payloads["late"].result_payload is None
+    engine.dispose()
@@ -0,0 +1,201 @@
+import threading
+import uuid
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, update
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.orm import sessionmaker
+
+from app.api.v1 import analyses as analyses_router
+from app.db.database import Base, init_db
+from app.db.models import Analysis, AnalysisPayload
+from app.main import app
+from app.services import analyses_service, analysis_queue, analysis_writes
+from app.services.analyses_service import CreateAnalysisRequest, create_analysis, run_analysis_job
+from app.services.analysis_queue import (
+    ANALYSIS_JOB_MAX_ATTEMPTS,
+    DEAD_LETTER_REASON,
+    claim_candidates_query,
+    claim_jobs,
+    complete_job,
+    retry_delay_seconds,
+)
+from app.services.analysis_worker import AnalysisWorker
+from app.services.prediction_service import predict_payload
+
+LAB = {"LBXHGB": 120, "LBXMCVSI": 79, "LBXMCHSI": 330, "LBXRDW": 15.2, "LBXRBCSI": 4.6, "LBXHCT": 37, "RIDAGEYR": 31, "BMXBMI": 22.5}
+UPLOAD = {"filename": "report.pdf", "content_type": "application/pdf", "size_bytes": 128000, "source": "web"}
+
+
+@pytest.fixture()
+def queue_db(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> sessionmaker:
+    # A queue of its own, so draining it never picks up analyses left by other tests.
+    engine = create_engine(f"sqlite:///{tmp_path}/queue.db", connect_args={"check_same_thread": False})
+    Base.metadata.create_all(bind=engine)
+    session_factory = sessionmaker(bind=engine, autoflush=False, autocommit=False)
+    monkeypatch.setattr(analysis_queue, "SessionLocal", session_factory)
+    monkeypatch.setattr(analyses_service, "SessionLocal", session_factory)
+    monkeypatch.setattr(analysis_writes, "SessionLocal", session_factory)
+    yield session_factory
+    engine.dispose()
+
+
+def _create(user_id: str = "queue-user") -> str:
+    return create_analysis(user_id, CreateAnalysisRequest.model_validate({"upload": UPLOAD, "lab": LAB})).analysis_id
+
+
+def _row(session_factory: sessionmaker, analysis_id: str) -> Analysis:
+    with session_factory() as session:
+        return session.get(Analysis, analysis_id)
+
+
+def _payload(session_factory: sessionmaker, analysis_id: str) -> AnalysisPayload:
+    with session_factory() as session:
+        return session.get(AnalysisPayload, analysis_id)
+
+
+def _set(session_factory: sessionmaker, analysis_id: str, **columns) -> None:
+    with session_factory() as session:
+        session.execute(update(Analysis).where(Analysis.id == analysis_id).values(**columns))
+        session.commit()
+
+
+def test_transient_failures_back_off_then_dead_letter(queue_db: sessionmaker, monkeypatch: pytest.MonkeyPatch) -> None:
+    def _timeout(_payload):
+        raise TimeoutError("model backend timed out")
+
+    monkeypatch.setattr(analyses_service, "predict_payload", _timeout)
+    monkeypatch.setattr(analyses_service, "predict_batch_payloads", _timeout)
+    analysis_ids = [_create(), _create()]
+    worker = AnalysisWorker(worker_id="test-worker")
+
+    assert worker.drain() == 2  # both retried later, not right away
+    for analysis_id in analysis_ids:
+        row = _row(queue_db, analysis_id)
+        assert (row.status, row.attempts, row.error_message) == ("pending", 1, "model backend timed out")
+        assert row.available_at > datetime.utcnow() + timedelta(seconds=retry_delay_seconds(1) - 1)
+    assert worker.drain() == 0
+    assert [retry_delay_seconds(attempt) for attempt in (1, 2, 3)] == [5, 10, 20]
+
+    monkeypatch.setattr(analysis_queue, "ANALYSIS_JOB_RETRY_BASE_SECONDS", 0)
+    for analysis_id in analysis_ids:
+        _set(queue_db, analysis_id, available_at=datetime.utcnow())
+    assert worker.drain() == 2 * (ANALYSIS_JOB_MAX_ATTEMPTS - 1)
+    for analysis_id in analysis_ids:
+        row = _row(queue_db, analysis_id)
+        assert (row.status, row.failure_reason, row.attempts) == ("failed", DEAD_LETTER_REASON, ANALYSIS_JOB_MAX_ATTEMPTS)
+    assert worker.stats() == {"processed": 2 * ANALYSIS_JOB_MAX_ATTEMPTS, "errors": 0}
+
+
+def test_expired_lease_is_reclaimed_and_stale_owner_is_fenced(queue_db: sessionmaker) -> None:
+    analysis_id = _create()
+    stale = claim_jobs("worker-a", analysis_id=analysis_id)[0]
+    assert claim_jobs("worker-b", analysis_id=analysis_id) == []  # leased
+
+    _set(queue_db, analysis_id, lease_expires_at=datetime.utcnow() - timedelta(seconds=1))
+    current = claim_jobs("worker-b", analysis_id=analysis_id)[0]
+    assert current.attempts == 2
+    assert not complete_job(stale, {"status": "ok"})
+    run_analysis_job(current)
+    row = _row(queue_db, analysis_id)
+    assert (row.status, row.claimed_by, row.lease_expires_at) == ("completed", current.lease_token, None)
+
+    # A job whose worker dies on every attempt is dead-lettered instead of run again.
+    crashing_id = _create()
+    _set(queue_db, crashing_id, status="processing", attempts=ANALYSIS_JOB_MAX_ATTEMPTS, lease_expires_at=datetime.utcnow() - timedelta(seconds=1))
+    run_analysis_job(claim_jobs("worker-c", analysis_id=crashing_id)[0])
+    row = _row(queue_db, crashing_id)
+    assert (row.status, row.failure_reason, _payload(queue_db, crashing_id).result_payload) == ("failed", DEAD_LETTER_REASON, None)
+
+
+def test_worker_scores_a_claimed_batch_in_one_call(queue_db: sessionmaker, monkeypatch: pytest.MonkeyPatch) -> None:
+    batch_sizes: list[int] = []
+    predict_batch_payloads = analyses_service.predict_batch_payloads
+
+    def _counting(rows: list[dict]):
+        batch_sizes.append(len(rows))
+        return predict_batch_payloads(rows)
+
+    monkeypatch.setattr(analyses_service, "predict_batch_payloads", _counting)
+    labs = [LAB, LAB | {"LBXHGB": 95, "RIDAGEYR": 58}, {"RIDAGEYR": 40}, LAB | {"LBXRDW": 18.1}]
+    analysis_ids = [
+        create_analysis("queue-user", CreateAnalysisRequest.model_validate({"upload": UPLOAD, "lab": lab})).analysis_id for lab in labs
+    ]
+    empty_id = _create()
+    with queue_db() as session:
+        session.execute(update(AnalysisPayload).where(AnalysisPayload.analysis_id == empty_id).values(input_payload={}))
+        session.commit()
+
+    assert AnalysisWorker(worker_id="test-worker", batch_size=8).drain() == 5
+    assert batch_sizes == [4]
+    for analysis_id in analysis_ids:
+        assert _row(queue_db, analysis_id).status == "completed"
+        payload = _payload(queue_db, analysis_id)
+        assert payload.result_payload == predict_payload(payload.input_payload).model_dump()
+    assert _payload(queue_db, analysis_ids[2]).result_payload["status"] == "needs_input"
+    assert _row(queue_db, empty_id).failure_reason == "empty_lab_payload"
+
+
+def test_failing_batch_is_retried_job_by_job(queue_db: sessionmaker, monkeypatch: pytest.MonkeyPatch) -> None:
+    def _broken_batch(_rows: list[dict]):
+        raise ValueError("batch scoring failed")
+
+    def _fails_for_old_patients(payload: dict):
+        if payload["RIDAGEYR"] > 80:
+            raise ValueError("unsupported age")
+        return predict_payload(payload)
+
+    monkeypatch.setattr(analyses_service, "predict_batch_payloads", _broken_batch)
+    monkeypatch.setattr(analyses_service, "predict_payload", _fails_for_old_patients)
+    good_ids = [_create(), _create()]
+    bad_id = create_analysis("queue-user", CreateAnalysisRequest.model_validate({"upload": UPLOAD, "lab": LAB | {"RIDAGEYR": 85}})).analysis_id
+
+    assert AnalysisWorker(worker_id="test-worker").drain() == 3
+    assert [_row(queue_db, analysis_id).status for analysis_id in good_ids] == ["completed", "completed"]
+    bad = _row(queue_db, bad_id)
+    assert (bad.status, bad.failure_reason, bad.attempts) == ("failed", "inference_error", 1)
+
+
+def test_concurrent_claimers_take_each_job_once(queue_db: sessionmaker) -> None:
+    analysis_ids = {_create() for _ in range(40)}
+    claimed: list[str] = []
+    lock = threading.Lock()
+
+    def _claim_all(worker_id: str) -> None:
+        while jobs := claim_jobs(worker_id, limit=3):
+            with lock:
+                claimed.extend(job.analysis_id for job in jobs)
+
+    threads = [threading.Thread(target=_claim_all, args=(f"worker-{index}",)) for index in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert sorted(claimed) == sorted(analysis_ids)
+    assert {_row(queue_db, analysis_id).attempts for analysis_id in analysis_ids} == {1}
+
+
+def test_postgres_claim_skips_locked_rows() -> None:
+    sql = str(claim_candidates_query(datetime.utcnow(), 5).compile(dialect=postgresql.dialect()))
+    assert sql.endswith("FOR UPDATE SKIP LOCKED")
+
+
+def test_api_leaves_jobs_to_worker_when_not_inline(queue_db: sessionmaker, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(analyses_router, "ANALYSIS_JOBS_INLINE", False)
+    init_db()
+    client = TestClient(app)
+    register = client.post("/auth/register", json={"email": f"queue-{uuid.uuid4().hex}@example.com", "password": "password123"})
+    headers = {"X-Authorization": f"Bearer {register.json()['access_token']}"}
+
+    created = client.post("/analyses", json={"upload": UPLOAD, "lab": LAB}, headers=headers)
+    assert created.status_code == 202
+    analysis_id = created.json()["analysis_id"]
+    assert client.get(f"/analyses/{analysis_id}", headers=headers).json()["status"] == "pending"
+
+    assert AnalysisWorker(worker_id="test-worker").drain() == 1
+    assert client.get(f"/analyses/{analysis_id}", headers=headers).json()["status"] == "completed"
+    assert client.get(f"/analyses/{analysis_id}/result", headers=headers).status_code == 200
@@ -0,0 +1,99 @@
+from pathlib import Path
+
+import pytest
+from sqlalchemy import create_engine, event, select, text, update
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import sessionmaker
+
+from app.db.database import Base
+from app.db.models import Analysis
+from app.services import analyses_service, analysis_queue, analysis_writes
+from app.services.analyses_service import (
+    CreateAnalysisRequest,
+    advance_analysis_state,
+    create_analysis,
+    get_analysis_status,
+    process_analysis_job,
+)
+from app.services.analysis_writes import GroupCommitWriter
+
+LAB = {"LBXHGB": 120, "LBXMCVSI": 79, "LBXMCHSI": 330, "LBXRDW": 15.2, "LBXRBCSI": 4.6, "LBXHCT": 37, "RIDAGEYR": 31, "BMXBMI": 22.5}
+UPLOAD = {"filename": "report.pdf", "content_type": "application/pdf", "size_bytes": 128000, "source": "web"}
+
+
+@pytest.fixture()
+def writes_db(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    engine = create_engine(f"sqlite:///{tmp_path}/writes.db", connect_args={"check_same_thread": False})
+    Base.metadata.create_all(bind=engine)
+    session_factory = sessionmaker(bind=engine, autoflush=False, autocommit=False)
+    for module in (analysis_queue, analyses_service, analysis_writes):
+        monkeypatch.setattr(module, "SessionLocal", session_factory)
+    yield engine, session_factory
+    engine.dispose()
+
+
+def _create(user_id: str = "writes-user") -> str:
+    return create_analysis(user_id, CreateAnalysisRequest.model_validate({"upload": UPLOAD, "lab": LAB})).analysis_id
+
+
+def _status(session_factory: sessionmaker, analysis_id: str) -> str | None:
+    with session_factory() as session:
+        return session.scalar(select(Analysis.status).where(Analysis.id == analysis_id))
+
+
+def test_concurrent_writes_share_one_commit_and_a_failing_write_fails_alone(writes_db) -> None:
+    _, session_factory = writes_db
+    analysis_ids = [_create() for _ in range(6)]
+    writer = GroupCommitWriter(session_factory, window_seconds=0.3)
+
+    futures = [
+        writer.submit(update(Analysis).where(Analysis.id == analysis_id).values(progress_stage="model_inference"))
+        for analysis_id in analysis_ids
+    ]
+    broken = writer.submit(text("UPDATE missing_table SET status = 'failed'"))
+    assert [future.result() for future in futures] == [1] * len(analysis_ids)
+    with pytest.raises(OperationalError):
+        broken.result()
+    writer.shutdown()
+
+    # One group of 7 failed as a whole, then every write ran on its own.
+    assert writer.stats() == {"queued": 0, "writes": 6, "commits": 6, "largest_group": 1, "failed_groups": 2}
+
+    writer = GroupCommitWriter(session_factory, window_seconds=0.3)
+    futures = [writer.submit(update(Analysis).where(Analysis.id == analysis_id).values(progress_stage="queued")) for analysis_id in analysis_ids]
+    assert [future.result() for future in futures] == [1] * len(analysis_ids)
+    writer.shutdown()
+    assert writer.stats()["commits"] == 1
+
+
+def test_write_behind_create_answers_before_commit(writes_db, monkeypatch: pytest.MonkeyPatch) -> None:
+    _, session_factory = writes_db
+    slow_writer = GroupCommitWriter(session_factory, window_seconds=0.3)
+    monkeypatch.setattr(analyses_service, "ANALYSIS_CREATE_WRITE_BEHIND", True)
+    monkeypatch.setattr(analyses_service, "get_analysis_writer", lambda: slow_writer)
+
+    analysis_id = _create()
+    assert _status(session_factory, analysis_id) is None  # not committed yet
+    assert get_analysis_status("writes-user", analysis_id).progress_stage == "queued"
+    assert get_analysis_status("someone-else", analysis_id) is None
+
+    process_analysis_job(analysis_id)  # waits for the insert, then claims and scores
+    assert _status(session_factory, analysis_id) == "completed"
+    assert analysis_id not in analyses_service._PENDING_CREATES
+    slow_writer.shutdown()
+
+
+def test_advance_analysis_state_writes_without_reading(writes_db) -> None:
+    engine, _ = writes_db
+    analysis_id = _create()
+    statements: list[str] = []
+    event.listen(engine, "before_cursor_execute", lambda *args: statements.append(args[2].split()[0]))
+
+    state = advance_analysis_state("writes-user", analysis_id, status="processing", progress_stage="model_inference")
+    assert (state.status, state.progress_stage) == ("processing", "model_inference")
+    assert statements == ["UPDATE"]
+
+    assert advance_analysis_state("someone-else", analysis_id, status="completed") is None
+    assert advance_analysis_state("writes-user", analysis_id, status="completed").status == "completed"
+    with pytest.raises(ValueError, match="completed -> processing"):
+        advance_analysis_state("writes-user", analysis_id, status="processing")
@@ -417,3 +417,77 @@ def test_latest_analysis_input_returns_saved_payload() -> None:
     assert body["analysis_id"] == analysis_id
     assert body["input_payload"]["LBXHGB"] == 120
     assert body["input_payload"]["BMXBMI"] == 22.5
+
+
+def test_predict_batch_matches_single_row_responses() -> None:
+    client = TestClient(app)
+
+    missing_bmi = _required_min_payload()
+    missing_bmi.pop("BMXBMI")
+    rows = [
+        _required_min_payload(),
+        missing_bmi,
+        _required_min_payload() | {"BMXBMI": None, "BMXHT": 165, "BMXWT": 62, "RIAGENDR": 1},
+        _required_min_payload() | {"RIDAGEYR": -1},
+    ]
+
+    batch = client.post("/v1/risk/predict/batch", json={"rows": rows})
+
+    assert batch.status_code == 200
+    results = batch.json()["results"]
+    assert len(results) == len(rows)
+    for row, result in zip(rows, results):
+        single = client.post("/v1/risk/predict", json=row)
+        assert single.status_code == 200
+        assert result == single.json()
+    assert [result["status"] for result in results] == ["ok", "needs_input", "ok", "needs_input"]
+
+
+def test_predict_batch_rejects_empty_rows() -> None:
+    client = TestClient(app)
+
+    resp = client.post("/v1/risk/predict/batch", json={"rows": []})
+
+    assert resp.status_code == 422
+
+
+def test_predict_payload_normalizes_input_once(monkeypatch) -> None:
+    import app.services.prediction_service as prediction_service
+
+    calls = []
+    original_normalize = prediction_service.normalize_input
+
+    def _counting_normalize(data: dict) -> dict:
+        calls.append(data)
+        return original_normalize(data)
+
+    monkeypatch.setattr(prediction_service, "normalize_input", _counting_normalize)
+
+    response = prediction_service.predict_payload(_required_min_payload())
+
+    assert response.status == "ok"
+    assert len(calls) == 1
+
+
+def test_ready_endpoint_reports_503_until_model_is_warmed_up() -> None:
+    from app.core import readiness
+
+    readiness.mark_not_ready("warming_up")
+    client = TestClient(app)
+
+    resp = client.get("/ready")
+    assert resp.status_code == 503
+    assert resp.json() == {"status": "warming_up"}
+    assert client.get("/health").status_code == 200
+
+
+def test_lifespan_warms_up_model_and_marks_ready() -> None:
+    from app.core import readiness
+
+    readiness.mark_not_ready()
+    with TestClient(app) as client:
+        assert readiness.wait_until_ready(timeout=30)
+        resp = client.get("/ready")
+
+    assert resp.status_code == 200
+    assert resp.json() == {"status": "ready"}
@@ -0,0 +1,105 @@
+import asyncio
+import json
+
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.services.bulk_scoring import stream_bulk_predictions
+from app.services.prediction_service import predict_payload
+
+LAB_ROW = {
+    "LBXHGB": 120,
+    "LBXMCVSI": 79,
+    "LBXMCHSI": 330,
+    "LBXRDW": 15.2,
+    "LBXRBCSI": 4.6,
+    "LBXHCT": 37,
+    "RIDAGEYR": 31,
+    "BMXBMI": 22.5,
+}
+
+
+def _lines(body: str) -> list[dict]:
+    return [json.loads(line) for line in body.splitlines()]
+
+
+async def _direct(fn, *args):
+    return fn(*args)
+
+
+def test_bulk_csv_streams_one_result_per_row() -> None:
+    header = ",".join(LAB_ROW)
+    valid = ",".join(str(value) for value in LAB_ROW.values())
+    body = "\n".join([header, valid, "120,,,,,,,", "abc,79,330,15.2,4.6,37,31,22.5", "1,2"]) + "\n"
+
+    with TestClient(app) as client:
+        response = client.post("/v1/risk/predict/bulk", content=body, headers={"Content-Type": "text/csv"})
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    results = _lines(response.text)
+    assert [result["row"] for result in results] == [0, 1, 2, 3]
+    expected = predict_payload(dict(LAB_ROW)).model_dump()
+    assert {key: value for key, value in results[0].items() if key != "row"} == expected
+    assert results[1]["error_code"] == "needs_input"
+    assert results[2]["error_code"] == "invalid_row"
+    assert results[2]["invalid_fields"][0]["field"] == "LBXHGB"
+    assert results[3]["message"] == "Row has 2 cells, header has 8"
+
+
+def test_bulk_ndjson_reports_malformed_rows_in_place() -> None:
+    body = "\n".join([json.dumps(LAB_ROW), "{not json", "[1, 2]", "", json.dumps({**LAB_ROW, "RIAGENDR": 1})])
+
+    with TestClient(app) as client:
+        response = client.post("/v1/risk/predict/bulk", content=body, headers={"Content-Type": "application/x-ndjson"})
+
+    results = _lines(response.text)
+    assert [result["status"] for result in results] == ["ok", "needs_input", "needs_input", "ok"]
+    assert results[1]["message"] == "Row is not valid JSON"
+    assert results[2]["message"] == "Row must be a JSON object"
+
+
+def test_bulk_rejects_unsupported_content_type() -> None:
+    with TestClient(app) as client:
+        response = client.post("/v1/risk/predict/bulk", json=[LAB_ROW])
+
+    assert response.status_code == 415
+    assert response.json()["detail"]["error_code"] == "unsupported_media_type"
+
+
+def test_bulk_results_are_yielded_before_the_upload_ends() -> None:
+    received: list[int] = []
+
+    async def upload():
+        for index in range(7):
+            received.append(index)
+            yield (json.dumps(LAB_ROW) + "\n").encode()
+
+    async def collect() -> list[tuple[int, list[dict]]]:
+        outputs = []
+        async for output in stream_bulk_predictions(upload(), "ndjson", run=_direct, chunk_rows=4, first_chunk_rows=1):
+            outputs.append((len(received), _lines(output.decode())))
+        return outputs
+
+    outputs = asyncio.run(collect())
+
+    # Chunks of 1, 2 and 4 rows are scored as soon as enough lines have arrived.
+    assert [(parts_read, len(lines)) for parts_read, lines in outputs] == [(1, 1), (3, 2), (7, 4)]
+    assert [result["row"] for _, lines in outputs for result in lines] == list(range(7))
+
+
+def test_bulk_stops_on_oversized_line() -> None:
+    async def upload():
+        yield (json.dumps(LAB_ROW) + "\n").encode()
+        yield b"x" * 100
+
+    async def collect() -> list[dict]:
+        results = []
+        async for output in stream_bulk_predictions(upload(), "ndjson", run=_direct, chunk_rows=1, max_line_bytes=50):
+            results.extend(_lines(output.decode()))
+        return results
+
+    results = asyncio.run(collect())
+
+    assert [result["status"] for result in results] == ["ok", "needs_input"]
+    assert results[1]["message"] == "Line exceeds 50 bytes"
@@ -5,7 +5,8 @@ import yaml
 from fastapi.testclient import TestClient
 
 from app.main import app
-from app.db.database import init_db
+from app.db.database import SessionLocal, init_db
+from app.db.models import Analysis, AnalysisPayload
 from app.services import analyses_service
 from app.services.analyses_service import process_analysis_job
 
@@ -98,6 +99,17 @@ def _base_predict_payload() -> dict:
     }
 
 
+def _force_analysis_state(analysis_id: str, **columns) -> None:
+    """Rewind a stored analysis (the background task has already run it) and drop cached states."""
+    payload_columns = {name: columns.pop(name) for name in ("input_payload", "result_payload") if name in columns}
+    with SessionLocal() as session:
+        session.query(Analysis).filter(Analysis.id == analysis_id).update(columns)
+        if payload_columns:
+            session.query(AnalysisPayload).filter(AnalysisPayload.analysis_id == analysis_id).update(payload_columns)
+        session.commit()
+    analyses_service.get_analysis_state_cache().clear()
+
+
 def test_e2e_auth_analyses_and_result_flow_contract() -> None:
     init_db()
     client = TestClient(app)
@@ -214,9 +226,7 @@ def test_e2e_analysis_failed_job_exposes_diagnostic_and_blocks_result() -> None:
     assert create_response.status_code == 202
     analysis_id = create_response.json()["analysis_id"]
 
-    analyses_service._ANALYSES[analysis_id].status = "pending"
-    analyses_service._ANALYSES[analysis_id].progress_stage = "queued"
-    analyses_service._ANALYSES[analysis_id].result = None
+    _force_analysis_state(analysis_id, status="pending", progress_stage="queued", result_payload=None)
 
     original_predict = analyses_service.predict_payload
     try:
@@ -266,8 +276,7 @@ def test_e2e_analysis_result_before_completion_returns_409() -> None:
     assert create_response.status_code == 202
     analysis_id = create_response.json()["analysis_id"]
 
-    analyses_service._ANALYSES[analysis_id].status = "processing"
-    analyses_service._ANALYSES[analysis_id].progress_stage = "model_inference"
+    _force_analysis_state(analysis_id, status="processing", progress_stage="model_inference")
 
     result_response = client.get(f"/analyses/{analysis_id}/result", headers=headers)
     assert result_response.status_code == 409
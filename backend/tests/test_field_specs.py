@@ -0,0 +1,81 @@
+import random
+
+import numpy as np
+import pytest
+
+from app.services import prediction_service as ps
+from app.services.field_specs import FIELD_SPECS, FieldEngine
+
+_BASE = {
+    "LBXHGB": 120, "LBXMCVSI": 79, "LBXMCHSI": 330, "LBXRDW": 15.2, "LBXRBCSI": 4.6,
+    "LBXHCT": 37, "RIDAGEYR": 31, "BMXHT": 165, "BMXWT": 62, "RIAGENDR": 2,
+    "LBXSGL": 5.4, "LBXSCH": 190, "LBXPLTSI": 250, "LBXWBCSI": 6.1, "LBXSCR": 80,
+}
+# Values around every unit threshold plus the ones validation must reject.
+_EDGE_VALUES = [
+    None, 0, 0.0, -1.0, 1e-9, 10, 10.5, 24.99, 25, 25.01, 50, 50.5, 100, 100.5, 330,
+    True, float("nan"), float("inf"), "12", "abc",
+]
+
+
+def _edge_payloads(count: int) -> list[dict]:
+    rng = random.Random(13)
+    names = [spec.name for spec in FIELD_SPECS]
+    payloads = [dict(_BASE), {}, {"RIAGENDR": 1}]
+    for _ in range(count):
+        payload = dict(_BASE)
+        for name in rng.sample(names, rng.randint(1, 6)):
+            payload[name] = rng.choice(_EDGE_VALUES)
+        payload["RIAGENDR"] = rng.choice([None, 1, 2, 3, 1.0])
+        if rng.random() < 0.3:
+            payload.pop("BMXBMI", None)
+            payload[rng.choice(["BMXHT", "BMXWT"])] = rng.choice([None, 0, 170.0])
+        payloads.append(payload)
+    return payloads
+
+
+def test_field_specs_cover_every_model_feature() -> None:
+    assert {spec.name for spec in FIELD_SPECS if spec.model_feature} == set(ps.FEATURES)
+    with pytest.raises(ValueError):
+        FieldEngine(FIELD_SPECS[:-4], ps.FEATURES)
+
+
+def test_columnar_batch_matches_per_payload_rules() -> None:
+    payloads = _edge_payloads(2000)
+    batch = ps.FIELD_ENGINE.prepare_rows(payloads)
+
+    for position, payload in enumerate(payloads):
+        rejected, confidence = ps._precheck_payload(payload)
+        assert bool(batch.scorable[position]) == (rejected is None), payload
+        assert batch.confidence[position] == confidence, payload
+        if rejected is not None:
+            continue
+
+        normalized = ps.prepare_model_input(payload)
+        rows = np.asarray([position])
+        np.testing.assert_array_equal(
+            ps.FIELD_ENGINE.model_features(batch, rows)[0],
+            ps.ScoringContext([payload], "numpy").features[0],
+        )
+        np.testing.assert_array_equal(ps.FIELD_ENGINE.feature_rows(batch, rows)[0], ps.FIELD_ENGINE.feature_row(normalized))
+        assert 1.5 - batch.penalty[position] == ps._clinical_adjustment(1.5, payload, normalized), payload
+
+
+def test_numpy_columns_are_accepted() -> None:
+    columns = {name: np.asarray([value, np.nan]) for name, value in _BASE.items()}
+    batch = ps.FIELD_ENGINE.prepare_columns(columns, 2)
+
+    assert batch.scorable.tolist() == [True, False]
+    assert ps.FIELD_ENGINE.model_features(batch)[0].tolist() == pytest.approx(
+        ps.ScoringContext([_BASE], "numpy").features[0].tolist(), nan_ok=True
+    )
+
+
+def test_batch_and_single_predictions_share_cache_entries() -> None:
+    ps._PREDICTION_CACHE.clear()
+    batch = ps.predict_batch_payloads([_BASE, {"LBXHGB": 120}])
+
+    assert batch[1].status == "needs_input"
+    hits = ps._PREDICTION_CACHE.hits
+    assert ps.predict_payload(dict(_BASE)) is batch[0]
+    assert ps._PREDICTION_CACHE.hits == hits + 1
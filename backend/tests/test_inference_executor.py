@@ -0,0 +1,136 @@
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+
+import app.api.v1.admin as admin_api
+import app.api.v1.predict as predict_api
+import app.services.prediction_service as prediction_service
+from app.core import dependencies
+from app.main import app
+from app.services.inference_executor import InferenceExecutor, InferenceOverloadedError
+from app.services.inference_scheduler import InferenceScheduler
+
+
+def _lab_payload() -> dict:
+    return {
+        "LBXHGB": 120,
+        "LBXMCVSI": 79,
+        "LBXMCHSI": 330,
+        "LBXRDW": 15.2,
+        "LBXRBCSI": 4.6,
+        "LBXHCT": 37,
+        "RIDAGEYR": 31,
+        "BMXBMI": 22.5,
+    }
+
+
+def _saturate(executor: InferenceExecutor) -> threading.Event:
+    release = threading.Event()
+    for _ in range(executor.workers + executor.queue_size):
+        executor.submit(release.wait)
+    return release
+
+
+def test_executor_rejects_when_backlog_is_full() -> None:
+    executor = InferenceExecutor(workers=1, queue_size=1, retry_after_seconds=3)
+    release = _saturate(executor)
+    try:
+        with pytest.raises(InferenceOverloadedError) as exc_info:
+            executor.submit(lambda: None)
+        assert exc_info.value.retry_after_seconds == 3
+        assert executor.stats()["rejected"] == 1
+        release.set()
+        assert executor.call(lambda: 42) == 42
+    finally:
+        release.set()
+        executor.shutdown()
+
+    assert executor.stats()["in_flight"] == 0
+
+
+def test_bulk_chunks_wait_for_a_slot_without_holding_a_thread(monkeypatch: pytest.MonkeyPatch) -> None:
+    executor = InferenceExecutor(workers=1, queue_size=0)
+    monkeypatch.setattr(predict_api, "get_inference_executor", lambda: executor)
+    release = _saturate(executor)
+
+    async def _stream() -> list[int]:
+        # One thread in the shared pool that sync endpoints and run_in_threadpool use.
+        asyncio.get_running_loop().set_default_executor(ThreadPoolExecutor(max_workers=1))
+        chunks = [asyncio.create_task(predict_api._run_bulk_chunk(lambda index: index, index)) for index in range(3)]
+        dropped = asyncio.create_task(predict_api._run_bulk_chunk(lambda: -1))
+        await asyncio.sleep(0.05)
+        assert await asyncio.wait_for(asyncio.to_thread(lambda: "free"), timeout=1) == "free"
+        dropped.cancel()  # a client that disconnects mid-upload
+        release.set()
+        return await asyncio.gather(*chunks)
+
+    try:
+        assert asyncio.run(_stream()) == [0, 1, 2]
+    finally:
+        release.set()
+        executor.shutdown()
+
+    assert executor.stats()["in_flight"] == 0
+    assert executor.stats()["completed"] == 4
+
+
+def test_predict_returns_503_with_retry_after_when_overloaded(monkeypatch: pytest.MonkeyPatch) -> None:
+    executor = InferenceExecutor(workers=1, queue_size=0, retry_after_seconds=2)
+    monkeypatch.setattr(predict_api, "get_inference_executor", lambda: executor)
+    release = _saturate(executor)
+    try:
+        client = TestClient(app)
+        response = client.post("/v1/risk/predict", json=_lab_payload())
+    finally:
+        release.set()
+        executor.shutdown()
+
+    assert response.status_code == 503
+    assert response.headers["retry-after"] == "2"
+    assert response.json()["detail"]["error_code"] == "inference_overloaded"
+
+
+def test_predict_runs_on_inference_executor(monkeypatch: pytest.MonkeyPatch) -> None:
+    executor = InferenceExecutor(workers=1, queue_size=4)
+    monkeypatch.setattr(predict_api, "get_inference_executor", lambda: executor)
+    monkeypatch.setattr(admin_api, "get_inference_executor", lambda: executor)
+    monkeypatch.setattr(dependencies, "ADMIN_API_TOKEN", "s3cret")
+    try:
+        client = TestClient(app)
+        response = client.post("/v1/risk/predict", json=_lab_payload())
+        stats = client.get("/admin/inference/stats", headers={"X-Admin-Token": "s3cret"})
+    finally:
+        executor.shutdown()
+
+    assert response.status_code == 200
+    assert response.json()["status"] == "ok"
+    assert stats.json()["completed"] == 1
+
+
+def test_micro_batched_predict_does_not_hold_a_worker_while_waiting(monkeypatch: pytest.MonkeyPatch) -> None:
+    executor = InferenceExecutor(workers=1, queue_size=32)
+    scheduler = InferenceScheduler(prediction_service._score_scheduled_batch, window_seconds=0.5, max_batch_size=64)
+    monkeypatch.setattr(predict_api, "get_inference_executor", lambda: executor)
+    monkeypatch.setattr(predict_api, "get_inference_scheduler", lambda: scheduler)
+    monkeypatch.setattr(prediction_service, "_PREDICTION_CACHE", prediction_service.PredictionCache(0, 0))
+
+    async def _post_all() -> list[httpx.Response]:
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+            return await asyncio.gather(
+                *(client.post("/v1/risk/predict", json={**_lab_payload(), "LBXHGB": 100 + index}) for index in range(12))
+            )
+
+    try:
+        responses = asyncio.run(_post_all())
+    finally:
+        scheduler.stop()
+        executor.shutdown()
+
+    assert [response.status_code for response in responses] == [200] * 12
+    # One worker, yet the requests were scored together rather than one at a time.
+    assert scheduler.stats()["largest_batch"] >= 8
+    assert executor.stats()["in_flight"] == 0
@@ -0,0 +1,116 @@
+import os
+import shutil
+import signal
+import time
+from pathlib import Path
+
+import pytest
+
+import app.services.prediction_service as prediction_service
+from app.services.inference_pool import ProcessInferencePool
+from app.services.prediction_service import WARMUP_PAYLOADS, ModelRunner, ScoringContext
+
+MODEL_FILE = Path(__file__).resolve().parents[1] / "ironrisk_bi_reg_29n.cbm"
+
+
+@pytest.fixture(scope="module")
+def process_pool():
+    pool = ProcessInferencePool(prediction_service.get_runner(), processes=1).start()
+    yield pool
+    pool.shutdown()
+
+
+def test_process_pool_matches_in_process_scoring(process_pool: ProcessInferencePool) -> None:
+    runner = prediction_service.get_runner()
+    context = ScoringContext(WARMUP_PAYLOADS)
+
+    predictions, explanations = process_pool.score(context.features)
+
+    assert predictions == runner.predict_context(context)
+    assert explanations == runner.explain_context(context)
+
+
+def test_process_pool_recovers_from_worker_crash(process_pool: ProcessInferencePool) -> None:
+    context = ScoringContext(WARMUP_PAYLOADS)
+    expected, _ = process_pool.score(context.features)
+    restarts = process_pool.restarts
+
+    (pid,) = process_pool.worker_pids()
+    os.kill(pid, signal.SIGKILL)
+    time.sleep(0.2)
+
+    predictions, _ = process_pool.score(context.features)
+    assert predictions == expected
+    assert process_pool.restarts == restarts + 1
+    assert pid not in process_pool.worker_pids()
+
+
+def test_predict_payload_uses_process_pool(process_pool: ProcessInferencePool, monkeypatch: pytest.MonkeyPatch) -> None:
+    payload = dict(WARMUP_PAYLOADS[0])
+    monkeypatch.setattr(prediction_service, "_PREDICTION_CACHE", prediction_service.PredictionCache(0, 0))
+    inline = prediction_service.predict_payload(payload)
+
+    calls = []
+    original_score = process_pool.score
+    monkeypatch.setattr(process_pool, "score", lambda features: calls.append(features) or original_score(features))
+    monkeypatch.setattr(prediction_service, "_PROCESS_POOL", process_pool)
+
+    assert prediction_service.predict_payload(payload).model_dump() == inline.model_dump()
+    assert len(calls) == 1
+
+
+def test_process_pool_restarts_in_background_onto_every_worker() -> None:
+    runner = prediction_service.get_runner()
+    pool = ProcessInferencePool(runner, processes=2).start()
+    try:
+        first_pids = pool.worker_pids()
+        assert len(first_pids) == 2
+
+        started = time.perf_counter()
+        thread = pool.restart_in_background(runner)
+        # Spawning and warming two workers takes seconds; the caller (a model swap) must not wait for it.
+        assert time.perf_counter() - started < 0.5
+        assert pool.restarts == 0
+        thread.join()
+
+        assert pool.restarts == 1
+        new_pids = pool.worker_pids()
+        assert len(new_pids) == 2 and not new_pids & first_pids
+    finally:
+        pool.shutdown()
+
+
+def test_process_pool_refuses_workers_respawned_on_a_changed_model_file(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    if not MODEL_FILE.exists():
+        pytest.skip("model artifact is not available")
+    from catboost import CatBoostRegressor
+
+    model_path = tmp_path / "model.cbm"
+    shutil.copy(MODEL_FILE, model_path)
+    runner = ModelRunner(model_path)
+    context = ScoringContext(WARMUP_PAYLOADS)
+    expected = runner.predict_context(context)
+    pool = ProcessInferencePool(runner, processes=1).start()
+    monkeypatch.setattr(prediction_service, "_PROCESS_POOL", pool)
+    try:
+        # The file changes under the running runner, then the worker crashes and is respawned from it.
+        smaller = CatBoostRegressor()
+        smaller.load_model(str(MODEL_FILE))
+        smaller.shrink(ntree_end=100)
+        smaller.save_model(str(model_path))
+        (pid,) = pool.worker_pids()
+        os.kill(pid, signal.SIGKILL)
+        time.sleep(0.2)
+
+        predictions, _ = prediction_service._score_context(runner, context)
+
+        assert predictions == expected
+        assert pool.version is None
+        calls = []
+        monkeypatch.setattr(pool, "score", lambda features: calls.append(features))
+        prediction_service._score_context(runner, context)
+        assert calls == []  # refused: later calls do not even try the pool
+    finally:
+        pool.shutdown()
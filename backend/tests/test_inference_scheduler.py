@@ -0,0 +1,102 @@
+import threading
+import time
+
+import pytest
+
+import app.services.prediction_service as prediction_service
+from app.services.inference_scheduler import InferenceScheduler
+
+
+def _lab_payload(hgb: float) -> dict:
+    return {
+        "LBXHGB": hgb,
+        "LBXMCVSI": 79,
+        "LBXMCHSI": 330,
+        "LBXRDW": 15.2,
+        "LBXRBCSI": 4.6,
+        "LBXHCT": 37,
+        "RIDAGEYR": 31,
+        "BMXBMI": 22.5,
+    }
+
+
+def _run_concurrently(target, count: int) -> list:
+    results: list = [None] * count
+    barrier = threading.Barrier(count)
+
+    def worker(position: int) -> None:
+        barrier.wait()
+        try:
+            results[position] = target(position)
+        except Exception as exc:  # noqa: BLE001
+            results[position] = exc
+
+    threads = [threading.Thread(target=worker, args=(position,)) for position in range(count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results
+
+
+def test_scheduler_groups_concurrent_items_into_one_batch() -> None:
+    seen_batches: list[list[int]] = []
+
+    def score(items: list[int]) -> list[int]:
+        seen_batches.append(items)
+        return [item * 2 for item in items]
+
+    scheduler = InferenceScheduler(score, window_seconds=0.2, max_batch_size=16)
+    try:
+        results = _run_concurrently(scheduler.run, 8)
+    finally:
+        scheduler.stop()
+
+    assert results == [position * 2 for position in range(8)]
+    assert len(seen_batches) == 1
+    assert sorted(seen_batches[0]) == list(range(8))
+    assert scheduler.stats()["largest_batch"] == 8
+
+
+def test_scheduler_respects_max_batch_size() -> None:
+    scheduler = InferenceScheduler(lambda items: items, window_seconds=0.2, max_batch_size=3)
+    try:
+        results = _run_concurrently(scheduler.run, 7)
+    finally:
+        scheduler.stop()
+
+    assert results == list(range(7))
+    assert scheduler.stats()["largest_batch"] <= 3
+
+
+def test_scheduler_failure_reaches_every_waiter() -> None:
+    def score(items: list[int]) -> list[int]:
+        raise RuntimeError("model exploded")
+
+    scheduler = InferenceScheduler(score, window_seconds=0.2, max_batch_size=16)
+    try:
+        results = _run_concurrently(scheduler.run, 4)
+    finally:
+        scheduler.stop()
+
+    assert all(isinstance(result, RuntimeError) for result in results)
+
+
+def test_micro_batched_predictions_match_inline_scoring(monkeypatch: pytest.MonkeyPatch) -> None:
+    payloads = [_lab_payload(100 + position * 5) for position in range(6)]
+    monkeypatch.setattr(prediction_service, "_PREDICTION_CACHE", prediction_service.PredictionCache(0, 0))
+
+    monkeypatch.setattr(prediction_service, "INFERENCE_BATCH_WINDOW_MS", 0)
+    prediction_service.get_inference_scheduler.cache_clear()
+    inline = [prediction_service.predict_payload(payload) for payload in payloads]
+
+    monkeypatch.setattr(prediction_service, "INFERENCE_BATCH_WINDOW_MS", 200)
+    prediction_service.get_inference_scheduler.cache_clear()
+    try:
+        batched = _run_concurrently(lambda position: prediction_service.predict_payload(payloads[position]), 6)
+        stats = prediction_service.get_inference_scheduler().stats()
+    finally:
+        prediction_service.shutdown_inference_scheduler()
+
+    assert stats["batches"] < len(payloads)
+    assert [response.model_dump() for response in batched] == [response.model_dump() for response in inline]
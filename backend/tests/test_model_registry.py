@@ -0,0 +1,202 @@
+import shutil
+import threading
+import time
+from pathlib import Path
+
+import pytest
+from fastapi.testclient import TestClient
+
+import app.core.dependencies as dependencies
+import app.services.prediction_service as prediction_service
+from app.main import app
+from app.services.model_registry import ModelRegistry, resolve_model_file
+from app.services.prediction_service import ModelRunner, warm_up_runner
+
+MODEL_FILE = Path(__file__).resolve().parents[1] / "ironrisk_bi_reg_29n.cbm"
+
+
+@pytest.fixture
+def model_dir(tmp_path: Path) -> Path:
+    if not MODEL_FILE.exists():
+        pytest.skip("model artifact is not available")
+    from catboost import CatBoostRegressor
+
+    shutil.copy(MODEL_FILE, tmp_path / "current.cbm")
+    smaller = CatBoostRegressor()
+    smaller.load_model(str(MODEL_FILE))
+    smaller.shrink(ntree_end=100)
+    smaller.save_model(str(tmp_path / "next.cbm"))
+    return tmp_path
+
+
+def _registry(path: Path, swaps: list | None = None) -> ModelRegistry:
+    return ModelRegistry(
+        path,
+        loader=ModelRunner,
+        warm_up=warm_up_runner,
+        on_swap=(swaps.append if swaps is not None else None),
+    )
+
+
+def test_reload_swaps_atomically_and_keeps_in_flight_runner(model_dir: Path) -> None:
+    swaps: list = []
+    registry = _registry(model_dir / "current.cbm", swaps)
+    in_flight = registry.active()
+
+    status = registry.reload(model_dir / "next.cbm", wait=True)
+
+    assert status.state == "completed"
+    assert registry.active() is not in_flight
+    assert registry.active().version.startswith("next.cbm@")
+    assert in_flight.version.startswith("current.cbm@")
+    assert in_flight.model is not None
+    assert [runner.version for runner in swaps] == [in_flight.version, registry.active().version]
+    assert {info.version for info in registry.versions()} == {in_flight.version, registry.active().version}
+
+    registry.activate(in_flight.version)
+    assert registry.active() is in_flight
+
+
+def test_activate_waits_for_reload_in_progress(model_dir: Path) -> None:
+    registry = _registry(model_dir / "current.cbm")
+    current = registry.active()
+    registry.reload(model_dir / "next.cbm", wait=True)
+    loading, proceed = threading.Event(), threading.Event()
+
+    def _slow_loader(path: Path) -> ModelRunner:
+        loading.set()
+        proceed.wait(timeout=30)
+        return ModelRunner(path)
+
+    registry._loader = _slow_loader
+    registry.reload(model_dir / "next.cbm")
+    assert loading.wait(timeout=30)
+    activation = threading.Thread(target=registry.activate, args=(current.version,))
+    activation.start()
+    time.sleep(0.1)
+    proceed.set()
+    activation.join(timeout=30)
+
+    # The reload began first; the activation requested meanwhile is applied after it.
+    assert registry.active() is current
+    assert registry.reload_status.state == "completed"
+
+
+def test_failed_reload_keeps_current_model(model_dir: Path) -> None:
+    registry = _registry(model_dir / "current.cbm")
+    current = registry.active()
+    (model_dir / "broken.cbm").write_bytes(b"not a model")
+
+    missing = registry.reload(model_dir / "missing.cbm", wait=True)
+    broken = registry.reload(model_dir / "broken.cbm", wait=True)
+
+    assert missing.state == "failed"
+    assert broken.state == "failed"
+    assert registry.active() is current
+
+
+def test_watcher_reloads_when_model_file_changes(model_dir: Path) -> None:
+    watched = model_dir / "current.cbm"
+    registry = _registry(watched)
+    original = registry.active().version
+    assert registry.start_watching(0.05)
+    try:
+        shutil.copy(model_dir / "next.cbm", watched)
+        deadline = time.monotonic() + 30
+        while registry.active().version == original and time.monotonic() < deadline:
+            time.sleep(0.05)
+    finally:
+        registry.stop_watching()
+
+    assert registry.active().version != original
+    assert registry.active().version.startswith("current.cbm@")
+
+
+def test_registry_evicts_oldest_inactive_versions(model_dir: Path) -> None:
+    registry = ModelRegistry(model_dir / "current.cbm", loader=ModelRunner, warm_up=lambda _: None, max_versions=1)
+
+    registry.reload(model_dir / "next.cbm", wait=True)
+
+    assert [info.version for info in registry.versions()] == [registry.active().version]
+
+
+def test_resolve_model_file_rejects_paths_outside_model_dir(tmp_path: Path) -> None:
+    default = tmp_path / "model.cbm"
+
+    assert resolve_model_file(tmp_path, None, default) == default
+    assert resolve_model_file(tmp_path, "other.cbm", default) == (tmp_path / "other.cbm").resolve()
+    with pytest.raises(ValueError):
+        resolve_model_file(tmp_path, "../escape.cbm", default)
+    with pytest.raises(ValueError):
+        resolve_model_file(tmp_path, "notes.txt", default)
+
+
+def test_concurrent_first_calls_build_one_registry(monkeypatch: pytest.MonkeyPatch) -> None:
+    built = []
+
+    class _SlowRegistry:
+        def __init__(self, *args, **kwargs) -> None:
+            time.sleep(0.1)  # loading and warming the model
+            built.append(self)
+
+        def stop_watching(self) -> None:
+            pass
+
+    monkeypatch.setattr(prediction_service, "ModelRegistry", _SlowRegistry)
+    monkeypatch.setattr(prediction_service, "_REGISTRY", None)
+    registries = []
+    callers = [threading.Thread(target=lambda: registries.append(prediction_service.get_registry())) for _ in range(8)]
+    for caller in callers:
+        caller.start()
+    for caller in callers:
+        caller.join()
+
+    assert len(built) == 1
+    assert all(registry is built[0] for registry in registries)
+
+
+def test_predict_response_reports_serving_model_version() -> None:
+    response = prediction_service.predict_payload(
+        {
+            "LBXHGB": 120,
+            "LBXMCVSI": 79,
+            "LBXMCHSI": 330,
+            "LBXRDW": 15.2,
+            "LBXRBCSI": 4.6,
+            "LBXHCT": 37,
+            "RIDAGEYR": 31,
+            "BMXBMI": 22.5,
+        }
+    )
+
+    assert response.model_name == prediction_service.get_runner().version
+    assert response.model_name.startswith(f"{prediction_service.MODEL_PATH.name}@")
+
+
+def test_needs_input_response_reports_serving_model_version() -> None:
+    runner = prediction_service.get_runner()
+    response = prediction_service.predict_payload({"LBXHGB": 120})
+
+    assert response.status == "needs_input"
+    assert response.model_name == runner.version
+
+
+def test_admin_models_requires_configured_token(monkeypatch) -> None:
+    client = TestClient(app)
+
+    monkeypatch.setattr(dependencies, "ADMIN_API_TOKEN", "")
+    assert client.get("/admin/models").status_code == 403
+
+    monkeypatch.setattr(dependencies, "ADMIN_API_TOKEN", "s3cret")
+    assert client.get("/admin/models", headers={"X-Admin-Token": "wrong"}).status_code == 401
+
+    resp = client.get("/admin/models", headers={"X-Admin-Token": "s3cret"})
+    assert resp.status_code == 200
+    body = resp.json()
+    assert body["active_version"] == prediction_service.get_runner().version
+    assert body["reload"]["state"] in {"idle", "completed", "failed", "loading"}
+
+    bad = client.post("/admin/models/reload", json={"model_file": "../x.cbm"}, headers={"X-Admin-Token": "s3cret"})
+    assert bad.status_code == 422
+    missing = client.post("/admin/models/activate", json={"version": "nope"}, headers={"X-Admin-Token": "s3cret"})
+    assert missing.status_code == 404
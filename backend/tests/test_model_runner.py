@@ -0,0 +1,99 @@
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.services.prediction_service import _SHOW_IN_EXPLANATIONS, FEATURES, ModelRunner, ScoringContext
+
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+MODEL_FILE = BACKEND_DIR / "ironrisk_bi_reg_29n.cbm"
+TRAIN_ROWS_FILE = BACKEND_DIR.parent / "train_data" / "X_29n.csv"
+
+
+def _train_payloads(limit: int | None = None) -> list[dict]:
+    frame = pd.read_csv(TRAIN_ROWS_FILE, nrows=limit)[FEATURES]
+    payloads = []
+    for record in frame.to_dict("records"):
+        payloads.append({name: (None if pd.isna(value) else value) for name, value in record.items()})
+    return payloads
+
+
+@pytest.fixture(scope="module")
+def runner() -> ModelRunner:
+    if not MODEL_FILE.exists():
+        pytest.skip("model artifact is not available")
+    return ModelRunner(MODEL_FILE)
+
+
+def test_numpy_and_pandas_feature_backends_are_bit_identical(runner: ModelRunner) -> None:
+    payloads = _train_payloads(300)
+    payloads.append({"LBXHGB": 120, "LBXMCHSI": 330, "LBXSGL": 5.5, "BMXHT": 165, "BMXWT": 62, "RIAGENDR": 1})
+
+    numpy_context = ScoringContext(payloads, backend="numpy")
+    pandas_context = ScoringContext(payloads, backend="pandas")
+
+    assert isinstance(numpy_context.features, np.ndarray)
+    assert numpy_context.features.dtype == np.float64
+    assert runner.predict_context(numpy_context) == runner.predict_context(pandas_context)
+    numpy_shap = runner.model.get_feature_importance(numpy_context.pool, type="ShapValues")
+    pandas_shap = runner.model.get_feature_importance(pandas_context.pool, type="ShapValues")
+    assert np.array_equal(numpy_shap, pandas_shap)
+
+
+def test_scoring_context_rejects_unknown_backend() -> None:
+    with pytest.raises(ValueError):
+        ScoringContext([{}], backend="arrow")
+
+
+def _top_displayed(shap_row: np.ndarray, top_n: int) -> tuple[set[tuple[str, bool]], list[float]]:
+    shown = sorted(
+        (index for index, name in enumerate(FEATURES) if name in _SHOW_IN_EXPLANATIONS),
+        key=lambda index: -abs(shap_row[index]),
+    )
+    top = {(FEATURES[index], bool(shap_row[index] < 0)) for index in shown[:top_n]}
+    return top, [abs(float(shap_row[index])) for index in shown]
+
+
+def test_approximate_explanations_track_exact_top_features() -> None:
+    if not MODEL_FILE.exists():
+        pytest.skip("model artifact is not available")
+    context = ScoringContext(_train_payloads())
+    exact = ModelRunner(MODEL_FILE, explanation_mode="exact").shap_values(context)
+    approximate = ModelRunner(MODEL_FILE, explanation_mode="approximate").shap_values(context)
+
+    # Saabas-style attribution reorders near-ties, so agreement is measured where the exact ranking is decisive.
+    top1_matches = 0
+    top3_matches = top3_rows = 0
+    for exact_row, approximate_row in zip(exact, approximate):
+        exact_top1, _ = _top_displayed(exact_row, 1)
+        approximate_top1, _ = _top_displayed(approximate_row, 1)
+        top1_matches += exact_top1 == approximate_top1
+
+        exact_top3, magnitudes = _top_displayed(exact_row, 3)
+        if magnitudes[2] >= 0.2 and magnitudes[2] - magnitudes[3] >= 0.2:
+            top3_rows += 1
+            top3_matches += exact_top3 == _top_displayed(approximate_row, 3)[0]
+
+    shown = [index for index, name in enumerate(FEATURES) if name in _SHOW_IN_EXPLANATIONS]
+    material = np.abs(exact[:, shown]) >= 0.1
+    direction_agreement = np.mean(np.sign(exact[:, shown])[material] == np.sign(approximate[:, shown])[material])
+
+    assert top1_matches / len(exact) >= 0.95
+    assert top3_rows > 500
+    assert top3_matches / top3_rows >= 0.95
+    assert direction_agreement >= 0.99
+    assert np.allclose(exact.sum(axis=1), approximate.sum(axis=1))
+
+
+def test_explanation_mode_off_skips_shap(runner: ModelRunner) -> None:
+    context = ScoringContext(_train_payloads(5))
+    silent = ModelRunner(MODEL_FILE, explanation_mode="off")
+
+    assert silent.explain_context(context) == [[] for _ in range(5)]
+    assert silent.predict_context(context) == runner.predict_context(context)
+
+
+def test_model_runner_rejects_unknown_explanation_mode() -> None:
+    with pytest.raises(ValueError):
+        ModelRunner(MODEL_FILE, explanation_mode="fast")
@@ -0,0 +1,96 @@
+import dataclasses
+import shutil
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.services.oblivious_trees import ObliviousTreeModel
+from app.services.prediction_service import FEATURES, ModelRunner, ScoringContext
+
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+MODEL_FILE = BACKEND_DIR / "ironrisk_bi_reg_29n.cbm"
+TRAIN_ROWS_FILE = BACKEND_DIR.parent / "train_data" / "X_29n.csv"
+
+
+@pytest.fixture(scope="module")
+def catboost_runner() -> ModelRunner:
+    if not MODEL_FILE.exists():
+        pytest.skip("model artifact is not available")
+    return ModelRunner(MODEL_FILE, explanation_mode="exact", engine="catboost")
+
+
+@pytest.fixture(scope="module")
+def trees(catboost_runner: ModelRunner) -> ObliviousTreeModel:
+    return ObliviousTreeModel.from_catboost(catboost_runner.model, catboost_runner.model_checksum)
+
+
+def _train_features(limit: int) -> np.ndarray:
+    features = pd.read_csv(TRAIN_ROWS_FILE, nrows=limit)[FEATURES].to_numpy(dtype=np.float64)
+    features[:, FEATURES.index("RIAGENDR")] = np.nan
+    return features
+
+
+def test_tree_arrays_match_catboost_predict_and_shap(catboost_runner: ModelRunner, trees: ObliviousTreeModel) -> None:
+    features = _train_features(2000)
+    context = ScoringContext.from_features(features)
+
+    np.testing.assert_allclose(trees.predict(features), catboost_runner.predict_context(context), rtol=0, atol=1e-9)
+    np.testing.assert_allclose(trees.shap_values(features), catboost_runner.shap_values(context), rtol=0, atol=1e-9)
+
+
+def test_tree_arrays_handle_all_missing_and_extreme_rows(catboost_runner: ModelRunner, trees: ObliviousTreeModel) -> None:
+    features = np.vstack(
+        [
+            np.full(len(FEATURES), np.nan),
+            np.full(len(FEATURES), -1e9),
+            np.full(len(FEATURES), 1e9),
+        ]
+    )
+    context = ScoringContext.from_features(features)
+
+    np.testing.assert_allclose(trees.predict(features), catboost_runner.predict_context(context), rtol=0, atol=1e-9)
+    np.testing.assert_allclose(trees.shap_values(features), catboost_runner.shap_values(context), rtol=0, atol=1e-9)
+
+
+def test_tree_arrays_round_trip_through_npz(trees: ObliviousTreeModel, tmp_path: Path) -> None:
+    path = tmp_path / "model.trees.npz"
+    trees.save(path)
+    loaded = ObliviousTreeModel.load(path)
+    features = _train_features(50)
+
+    assert loaded.feature_names == trees.feature_names
+    assert loaded.source_checksum == trees.source_checksum
+    assert np.array_equal(loaded.predict(features), trees.predict(features))
+    assert np.array_equal(loaded.shap_values(features), trees.shap_values(features))
+
+
+def test_numpy_engine_runner_uses_matching_sidecar(catboost_runner: ModelRunner, trees: ObliviousTreeModel, tmp_path: Path) -> None:
+    model_path = tmp_path / MODEL_FILE.name
+    shutil.copyfile(MODEL_FILE, model_path)
+    trees.save(model_path.with_suffix(".trees.npz"))
+
+    runner = ModelRunner(model_path, explanation_mode="exact", engine="numpy")
+    payloads = [{name: (None if np.isnan(value) else value) for name, value in zip(FEATURES, row)} for row in _train_features(20)]
+    context = ScoringContext(payloads)
+
+    assert runner.trees.source_checksum == runner.model_checksum
+    np.testing.assert_allclose(runner.predict_context(context), catboost_runner.predict_context(context), atol=1e-9)
+    assert runner.explain_context(context) == catboost_runner.explain_context(context)
+
+
+def test_numpy_engine_ignores_stale_sidecar(trees: ObliviousTreeModel, tmp_path: Path) -> None:
+    model_path = tmp_path / MODEL_FILE.name
+    shutil.copyfile(MODEL_FILE, model_path)
+    stale = dataclasses.replace(trees, source_checksum="stale")
+    stale.save(model_path.with_suffix(".trees.npz"))
+
+    runner = ModelRunner(model_path, engine="numpy")
+
+    assert runner.trees.source_checksum == runner.model_checksum
+
+
+def test_unknown_inference_engine_is_rejected() -> None:
+    with pytest.raises(ValueError):
+        ModelRunner(MODEL_FILE, engine="onnx")
@@ -0,0 +1,99 @@
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import app.services.prediction_service as prediction_service
+from app.services.offline_scoring import OfflineScoringConfig, run_offline_scoring, score_frame
+
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+MODEL_FILE = BACKEND_DIR / "ironrisk_bi_reg_29n.cbm"
+TRAIN_ROWS_FILE = BACKEND_DIR.parent / "train_data" / "X_29n.csv"
+
+
+def _cohort(rows: int = 120) -> pd.DataFrame:
+    frame = pd.read_csv(TRAIN_ROWS_FILE, nrows=rows)
+    # A rejected row of each kind: missing required fields and an invalid value.
+    frame.loc[3, "LBXHGB"] = np.nan
+    frame.loc[5, "BMXWT"] = -1.0
+    return frame
+
+
+def _payload(record: dict) -> dict:
+    return {
+        name: (None if pd.isna(value) else value)
+        for name, value in record.items()
+        if name in prediction_service.FEATURES
+    }
+
+
+def test_score_frame_matches_predict_payload() -> None:
+    frame = _cohort()
+    output = score_frame(prediction_service.get_runner(), frame, first_row=100, keep_columns=("SEQN",))
+
+    assert output["row"].tolist() == list(range(100, 100 + len(frame)))
+    assert output["SEQN"].tolist() == frame["SEQN"].tolist()
+    for record, result in zip(frame.to_dict("records"), output.to_dict("records")):
+        expected = prediction_service.predict_payload(_payload(record))
+        assert result["status"] == expected.status
+        assert result["confidence"] == expected.confidence
+        if expected.status != "ok":
+            assert result["error_code"] == expected.error_code
+            assert result["missing_required_fields"] == ",".join(expected.missing_required_fields)
+            assert np.isnan(result["iron_index"])
+            continue
+        assert result["iron_index"] == expected.iron_index
+        assert result["risk_percent"] == expected.risk_percent
+        assert result["risk_tier"] == expected.risk_tier
+
+
+def test_offline_scoring_resumes_from_written_parts(tmp_path: Path) -> None:
+    source = tmp_path / "cohort.csv"
+    _cohort(250).to_csv(source, index=False)
+    config = OfflineScoringConfig(
+        input_path=source,
+        output_dir=tmp_path / "scores",
+        model_path=prediction_service.MODEL_PATH,
+        chunk_rows=100,
+        processes=0,
+        output_format="csv",
+        engine="catboost",
+    )
+
+    first = run_offline_scoring(config)
+    assert (first.rows, first.chunks_written, first.chunks_skipped) == (250, 3, 0)
+    complete = pd.concat(pd.read_csv(config.output_dir / name) for name in first.part_files)
+
+    (config.output_dir / first.part_files[1]).unlink()
+    resumed = run_offline_scoring(config)
+    assert (resumed.rows, resumed.chunks_written, resumed.chunks_skipped) == (100, 1, 2)
+    pd.testing.assert_frame_equal(
+        pd.concat(pd.read_csv(config.output_dir / name) for name in resumed.part_files),
+        complete,
+    )
+
+    with pytest.raises(ValueError, match="different job"):
+        run_offline_scoring(OfflineScoringConfig(**{**config.__dict__, "chunk_rows": 50}))
+    # Parts scored by different engines must not end up in one output.
+    (config.output_dir / first.part_files[2]).unlink()
+    with pytest.raises(ValueError, match="different job"):
+        run_offline_scoring(OfflineScoringConfig(**{**config.__dict__, "engine": "numpy"}))
+
+
+def test_offline_scoring_writes_parquet_with_shap(tmp_path: Path) -> None:
+    source = tmp_path / "cohort.csv"
+    _cohort(50).to_csv(source, index=False)
+    config = OfflineScoringConfig(
+        input_path=source,
+        output_dir=tmp_path / "scores",
+        model_path=MODEL_FILE,
+        processes=0,
+        with_shap=True,
+    )
+
+    run_offline_scoring(config)
+    output = pd.read_parquet(config.output_dir)
+
+    assert len(output) == 50
+    assert {f"shap_{name}" for name in prediction_service.FEATURES} <= set(output.columns)
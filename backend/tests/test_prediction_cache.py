@@ -0,0 +1,134 @@
+from pathlib import Path
+
+import pytest
+from fastapi.testclient import TestClient
+
+import app.services.prediction_service as prediction_service
+from app.core import dependencies
+from app.main import app
+from app.services.prediction_service import ModelRunner, PredictionCache, PredictResponse
+
+MODEL_FILE = Path(__file__).resolve().parents[1] / "ironrisk_bi_reg_29n.cbm"
+
+
+def _response(iron_index: float) -> PredictResponse:
+    return PredictResponse(status="ok", confidence="medium", model_name="test", iron_index=iron_index)
+
+
+def _lab_payload() -> dict:
+    return {
+        "LBXHGB": 120,
+        "LBXMCVSI": 79,
+        "LBXMCHSI": 330,
+        "LBXRDW": 15.2,
+        "LBXRBCSI": 4.6,
+        "LBXHCT": 37,
+        "RIDAGEYR": 31,
+        "BMXBMI": 22.5,
+    }
+
+
+def test_prediction_cache_evicts_least_recently_used() -> None:
+    cache = PredictionCache(max_size=2, ttl_seconds=60)
+    cache.put("a", _response(1.0))
+    cache.put("b", _response(2.0))
+    assert cache.get("a") is not None
+
+    cache.put("c", _response(3.0))
+
+    assert cache.get("b") is None
+    assert cache.get("a").iron_index == 1.0
+    assert cache.get("c").iron_index == 3.0
+    assert cache.stats() == {
+        "size": 2,
+        "max_size": 2,
+        "hits": 3,
+        "misses": 1,
+        "evictions": 1,
+        "expirations": 0,
+    }
+
+
+def test_prediction_cache_expires_entries_after_ttl() -> None:
+    now = [100.0]
+    cache = PredictionCache(max_size=4, ttl_seconds=10, clock=lambda: now[0])
+    cache.put("a", _response(1.0))
+
+    now[0] = 109.0
+    assert cache.get("a") is not None
+    now[0] = 110.0
+    assert cache.get("a") is None
+
+    stats = cache.stats()
+    assert stats["expirations"] == 1
+    assert stats["size"] == 0
+
+
+def test_prediction_cache_disabled_with_zero_size() -> None:
+    cache = PredictionCache(max_size=0, ttl_seconds=60)
+    cache.put("a", _response(1.0))
+
+    assert not cache.enabled
+    assert cache.get("a") is None
+
+
+def test_predict_payload_reuses_result_for_equivalent_units() -> None:
+    cache = prediction_service.get_prediction_cache()
+    cache.clear()
+    before = cache.stats()
+
+    first = prediction_service.predict_payload(_lab_payload())
+    # Same panel in g/dL and percent: normalizes to the same model input.
+    second = prediction_service.predict_payload(_lab_payload() | {"LBXHGB": 12.0, "LBXMCHSI": 33.0})
+
+    after = cache.stats()
+    assert second is first
+    assert after["hits"] == before["hits"] + 1
+    assert after["misses"] == before["misses"] + 1
+
+
+def test_prediction_cache_is_invalidated_when_runner_is_replaced() -> None:
+    cache = prediction_service.get_prediction_cache()
+    prediction_service.predict_payload(_lab_payload())
+    assert cache.stats()["size"] >= 1
+
+    prediction_service.get_runner.cache_clear()
+    prediction_service.get_runner()
+
+    assert cache.stats()["size"] == 0
+
+
+def test_prediction_cache_stats_endpoint(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(dependencies, "ADMIN_API_TOKEN", "s3cret")
+    client = TestClient(app)
+
+    assert client.get("/admin/cache/stats").status_code == 401
+    resp = client.get("/admin/cache/stats", headers={"X-Admin-Token": "s3cret"})
+
+    assert resp.status_code == 200
+    assert set(resp.json()) == {"size", "max_size", "hits", "misses", "evictions", "expirations"}
+
+
+def test_predict_payload_scores_with_the_runner_it_looked_up(monkeypatch: pytest.MonkeyPatch) -> None:
+    looked_up, swapped_in = ModelRunner(MODEL_FILE), ModelRunner(MODEL_FILE.with_name("missing.cbm"))
+    runners = iter([looked_up, swapped_in])
+    monkeypatch.setattr(prediction_service, "get_runner", lambda: next(runners))
+    monkeypatch.setattr(prediction_service, "_PREDICTION_CACHE", PredictionCache(16, 60))
+
+    response = prediction_service.predict_payload(_lab_payload())
+
+    # A swap right after the cache lookup must not score the row with the new runner.
+    assert response.model_name == looked_up.version
+    assert prediction_service._PREDICTION_CACHE.get(
+        prediction_service.prediction_cache_key(prediction_service.prepare_model_input(_lab_payload()), looked_up)
+    ) == response
+
+
+def test_scheduled_batch_scores_each_row_with_its_own_runner(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(prediction_service, "_PREDICTION_CACHE", PredictionCache(0, 0))
+    first, second = ModelRunner(MODEL_FILE), ModelRunner(MODEL_FILE.with_name("missing.cbm"))
+    rows = [prediction_service.prepare_prediction(_lab_payload(), runner) for runner in (first, second, first)]
+
+    responses = prediction_service._score_scheduled_batch(rows)
+
+    assert [response.model_name for response in responses] == [first.version, second.version, first.version]
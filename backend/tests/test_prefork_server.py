@@ -0,0 +1,87 @@
+import os
+import socket
+import subprocess
+import sys
+import time
+import uuid
+from pathlib import Path
+
+import httpx
+import pytest
+
+from app.services import prediction_service
+
+pytest.importorskip("gunicorn")
+pytestmark = pytest.mark.skipif(not sys.platform.startswith("linux"), reason="pre-fork server and /proc are Linux-only")
+
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+LAB = {"LBXHGB": 120, "LBXMCVSI": 79, "LBXMCHSI": 330, "LBXRDW": 15.2, "LBXRBCSI": 4.6, "LBXHCT": 37, "RIDAGEYR": 31, "BMXBMI": 22.5}
+UPLOAD = {"filename": "report.pdf", "content_type": "application/pdf", "size_bytes": 128000, "source": "web"}
+
+
+def _free_port() -> int:
+    with socket.socket() as probe:
+        probe.bind(("127.0.0.1", 0))
+        return probe.getsockname()[1]
+
+
+def _wait_for(log_path: Path, marker: str, count: int, server: subprocess.Popen) -> None:
+    deadline = time.monotonic() + 60
+    while log_path.read_text().count(marker) < count:
+        assert server.poll() is None and time.monotonic() < deadline, log_path.read_text()[-2000:]
+        time.sleep(0.1)
+
+
+def test_recycled_workers_share_model_and_finish_analyses(tmp_path: Path) -> None:
+    port = _free_port()
+    log_path = tmp_path / "gunicorn.log"
+    env = {
+        **os.environ,
+        "GUNICORN_BIND": f"127.0.0.1:{port}",
+        "WEB_CONCURRENCY": "2",
+        "GUNICORN_MAX_REQUESTS": "3",
+        "GUNICORN_MAX_REQUESTS_JITTER": "0",
+        "DATABASE_URL": f"sqlite:///{tmp_path}/prefork.db",
+        "MODEL_PATH": str(prediction_service.MODEL_PATH),
+        "ADMIN_API_TOKEN": "s3cret",
+    }
+    with log_path.open("w") as log:
+        server = subprocess.Popen(
+            [sys.executable, "-m", "gunicorn", "-c", "gunicorn.conf.py", "app.main:app"],
+            cwd=BACKEND_DIR,
+            env=env,
+            stdout=log,
+            stderr=subprocess.STDOUT,
+        )
+    base_url = f"http://127.0.0.1:{port}"
+    try:
+        _wait_for(log_path, '"event":"startup_completed"', 2, server)
+        # A new connection per request, as behind a load balancer; workers exit after 3 requests each.
+        register = httpx.post(f"{base_url}/auth/register", json={"email": f"user-{uuid.uuid4().hex}@example.com", "password": "password123"})
+        assert register.status_code == 201
+        headers = {"X-Authorization": f"Bearer {register.json()['access_token']}"}
+
+        analysis_ids = []
+        for _ in range(4):
+            created = httpx.post(f"{base_url}/analyses", json={"upload": UPLOAD, "lab": LAB}, headers=headers)
+            assert created.status_code == 202
+            analysis_ids.append(created.json()["analysis_id"])
+        pids = set()
+        for _ in range(6):
+            assert httpx.post(f"{base_url}/v1/risk/predict", json=LAB).status_code == 200
+            report = httpx.get(f"{base_url}/admin/startup", headers={"X-Admin-Token": "s3cret"}).json()
+            pids.add(report["pid"])
+            assert report["phases_ms"]["model_load"] < 100  # inherited from the master, not reloaded
+            assert report["memory_kb"]["shared_kb"] > report["memory_kb"]["private_kb"]
+
+        for analysis_id in analysis_ids:
+            status = httpx.get(f"{base_url}/analyses/{analysis_id}", headers=headers).json()
+            assert status["status"] == "completed"
+    finally:
+        server.terminate()
+        server.wait(timeout=60)
+
+    log = log_path.read_text()
+    assert log.count('"event":"prefork_master_ready"') == 1
+    assert log.count('"event":"worker_exit"') >= 3
+    assert len(pids) >= 3
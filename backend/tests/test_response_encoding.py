@@ -0,0 +1,63 @@
+import json
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.services import prediction_service
+from app.services.prediction_service import PredictBatchResponse, PredictResponse, predict_batch_payloads
+from app.services.response_encoding import encode_predict_batch_response, encode_predict_response
+
+LAB_ROWS = [
+    {"LBXHGB": 120, "LBXMCVSI": 79, "LBXMCHSI": 330, "LBXRDW": 15.2, "LBXRBCSI": 4.6, "LBXHCT": 37, "RIDAGEYR": 31, "BMXBMI": 22.5},
+    {"LBXHGB": 14.5, "LBXMCVSI": 90, "LBXMCHSI": 34, "LBXRDW": 12.8, "LBXRBCSI": 5.0, "LBXHCT": 44, "RIDAGEYR": 45,
+     "BMXHT": 180, "BMXWT": 82, "RIAGENDR": 1, "LBXSGL": 5.4, "LBXPLTSI": 250},
+    {"LBXHGB": 98, "LBXMCVSI": 71, "LBXMCHSI": 29, "LBXRDW": 17.9, "LBXRBCSI": 4.1, "LBXHCT": 31, "RIDAGEYR": 27, "BMXBMI": 19.0},
+    {"LBXHGB": 120},
+    {"LBXHGB": -1, "RIDAGEYR": 0},
+]
+
+
+def _response_model_bytes(response: PredictResponse | PredictBatchResponse) -> bytes:
+    """What FastAPI emits through ``response_model``: re-validate, encode, render like JSONResponse."""
+    validated = type(response).model_validate(response.model_dump())
+    content = jsonable_encoder(validated)
+    return json.dumps(content, ensure_ascii=False, allow_nan=False, separators=(",", ":")).encode("utf-8")
+
+
+def test_fast_encoding_is_byte_identical_to_response_model_path() -> None:
+    responses = predict_batch_payloads(LAB_ROWS)
+
+    assert {response.status for response in responses} == {"ok", "needs_input"}
+    for response in responses:
+        assert encode_predict_response(response) == _response_model_bytes(response)
+    batch = PredictBatchResponse(results=responses)
+    assert encode_predict_batch_response(batch) == _response_model_bytes(batch)
+
+
+def test_foreign_explanation_items_are_encoded_generically() -> None:
+    label, text = prediction_service.EXPLANATION_TEXTS[("LBXRDW", "negative")]
+    response = PredictResponse(
+        status="ok",
+        confidence="high",
+        model_name="m",
+        explanations=[
+            {"feature": "LBXRDW", "label": label, "impact": -0.5, "direction": "negative", "text": "другой текст"},
+            {"feature": "custom", "impact": 1},
+        ],
+    )
+
+    assert encode_predict_response(response) == _response_model_bytes(response)
+
+
+def test_predict_routes_return_encoded_bodies() -> None:
+    with TestClient(app) as client:
+        single = client.post("/v1/risk/predict", json=LAB_ROWS[0])
+        batch = client.post("/v1/risk/predict/batch", json={"rows": LAB_ROWS})
+
+    assert single.status_code == 200
+    assert single.headers["content-type"] == "application/json"
+    assert single.content == encode_predict_response(prediction_service.predict_payload(LAB_ROWS[0]))
+    assert [result["status"] for result in batch.json()["results"]] == ["ok", "ok", "ok", "needs_input", "needs_input"]
+    schema = app.openapi()["paths"]["/v1/risk/predict"]["post"]["responses"]["200"]["content"]["application/json"]["schema"]
+    assert schema == {"$ref": "#/components/schemas/PredictResponse"}
@@ -0,0 +1,52 @@
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.core import dependencies, readiness
+from app.main import app
+
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+# Cold-start regression budget for `import app.main`; raise it on slow CI runners rather than removing the check.
+STARTUP_IMPORT_BUDGET_SECONDS = float(os.getenv("STARTUP_IMPORT_BUDGET_SECONDS", "2.5"))
+LAZY_MODULES = ("catboost", "pandas", "passlib", "bcrypt")
+
+IMPORT_PROBE = """
+import json, sys, time
+started = time.perf_counter()
+import app.main
+print(json.dumps({"seconds": time.perf_counter() - started, "modules": sorted(sys.modules)}))
+"""
+
+
+def test_app_import_stays_within_cold_start_budget() -> None:
+    output = subprocess.run(
+        [sys.executable, "-c", IMPORT_PROBE],
+        cwd=BACKEND_DIR,
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stdout
+    probe = json.loads(output.strip().splitlines()[-1])
+
+    loaded = {name.split(".")[0] for name in probe["modules"]}
+    assert loaded.isdisjoint(LAZY_MODULES), f"imported eagerly: {sorted(loaded & set(LAZY_MODULES))}"
+    assert probe["seconds"] < STARTUP_IMPORT_BUDGET_SECONDS
+
+
+def test_startup_report_lists_measured_phases(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(dependencies, "ADMIN_API_TOKEN", "s3cret")
+    readiness.mark_not_ready()
+    with TestClient(app) as client:
+        assert readiness.wait_until_ready(timeout=30)
+        # pid and memory of the serving process are for operators only.
+        assert client.get("/admin/startup").status_code == 401
+        report = client.get("/admin/startup", headers={"X-Admin-Token": "s3cret"}).json()
+
+    assert {"import", "db_init", "model_load", "model_warmup"} <= set(report["phases_ms"])
+    assert all(duration >= 0 for duration in report["phases_ms"].values())
+    assert report["ready_after_ms"] >= report["phases_ms"]["model_warmup"]
@@ -0,0 +1,166 @@
+import threading
+import uuid
+from pathlib import Path
+from typing import Iterator
+
+import pytest
+from fastapi.testclient import TestClient
+
+import app.api.v1.predict as predict_api
+import app.services.prediction_service as prediction_service
+from app.db.database import init_db
+from app.main import app
+from app.services.analyses_service import CreateAnalysisRequest, create_analysis
+from app.services.inference_executor import InferenceExecutor
+from app.services.prediction_service import ModelRunner, predict_payload, predict_what_if
+
+MODEL_FILE = Path(__file__).resolve().parents[1] / "ironrisk_bi_reg_29n.cbm"
+
+
+def _lab_payload() -> dict:
+    return {
+        "LBXHGB": 120,
+        "LBXMCVSI": 79,
+        "LBXMCHSI": 330,
+        "LBXRDW": 15.2,
+        "LBXRBCSI": 4.6,
+        "LBXHCT": 37,
+        "RIDAGEYR": 31,
+        "BMXBMI": 22.5,
+    }
+
+
+@pytest.fixture(scope="module", autouse=True)
+def repo_model() -> Iterator[ModelRunner]:
+    # MODEL_PATH defaults to a path that only exists in the image; without a model every score is the fallback.
+    with pytest.MonkeyPatch.context() as patch:
+        patch.setattr(prediction_service, "MODEL_PATH", MODEL_FILE)
+        prediction_service.get_runner.cache_clear()
+        runner = prediction_service.get_runner()
+        assert runner.model is not None
+        yield runner
+    prediction_service.get_runner.cache_clear()
+
+
+@pytest.fixture(autouse=True)
+def _no_result_cache(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(prediction_service, "_PREDICTION_CACHE", prediction_service.PredictionCache(0, 0))
+    monkeypatch.setattr(prediction_service, "_WHAT_IF_BASES", prediction_service.PredictionCache(16, 60))
+
+
+@pytest.mark.parametrize(
+    "changes",
+    [
+        {"LBXHGB": 95},
+        {"LBXRDW": 18.4},
+        {"LBXMCVSI": 70, "LBXHCT": 31},
+        {"BMXBMI": None, "BMXHT": 170, "BMXWT": 58},
+        {"LBXSGL": 6.1},
+    ],
+)
+def test_what_if_matches_full_rescore(changes: dict) -> None:
+    base = _lab_payload()
+    expected = predict_payload({**base, **changes})
+
+    score = predict_what_if(base, changes, base_key=f"test-{uuid.uuid4()}")
+
+    assert score.response.model_dump() == expected.model_dump()
+    assert 0 < score.trees_rescored < score.trees_total  # scored by delta, not in full
+
+
+def test_what_if_rescores_only_trees_using_changed_feature(repo_model: ModelRunner) -> None:
+    base_key = f"test-{uuid.uuid4()}"
+
+    unchanged = predict_what_if(_lab_payload(), {}, base_key=base_key)
+    changed = predict_what_if(_lab_payload(), {"LBXHGB": 95}, base_key=base_key)
+
+    trees = repo_model.tree_model()
+    hgb_trees = len(trees._trees_by_feature[prediction_service.FEATURE_INDEX["LBXHGB"]])
+    assert unchanged.trees_rescored == 0
+    assert unchanged.response.model_dump() == predict_payload(_lab_payload()).model_dump()
+    assert changed.changed_features == ["LBXHGB"]
+    assert changed.trees_rescored == hgb_trees
+    assert 0 < hgb_trees < changed.trees_total
+
+
+def test_what_if_derived_bmi_counts_as_changed_feature() -> None:
+    base = {**_lab_payload(), "BMXBMI": None, "BMXHT": 165, "BMXWT": 60}
+
+    score = predict_what_if(base, {"BMXWT": 70}, base_key=f"test-{uuid.uuid4()}")
+
+    assert set(score.changed_features) == {"BMXWT", "BMXBMI"}
+
+
+def test_what_if_removing_required_field_needs_input() -> None:
+    score = predict_what_if(_lab_payload(), {"LBXHGB": None}, base_key=f"test-{uuid.uuid4()}")
+
+    assert score.response.status == "needs_input"
+    assert "LBXHGB" in score.response.missing_required_fields
+
+
+def _register(client: TestClient) -> dict[str, str]:
+    response = client.post(
+        "/auth/register",
+        json={"email": f"user-{uuid.uuid4().hex}@example.com", "password": "password123"},
+    )
+    assert response.status_code == 201
+    return {"X-Authorization": f"Bearer {response.json()['access_token']}"}
+
+
+def test_what_if_endpoint_scores_own_analysis_only() -> None:
+    init_db()
+    client = TestClient(app)
+    owner, stranger = _register(client), _register(client)
+    owner_id = client.get("/users/me", headers=owner).json()["id"]
+    created = create_analysis(
+        owner_id,
+        CreateAnalysisRequest.model_validate(
+            {
+                "upload": {"filename": "report.pdf", "content_type": "application/pdf", "size_bytes": 1},
+                "lab": _lab_payload(),
+            }
+        ),
+    )
+
+    response = client.post(f"/analyses/{created.analysis_id}/what-if", json={"changes": {"LBXHGB": 95}}, headers=owner)
+    foreign = client.post(f"/analyses/{created.analysis_id}/what-if", json={"changes": {"LBXHGB": 95}}, headers=stranger)
+
+    assert response.status_code == 200
+    body = response.json()
+    assert body["base_analysis_id"] == created.analysis_id
+    assert body["result"] == predict_payload({**_lab_payload(), "LBXHGB": 95}).model_dump()
+    assert foreign.status_code == 404
+
+
+def test_what_if_endpoint_scores_on_inference_executor(monkeypatch: pytest.MonkeyPatch) -> None:
+    init_db()
+    client = TestClient(app)
+    owner = _register(client)
+    owner_id = client.get("/users/me", headers=owner).json()["id"]
+    created = create_analysis(
+        owner_id,
+        CreateAnalysisRequest.model_validate(
+            {
+                "upload": {"filename": "report.pdf", "content_type": "application/pdf", "size_bytes": 1},
+                "lab": _lab_payload(),
+            }
+        ),
+    )
+    executor = InferenceExecutor(workers=1, queue_size=0, retry_after_seconds=2)
+    monkeypatch.setattr(predict_api, "get_inference_executor", lambda: executor)
+    url = f"/analyses/{created.analysis_id}/what-if"
+    release = threading.Event()
+    try:
+        executor.submit(release.wait)
+        overloaded = client.post(url, json={"changes": {"LBXHGB": 95}}, headers=owner)
+        release.set()
+        executor.call(lambda: None)  # the blocker has finished
+        scored = client.post(url, json={"changes": {"LBXHGB": 95}}, headers=owner)
+    finally:
+        release.set()
+        executor.shutdown()
+
+    assert overloaded.status_code == 503
+    assert overloaded.headers["retry-after"] == "2"
+    assert scored.status_code == 200
+    assert executor.stats()["completed"] == 3
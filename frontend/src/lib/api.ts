@@ -22,6 +22,15 @@ export type AnalysisItem = {
   created_at: string;
 };
 
+export type ListAnalysesResponse = {
+  analyses: AnalysisItem[];
+  // Cursor of the next page; null on the last one.
+  next_cursor: string | null;
+};
+
+// GET /analyses pages at most this many rows (the server's ANALYSIS_LIST_MAX_LIMIT).
+const ANALYSES_PAGE_SIZE = 200;
+
 export type AnalysisStatusResponse = {
   analysis_id: string;
   status: AnalysisStatus;
@@ -209,12 +218,26 @@ export async function createAnalysis(
   return response.json() as Promise<CreateAnalysisResponse>;
 }
 
-export async function listAnalyses() {
-  const response = await fetchWithAuth(`${API_BASE}/analyses`);
+export async function listAnalysesPage(cursor?: string | null): Promise<ListAnalysesResponse> {
+  const params = new URLSearchParams({ limit: String(ANALYSES_PAGE_SIZE) });
+  if (cursor) params.set("cursor", cursor);
+  const response = await fetchWithAuth(`${API_BASE}/analyses?${params}`);
   if (!response.ok) {
     await parseError(response, "Failed to list analyses");
   }
-  return response.json() as Promise<{ analyses: AnalysisItem[] }>;
+  return response.json() as Promise<ListAnalysesResponse>;
+}
+
+/** Every analysis of the user, newest first: follows `next_cursor` until the last page. */
+export async function listAnalyses(): Promise<{ analyses: AnalysisItem[] }> {
+  const analyses: AnalysisItem[] = [];
+  let cursor: string | null = null;
+  do {
+    const page: ListAnalysesResponse = await listAnalysesPage(cursor);
+    analyses.push(...page.analyses);
+    cursor = page.next_cursor;
+  } while (cursor);
+  return { analyses };
 }
 
 export async function getAnalysisStatus(analysisId: string): Promise<AnalysisStatusResponse | null> {
@@ -0,0 +1,12 @@
+BEGIN;
+
+ALTER TABLE analyses ADD COLUMN IF NOT EXISTS attempts INTEGER NOT NULL DEFAULT 0;
+ALTER TABLE analyses ADD COLUMN IF NOT EXISTS available_at TIMESTAMP;
+ALTER TABLE analyses ADD COLUMN IF NOT EXISTS lease_expires_at TIMESTAMP;
+ALTER TABLE analyses ADD COLUMN IF NOT EXISTS claimed_by VARCHAR(96);
+
+UPDATE analyses SET available_at = created_at WHERE available_at IS NULL;
+
+CREATE INDEX IF NOT EXISTS ix_analyses_queue ON analyses (status, available_at);
+
+COMMIT;
@@ -0,0 +1,9 @@
+BEGIN;
+
+DROP INDEX IF EXISTS ix_analyses_queue;
+ALTER TABLE analyses DROP COLUMN IF EXISTS claimed_by;
+ALTER TABLE analyses DROP COLUMN IF EXISTS lease_expires_at;
+ALTER TABLE analyses DROP COLUMN IF EXISTS available_at;
+ALTER TABLE analyses DROP COLUMN IF EXISTS attempts;
+
+COMMIT;
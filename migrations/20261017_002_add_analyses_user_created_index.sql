@@ -0,0 +1,8 @@
+BEGIN;
+
+-- GET /analyses: keyset pages of one user's analyses, newest first.
+CREATE INDEX IF NOT EXISTS ix_analyses_user_created ON analyses (user_id, created_at DESC, id DESC);
+-- Redundant with the leading column above.
+DROP INDEX IF EXISTS ix_analyses_user_id;
+
+COMMIT;
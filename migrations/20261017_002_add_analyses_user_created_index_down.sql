@@ -0,0 +1,6 @@
+BEGIN;
+
+CREATE INDEX IF NOT EXISTS ix_analyses_user_id ON analyses (user_id);
+DROP INDEX IF EXISTS ix_analyses_user_created;
+
+COMMIT;
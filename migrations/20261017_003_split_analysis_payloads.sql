@@ -0,0 +1,26 @@
+BEGIN;
+
+-- JSON blobs move out of the hot analyses rows (status checks, the job queue, listing).
+CREATE TABLE IF NOT EXISTS analysis_payloads (
+    analysis_id VARCHAR(36) PRIMARY KEY REFERENCES analyses(id) ON DELETE CASCADE,
+    input_payload JSON,
+    result_payload JSON
+);
+
+-- Backfill. The columns were created as TEXT by 20260219_001_add_analysis_payloads.sql.
+-- Application startup (init_db) runs the same copy but never drops the columns: run this file once,
+-- after every instance runs the new code, so nothing still reads or writes analyses.*_payload.
+-- Rows that pre-upgrade instances wrote after the startup copy are merged here.
+INSERT INTO analysis_payloads (analysis_id, input_payload, result_payload)
+SELECT id, CAST(input_payload AS JSON), CAST(result_payload AS JSON) FROM analyses
+ON CONFLICT (analysis_id) DO UPDATE SET
+    input_payload = COALESCE(analysis_payloads.input_payload, EXCLUDED.input_payload),
+    result_payload = COALESCE(analysis_payloads.result_payload, EXCLUDED.result_payload);
+
+ALTER TABLE analyses DROP COLUMN IF EXISTS input_payload;
+ALTER TABLE analyses DROP COLUMN IF EXISTS result_payload;
+
+COMMIT;
+
+-- Dropped columns keep their space until the table is rewritten, e.g. off-peak:
+-- VACUUM FULL analyses;
@@ -0,0 +1,14 @@
+BEGIN;
+
+ALTER TABLE analyses ADD COLUMN IF NOT EXISTS input_payload TEXT;
+ALTER TABLE analyses ADD COLUMN IF NOT EXISTS result_payload TEXT;
+
+UPDATE analyses
+SET input_payload = analysis_payloads.input_payload::text,
+    result_payload = analysis_payloads.result_payload::text
+FROM analysis_payloads
+WHERE analysis_payloads.analysis_id = analyses.id;
+
+DROP TABLE IF EXISTS analysis_payloads;
+
+COMMIT;
@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Экспорт CatBoost-модели (.cbm) в массивы NumPy для движка INFERENCE_ENGINE=numpy:
+- модель сохраняется в JSON-формате CatBoost и разбирается в split/border/leaf массивы;
+- для каждого дерева заранее считается точный TreeSHAP по всем листьям;
+- результат пишется рядом с моделью как <model>.trees.npz и сверяется с CatBoost.
+
+    python scripts/export_model_arrays.py [--model backend/ironrisk_bi_reg_29n.cbm]
+"""
+from __future__ import annotations
+
+import argparse
+import hashlib
+import sys
+from pathlib import Path
+
+REPO = Path(__file__).resolve().parents[1]
+BACKEND_DIR = REPO / "backend"
+sys.path.insert(0, str(BACKEND_DIR))
+
+from app.services.oblivious_trees import ObliviousTreeModel  # noqa: E402
+
+DEFAULT_MODEL = BACKEND_DIR / "ironrisk_bi_reg_29n.cbm"
+CHECK_ROWS_FILE = REPO / "train_data" / "X_29n.csv"
+
+
+def sha256(path: Path) -> str:
+    digest = hashlib.sha256()
+    with path.open("rb") as model_file:
+        for chunk in iter(lambda: model_file.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def check_against_catboost(model, trees: ObliviousTreeModel, rows: int) -> None:
+    import numpy as np
+    import pandas as pd
+    from catboost import Pool
+
+    if not CHECK_ROWS_FILE.exists():
+        print(f"{CHECK_ROWS_FILE} not found, skip equivalence check.")
+        return
+    features = pd.read_csv(CHECK_ROWS_FILE, nrows=rows)[list(trees.feature_names)].to_numpy(dtype=np.float64)
+    predict_diff = np.abs(trees.predict(features) - model.predict(features)).max()
+    shap_diff = np.abs(
+        trees.shap_values(features) - model.get_feature_importance(Pool(features), type="ShapValues")
+    ).max()
+    print(f"Max |predict diff| on {len(features)} rows: {predict_diff:.3e}")
+    print(f"Max |SHAP diff| on {len(features)} rows: {shap_diff:.3e}")
+    if predict_diff > 1e-9 or shap_diff > 1e-9:
+        raise SystemExit("*** Exported arrays do not match CatBoost ***")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--model", type=Path, default=DEFAULT_MODEL)
+    parser.add_argument("--output", type=Path, default=None, help="default: <model>.trees.npz")
+    parser.add_argument("--check-rows", type=int, default=2000)
+    args = parser.parse_args()
+
+    from catboost import CatBoostRegressor
+
+    model = CatBoostRegressor()
+    model.load_model(str(args.model))
+    trees = ObliviousTreeModel.from_catboost(model, sha256(args.model))
+    output = args.output or args.model.with_suffix(".trees.npz")
+    trees.save(output)
+    print(f"Trees: {trees.tree_count}, depth: {trees.depth}, features: {len(trees.feature_names)}")
+    print(f"Saved: {output} ({output.stat().st_size / 1024:.0f} KiB)")
+    check_against_catboost(model, trees, args.check_rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Офлайн-скоринг когорты (CSV или Parquet) той же моделью и теми же правилами, что в API:
+- вход читается чанками (`--chunk-rows`), чанки раздаются пулу процессов, в каждом своя копия ModelRunner;
+- каждый чанк пишется отдельным файлом part-NNNNNN.parquet (или .csv с `--format csv`) в каталог `--output`;
+- повторный запуск с теми же параметрами (включая движок инференса) продолжает с недописанных чанков (контрольная точка `_checkpoint.json`);
+- в выходе: row, status, confidence, iron_index, risk_percent, risk_tier, опционально shap_<фича>.
+
+    python scripts/score_cohort.py train_data/X_29n.csv --output out/x29n_scores --processes 4 --shap
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sys
+from pathlib import Path
+
+REPO = Path(__file__).resolve().parents[1]
+BACKEND_DIR = REPO / "backend"
+sys.path.insert(0, str(BACKEND_DIR))
+
+from app.services.offline_scoring import (  # noqa: E402
+    OFFLINE_OUTPUT_FORMATS,
+    OfflineScoringConfig,
+    OfflineScoringReport,
+    report_as_dict,
+    run_offline_scoring,
+)
+
+DEFAULT_MODEL = BACKEND_DIR / "ironrisk_bi_reg_29n.cbm"
+
+
+def print_progress(report: OfflineScoringReport) -> None:
+    print(
+        f"chunks={report.chunks_written} rows={report.rows} ok={report.scored_rows} "
+        f"rows/s={report.rows_per_second:.0f}",
+        file=sys.stderr,
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("input", type=Path, help="CSV или Parquet (.parquet/.pq) с колонками фичей")
+    parser.add_argument("--output", type=Path, required=True, help="каталог для part-файлов и контрольной точки")
+    parser.add_argument("--model", type=Path, default=Path(os.getenv("MODEL_PATH", DEFAULT_MODEL)))
+    parser.add_argument("--chunk-rows", type=int, default=50_000)
+    parser.add_argument("--processes", type=int, default=os.cpu_count() or 1, help="0 — скоринг в текущем процессе")
+    parser.add_argument("--format", choices=OFFLINE_OUTPUT_FORMATS, default="parquet")
+    parser.add_argument("--shap", action="store_true", help="добавить колонки shap_<фича> и shap_base_value")
+    parser.add_argument("--keep-columns", default="", help="колонки входа, копируемые в выход (например SEQN)")
+    parser.add_argument("--engine", choices=("catboost", "numpy"), default=None)
+    parser.add_argument("--explanation-mode", choices=("exact", "approximate"), default=None)
+    parser.add_argument("--overwrite", action="store_true", help="удалить существующий каталог вместо продолжения")
+    args = parser.parse_args()
+
+    if not args.model.exists():
+        parser.error(f"model not found: {args.model}")
+
+    config = OfflineScoringConfig(
+        input_path=args.input,
+        output_dir=args.output,
+        model_path=args.model,
+        chunk_rows=args.chunk_rows,
+        processes=args.processes,
+        with_shap=args.shap,
+        output_format=args.format,
+        keep_columns=tuple(name for name in args.keep_columns.split(",") if name),
+        engine=args.engine,
+        explanation_mode=args.explanation_mode,
+        overwrite=args.overwrite,
+    )
+    try:
+        report = run_offline_scoring(config, progress=print_progress)
+    except (RuntimeError, ValueError) as exc:
+        parser.exit(2, f"error: {exc}\n")
+    print(json.dumps(report_as_dict(report), ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main()